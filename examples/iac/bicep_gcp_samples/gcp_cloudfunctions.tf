@@ -1 +1,19 @@
-# Demo placeholder: GCP Cloud Functions patterns
+# Demo Terraform (pattern-oriented): GCP Cloud Functions patterns.
+# This is NOT intended for deployment. It's designed to trigger posture findings.
+
+resource "google_cloudfunctions_function" "demo_fn" {
+  name                  = "demo-fn"
+  runtime               = "python311"
+  entry_point           = "handler"
+  trigger_http          = true
+  ingress_settings      = "ALLOW_ALL"
+  environment_variables = {
+    STAGE = "demo"
+  }
+}
+
+resource "google_cloudfunctions_function_iam_member" "demo_invoker" {
+  cloud_function = google_cloudfunctions_function.demo_fn.name
+  role           = "roles/cloudfunctions.invoker"
+  member         = "allUsers"
+}
@@ -0,0 +1,105 @@
+"""Microbenchmark: fused classify_text vs. the original multi-pass scanner.
+
+    python scripts/bench_classification.py [--n 50000] [--repeat 5]
+
+On the default corpus the fused pass is only modestly faster (about 1.1-1.2x,
+best of 5); most of the gain comes from ``early_exit=True`` (about 1.5x).
+"""
+import argparse
+import json
+import math
+import random
+import string
+import time
+from pathlib import Path
+from typing import Dict
+
+from dspm_devsecops.classification.pii import (
+    CC_RE,
+    EMAIL_RE,
+    PHONE_RE,
+    SSN_RE,
+    ClassificationFinding,
+    classify_text,
+)
+
+def _legacy_entropy(s: str) -> float:
+    if not s:
+        return 0.0
+    freq: Dict[str, int] = {}
+    for ch in s:
+        freq[ch] = freq.get(ch, 0) + 1
+    n = len(s)
+    ent = 0.0
+    for c in freq.values():
+        p = c / n
+        ent -= p * math.log2(p)
+    return ent
+
+def legacy_classify_text(asset_id: str, text: str, entropy_threshold: float = 4.1) -> ClassificationFinding:
+    # Four findall passes + per-character dict loop (pre-fusion implementation).
+    signals = {
+        "email": len(EMAIL_RE.findall(text)),
+        "ssn": len(SSN_RE.findall(text)),
+        "cc_like": len(CC_RE.findall(text)),
+        "phone": len(PHONE_RE.findall(text)),
+    }
+    ent = _legacy_entropy(text)
+    signals["entropy_hi"] = 1 if ent >= entropy_threshold and len(text) >= 64 else 0
+    if signals["ssn"] > 0:
+        cls = "pii_high"
+    elif signals["cc_like"] > 0:
+        cls = "regulated"
+    elif signals["email"] > 0 or signals["phone"] > 0:
+        cls = "pii_low"
+    elif signals["entropy_hi"] > 0:
+        cls = "internal"
+    else:
+        cls = "public"
+    return ClassificationFinding(asset_id=asset_id, classification=cls, signals=signals)
+
+def _corpus(n: int):
+    root = Path(__file__).resolve().parents[1]
+    seed = [
+        json.loads(line)["text"]
+        for line in (root / "examples" / "data" / "synthetic" / "records.jsonl").read_text(encoding="utf-8").splitlines()
+        if line.strip()
+    ]
+    rnd = random.Random(7)
+    alphabet = string.ascii_letters + string.digits + " =:_-"
+    out = []
+    for i in range(n):
+        filler = "".join(rnd.choice(alphabet) for _ in range(rnd.randint(20, 400)))
+        out.append((f"asset-{i}", f"{seed[i % len(seed)]} {filler}"))
+    return out
+
+def _time(fn, items, repeat: int, **kw) -> float:
+    # Best of ``repeat`` runs; single runs of either side vary by ~20% here.
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for a, t in items:
+            fn(a, t, **kw)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--n", type=int, default=50000)
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    items = _corpus(args.n)
+    for a, t in items[:2000]:
+        assert classify_text(a, t) == legacy_classify_text(a, t), a
+
+    legacy = _time(legacy_classify_text, items, args.repeat)
+    fused = _time(classify_text, items, args.repeat)
+    early = _time(classify_text, items, args.repeat, early_exit=True)
+    print(f"records={args.n}")
+    print(f"legacy      {legacy:8.3f}s")
+    print(f"fused       {fused:8.3f}s  ({legacy / fused:.2f}x)")
+    print(f"early_exit  {early:8.3f}s  ({legacy / early:.2f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""Benchmark: HCL block parser vs. the original line-regex Terraform scanner.
+
+    python scripts/bench_terraform_scan.py [--resources 20000]
+
+Two corpora: "flat" resources (one attribute per line), which both scanners
+read correctly, and "nested" ones (nested blocks, heredocs, templates), where
+the legacy scanner stops at the first ``}`` and so does less work than a
+correct scan.
+"""
+import argparse
+import random
+import re
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from dspm_devsecops.iac.rules import RULES, Resource, collect_rule_stats, rule_timing_report
+from dspm_devsecops.iac.terraform_scan import TerraformFinding, _scan_tf_text
+
+_RESOURCE_RE = re.compile(r'resource\s+"([^"]+)"\s+"([^"]+)"\s*\{', re.IGNORECASE)
+_ATTR_RE = re.compile(r'^\s*([A-Za-z0-9_]+)\s*=\s*(.+?)\s*$', re.IGNORECASE)
+
+def _analyze_resource(fp: Path, rtype: str, name: str, attrs: Dict[str, str]) -> List:
+    f = fp.as_posix()
+    return [
+        TerraformFinding(file=f, resource_type=rtype, name=name, severity=sev, message=msg, evidence=ev)
+        for sev, msg, ev in RULES.run(Resource(rtype, name, attrs))
+    ]
+
+def legacy_scan_tf_text(fp: Path, source: str) -> List:
+    # Pre-parser implementation: a resource ends at the first line containing '}'.
+    findings: List = []
+    cur_res = None
+    attrs: Dict[str, str] = {}
+    for line in source.splitlines():
+        m = _RESOURCE_RE.search(line)
+        if m:
+            if cur_res:
+                findings.extend(_analyze_resource(fp, cur_res[0], cur_res[1], attrs))
+            cur_res = (m.group(1), m.group(2))
+            attrs = {}
+            continue
+        if cur_res:
+            if "}" in line:
+                findings.extend(_analyze_resource(fp, cur_res[0], cur_res[1], attrs))
+                cur_res = None
+                attrs = {}
+                continue
+            am = _ATTR_RE.match(line)
+            if am:
+                attrs[am.group(1)] = am.group(2).strip()
+    if cur_res:
+        findings.extend(_analyze_resource(fp, cur_res[0], cur_res[1], attrs))
+    return findings
+
+_TEMPLATES = [
+    '''resource "aws_lambda_function" "fn{i}" {{
+  function_name = "fn{i}"
+  handler       = "index.handler"
+  runtime       = "python3.11"
+  role          = aws_iam_role.exec.arn
+  environment {{
+    variables = {{ STAGE = "${{var.stage}}" }}
+  }}
+  vpc_config {{
+    subnet_ids         = ["subnet-{i}"]
+    security_group_ids = [aws_security_group.sg{i}.id]
+  }}
+}}
+''',
+    '''resource "aws_iam_role_policy" "pol{i}" {{
+  role   = aws_iam_role.exec.id
+  policy = <<-EOT
+    {{
+      "Statement": [{{ "Action": "s3:GetObject", "Effect": "Allow", "Resource": "arn:aws:s3:::b{i}/*" }}]
+    }}
+  EOT
+}}
+''',
+    '''# security group {i}
+resource "aws_security_group" "sg{i}" {{
+  name = "sg-{i}"
+  ingress {{
+    from_port   = 443
+    to_port     = 443
+    cidr_blocks = ["10.0.0.0/8"]
+  }}
+  egress {{
+    cidr_blocks = ["0.0.0.0/0"]
+  }}
+}}
+''',
+    '''resource "aws_lambda_permission" "perm{i}" {{
+  statement_id  = "AllowInvoke{i}"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.fn{i}.function_name
+  principal     = "events.amazonaws.com"
+}}
+''',
+]
+
+_FLAT_TEMPLATES = [
+    _TEMPLATES[3],
+    '''resource "aws_lambda_function" "fn{i}" {{
+  function_name = "fn{i}"
+  handler       = "index.handler"
+  runtime       = "python3.11"
+  role          = aws_iam_role.exec.arn
+  layers        = [aws_lambda_layer_version.deps.arn]
+}}
+''',
+    '''# rule {i}
+resource "aws_security_group_rule" "r{i}" {{
+  type        = "ingress"
+  from_port   = 443
+  to_port     = 443
+  cidr_blocks = ["0.0.0.0/0"]
+}}
+''',
+    '''resource "aws_s3_bucket_acl" "acl{i}" {{
+  bucket = aws_s3_bucket.b{i}.id
+  acl    = "private"
+}}
+''',
+]
+
+def _corpus(n: int, templates: List[str] = _TEMPLATES) -> str:
+    rnd = random.Random(11)
+    return "\n".join(rnd.choice(templates).format(i=i) for i in range(n))
+
+def _best(fn, fp, text, repeat=5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(fp, text)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--resources", type=int, default=20000)
+    args = ap.parse_args()
+
+    fp = Path("bench.tf")
+    for shape, templates in (("flat", _FLAT_TEMPLATES), ("nested", _TEMPLATES)):
+        text = _corpus(args.resources, templates)
+        legacy = _best(legacy_scan_tf_text, fp, text)
+        parser = _best(_scan_tf_text, fp, text)
+        print(f"{shape}: resources={args.resources} bytes={len(text)}")
+        print(f"  legacy line-regex  {legacy:8.3f}s  findings={len(legacy_scan_tf_text(fp, text))}")
+        print(f"  hcl parser         {parser:8.3f}s  findings={len(_scan_tf_text(fp, text))}  ({legacy / parser:.2f}x)")
+    text = _corpus(args.resources)
+    with collect_rule_stats() as stats:
+        _scan_tf_text(fp, text)
+    for row in rule_timing_report(stats):
+        if row["calls"]:
+            print(f"  rule {row['rule']:<28} calls={row['calls']:<7} hits={row['hits']:<7} {row['seconds']:.3f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from dspm_devsecops.classification.pii import PATTERN_SET_VERSION, ClassificationFinding
+
+# (classification, signals) - asset ids are not part of the key, identical
+# texts on different assets share one entry.
+_Value = Tuple[str, Dict[str, int]]
+
+class ClassificationCache:
+    """Two-tier cache of classification results keyed on content.
+
+    Keys hash ``(text, entropy_threshold, PATTERN_SET_VERSION)`` so changing
+    a regex or threshold invalidates old entries automatically. The first
+    tier is an in-process LRU bounded by ``max_entries``; the optional second
+    tier is a SQLite file (``path``) trimmed to ``max_disk_entries`` least
+    recently used rows on :meth:`close`.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 65536,
+        path: Optional[Path] = None,
+        max_disk_entries: int = 1_000_000,
+        flush_every: int = 4096,
+    ) -> None:
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self.flush_every = flush_every
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._lru: "OrderedDict[str, _Value]" = OrderedDict()
+        self._pending: Dict[str, _Value] = {}
+        self._touched: Dict[str, int] = {}
+        self._db: Optional[sqlite3.Connection] = None
+        if path is not None:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            # Pipeline stages may hand the cache to another thread; it is
+            # never used by two threads at once.
+            self._db = sqlite3.connect(str(path), check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS classification "
+                "(key TEXT PRIMARY KEY, cls TEXT NOT NULL, signals TEXT NOT NULL, used INTEGER NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS classification_used ON classification(used)")
+
+    @staticmethod
+    def key(text: str, entropy_threshold: float) -> str:
+        h = hashlib.sha256()
+        h.update(f"{PATTERN_SET_VERSION}\0{entropy_threshold!r}\0".encode("utf-8"))
+        h.update(text.encode("utf-8", "surrogatepass"))
+        return h.hexdigest()
+
+    def get(self, asset_id: str, key: str) -> Optional[ClassificationFinding]:
+        v = self._lru.get(key)
+        if v is not None:
+            self._lru.move_to_end(key)
+            self.hits += 1
+            return ClassificationFinding(asset_id=asset_id, classification=v[0], signals=dict(v[1]))
+        if key in self._pending:
+            v = self._pending[key]
+            self._remember(key, v)
+            self.hits += 1
+            return ClassificationFinding(asset_id=asset_id, classification=v[0], signals=dict(v[1]))
+        if self._db is not None:
+            row = self._db.execute("SELECT cls, signals FROM classification WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                v = (row[0], json.loads(row[1]))
+                self._remember(key, v)
+                self._touched[key] = int(time.time())
+                self.hits += 1
+                self.disk_hits += 1
+                return ClassificationFinding(asset_id=asset_id, classification=v[0], signals=dict(v[1]))
+        self.misses += 1
+        return None
+
+    def put(self, key: str, finding: ClassificationFinding) -> None:
+        v = (finding.classification, dict(finding.signals))
+        self._remember(key, v)
+        if self._db is not None:
+            self._pending[key] = v
+            if len(self._pending) >= self.flush_every:
+                self.flush()
+
+    def _remember(self, key: str, v: _Value) -> None:
+        self._lru[key] = v
+        self._lru.move_to_end(key)
+        if len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+
+    def flush(self) -> None:
+        if self._db is None:
+            return
+        with self._db:
+            if self._pending:
+                now = int(time.time())
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO classification (key, cls, signals, used) VALUES (?, ?, ?, ?)",
+                    [(k, v[0], json.dumps(v[1]), now) for k, v in self._pending.items()],
+                )
+            if self._touched:
+                self._db.executemany(
+                    "UPDATE classification SET used = ? WHERE key = ?",
+                    [(used, k) for k, used in self._touched.items()],
+                )
+        self._pending = {}
+        self._touched = {}
+
+    def close(self) -> None:
+        if self._db is None:
+            return
+        self.flush()
+        (n,) = self._db.execute("SELECT COUNT(*) FROM classification").fetchone()
+        if n > self.max_disk_entries:
+            with self._db:
+                self._db.execute(
+                    "DELETE FROM classification WHERE key IN "
+                    "(SELECT key FROM classification ORDER BY used ASC LIMIT ?)",
+                    (n - self.max_disk_entries,),
+                )
+        self._db.close()
+        self._db = None
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "disk_hits": self.disk_hits, "misses": self.misses}
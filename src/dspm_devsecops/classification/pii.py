@@ -1,56 +1,116 @@
 from __future__ import annotations
 
+import hashlib
 import math
 import re
+from collections import Counter, deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import nullcontext
 from dataclasses import dataclass
-from typing import Dict, List, Tuple
+from itertools import islice
+from typing import TYPE_CHECKING, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from dspm_devsecops.classification.cache import ClassificationCache
 
 EMAIL_RE = re.compile(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b")
 SSN_RE = re.compile(r"\b\d{3}-\d{2}-\d{4}\b")
 CC_RE = re.compile(r"\b(?:\d[ -]*?){13,19}\b")
 PHONE_RE = re.compile(r"\b(?:\+?1[-. ]?)?\(?\d{3}\)?[-. ]?\d{3}[-. ]?\d{4}\b")
 
+# Changes whenever a pattern changes; part of the classification cache key.
+PATTERN_SET_VERSION = hashlib.sha256(
+    "\0".join(rx.pattern for rx in (EMAIL_RE, SSN_RE, CC_RE, PHONE_RE)).encode("utf-8")
+).hexdigest()[:16]
+
 @dataclass(frozen=True)
 class ClassificationFinding:
     asset_id: str
     classification: str  # public|internal|pii_low|pii_high|regulated
     signals: Dict[str, int]
 
-def shannon_entropy(s: str) -> float:
-    if not s:
-        return 0.0
-    freq: Dict[str, int] = {}
-    for ch in s:
-        freq[ch] = freq.get(ch, 0) + 1
-    n = len(s)
+def _entropy_from_counts(counts: Iterable[int], n: int) -> float:
     ent = 0.0
-    for c in freq.values():
+    for c in counts:
         p = c / n
         ent -= p * math.log2(p)
     return ent
 
-def classify_text(asset_id: str, text: str, entropy_threshold: float = 4.1) -> ClassificationFinding:
-    signals = {
-        "email": len(EMAIL_RE.findall(text)),
-        "ssn": len(SSN_RE.findall(text)),
-        "cc_like": len(CC_RE.findall(text)),
-        "phone": len(PHONE_RE.findall(text)),
-    }
-    ent = shannon_entropy(text)
-    signals["entropy_hi"] = 1 if ent >= entropy_threshold and len(text) >= 64 else 0
+def shannon_entropy(s: str) -> float:
+    if not s:
+        return 0.0
+    # Counter tallies in C and keeps first-seen order, so the float sum is
+    # accumulated in the same order as a hand-rolled dict count.
+    return _entropy_from_counts(Counter(s).values(), len(s))
+
+def _count(rx: re.Pattern, text: str) -> int:
+    n = 0
+    for _ in rx.finditer(text):
+        n += 1
+    return n
 
+def _found(rx: re.Pattern, text: str) -> int:
+    return 1 if rx.search(text) else 0
+
+def _decide(signals: Dict[str, int]) -> str:
     # Classification rules (demo, deterministic)
     if signals["ssn"] > 0:
-        cls = "pii_high"
-    elif signals["cc_like"] > 0:
-        cls = "regulated"  # treat payment-like strings as regulated for demo
-    elif signals["email"] > 0 or signals["phone"] > 0:
-        cls = "pii_low"
-    elif signals["entropy_hi"] > 0:
-        cls = "internal"
-    else:
-        cls = "public"
+        return "pii_high"
+    if signals["cc_like"] > 0:
+        return "regulated"  # treat payment-like strings as regulated for demo
+    if signals["email"] > 0 or signals["phone"] > 0:
+        return "pii_low"
+    if signals["entropy_hi"] > 0:
+        return "internal"
+    return "public"
+
+def scan_signals(text: str, entropy_threshold: float = 4.1, early_exit: bool = False) -> Tuple[str, Dict[str, int]]:
+    """Fused signal scan: one character histogram drives both entropy and
+    regex gating, and regexes are only run when the histogram says they can
+    match (e.g. SSN needs >= 9 digits and 2 hyphens). Matches are counted
+    with ``finditer`` so no match lists are built.
 
+    With ``early_exit=True`` signals are checked in precedence order and the
+    scan stops at the first one that decides the classification; counts are
+    then 0/1 presence flags and later signals are left at 0.
+    """
+    signals = {"email": 0, "ssn": 0, "cc_like": 0, "phone": 0, "entropy_hi": 0}
+    if not text:
+        return "public", signals
+
+    hist = Counter(text)
+    digits = sum(c for ch, c in hist.items() if ch.isdecimal())  # \d is Unicode Nd
+    count = _found if early_exit else _count
+
+    if digits >= 9 and hist["-"] >= 2:
+        signals["ssn"] = count(SSN_RE, text)
+        if early_exit and signals["ssn"]:
+            return "pii_high", signals
+    if digits >= 13:
+        signals["cc_like"] = count(CC_RE, text)
+        if early_exit and signals["cc_like"]:
+            return "regulated", signals
+    if "@" in hist:
+        signals["email"] = count(EMAIL_RE, text)
+        if early_exit and signals["email"]:
+            return "pii_low", signals
+    if digits >= 10:
+        signals["phone"] = count(PHONE_RE, text)
+        if early_exit and signals["phone"]:
+            return "pii_low", signals
+
+    n = len(text)
+    if n >= 64 and _entropy_from_counts(hist.values(), n) >= entropy_threshold:
+        signals["entropy_hi"] = 1
+    return _decide(signals), signals
+
+def classify_text(
+    asset_id: str,
+    text: str,
+    entropy_threshold: float = 4.1,
+    early_exit: bool = False,
+) -> ClassificationFinding:
+    cls, signals = scan_signals(text, entropy_threshold, early_exit=early_exit)
     return ClassificationFinding(asset_id=asset_id, classification=cls, signals=signals)
 
 CLASS_MULTIPLIER = {
@@ -60,3 +120,71 @@ CLASS_MULTIPLIER = {
     "pii_high": 1.7,
     "regulated": 1.9,
 }
+
+def _classify_chunk(items: List[Tuple[str, str]], entropy_threshold: float) -> List[ClassificationFinding]:
+    return [classify_text(asset_id, text, entropy_threshold) for asset_id, text in items]
+
+def classify_many(
+    items: Iterable[Tuple[str, str]],
+    workers: int = 1,
+    chunk_size: int = 512,
+    entropy_threshold: float = 4.1,
+    cache: Optional["ClassificationCache"] = None,
+    pool: Optional[Executor] = None,
+) -> Iterator[ClassificationFinding]:
+    """Classify ``(asset_id, text)`` pairs, yielding findings in input order.
+
+    With ``workers > 1`` chunks of ``chunk_size`` items are fanned out to a
+    process pool (``pool`` if given, left open; otherwise one of their own).
+    At most ``2 * workers`` chunks are in flight, so the input is consumed
+    lazily and memory stays bounded for large inventories.
+    When a ``cache`` is given, lookups happen in this process and only
+    cache misses are classified (and sent to the pool).
+    """
+    if workers <= 1:
+        for asset_id, text in items:
+            if cache is None:
+                yield classify_text(asset_id, text, entropy_threshold)
+                continue
+            key = cache.key(text, entropy_threshold)
+            hit = cache.get(asset_id, key)
+            if hit is None:
+                hit = classify_text(asset_id, text, entropy_threshold)
+                cache.put(key, hit)
+            yield hit
+        return
+
+    it = iter(items)
+    with (nullcontext(pool) if pool is not None else ProcessPoolExecutor(max_workers=workers)) as pool:
+        pending: Deque = deque()
+        while True:
+            chunk = list(islice(it, chunk_size))
+            if not chunk:
+                break
+            pending.append(_submit_chunk(pool, chunk, entropy_threshold, cache))
+            if len(pending) >= 2 * workers:
+                yield from _collect_chunk(pending.popleft(), cache)
+        while pending:
+            yield from _collect_chunk(pending.popleft(), cache)
+
+def _submit_chunk(pool, chunk: List[Tuple[str, str]], entropy_threshold: float, cache) -> Tuple:
+    if cache is None:
+        return None, None, pool.submit(_classify_chunk, chunk, entropy_threshold)
+    keys = [cache.key(text, entropy_threshold) for _, text in chunk]
+    found = [cache.get(asset_id, k) for (asset_id, _), k in zip(chunk, keys)]
+    misses = [item for item, f in zip(chunk, found) if f is None]
+    return keys, found, pool.submit(_classify_chunk, misses, entropy_threshold)
+
+def _collect_chunk(entry: Tuple, cache) -> List[ClassificationFinding]:
+    keys, found, fut = entry
+    computed = fut.result()
+    if found is None:
+        return computed
+    fresh = iter(computed)
+    out: List[ClassificationFinding] = []
+    for k, f in zip(keys, found):
+        if f is None:
+            f = next(fresh)
+            cache.put(k, f)
+        out.append(f)
+    return out
@@ -1,38 +1,310 @@
 import argparse
+import json
 import os
+import sys
 from pathlib import Path
 
-from dspm_devsecops.orchestration.pipeline import run_pipeline
+# Subsystems are imported inside the subcommand that uses them: the pipeline
+# pulls in yaml, rich, numpy and every scanner, which lightweight commands
+# (--help, verify, receipts, ...) should not pay for on each CI invocation.
 
 def _set_out(out: str | None) -> None:
     if out:
         os.environ["DSPM_OUT_DIR"] = str(Path(out).resolve())
 
+def _pipeline_kwargs(args: argparse.Namespace) -> dict:
+    from dspm_devsecops.orchestration.sharding import parse_shard
+
+    return {
+        "records_path": Path(args.records).resolve() if args.records else None,
+        "stream": args.stream,
+        "workers": args.workers,
+        "persist_cache": args.cache,
+        "columnar": args.columnar,
+        "compact_json": args.compact_json,
+        "receipt_ledger": args.receipt_ledger,
+        "incremental": args.incremental,
+        "shard": parse_shard(args.shard) if args.shard else None,
+    }
+
+def _profile_startup(argv: list, top: int = 15) -> int:
+    """Re-run ``argv`` with ``-X importtime``; print the slowest imports and total wall time."""
+    import subprocess
+    import time
+
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "dspm_devsecops.cli", *argv],
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    wall = time.perf_counter() - start
+    imports = []  # (cumulative us, self us, module)
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:"):
+            sys.stderr.write(line + "\n")
+            continue
+        fields = [f.strip() for f in line[len("import time:"):].split("|")]
+        if fields[0].isdigit():  # skip the header row
+            imports.append((int(fields[1]), int(fields[0]), fields[2]))
+    total_us = sum(self_us for _, self_us, _ in imports)
+    sys.stderr.write(f"startup: {wall * 1000:.1f} ms wall, {total_us / 1000:.1f} ms in {len(imports)} imports\n")
+    sys.stderr.write(f"{'cumulative ms':>14} {'self ms':>8}  module\n")
+    for cum, self_us, name in sorted(imports, reverse=True)[:top]:
+        sys.stderr.write(f"{cum / 1000:>14.1f} {self_us / 1000:>8.1f}  {name}\n")
+    return proc.returncode
+
 def main() -> None:
     p = argparse.ArgumentParser(prog="dspm-devsecops")
     p.add_argument("--repo-root", default=".", help="Path to repo root (contains examples/ etc.)")
+    p.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="Run the command under `python -X importtime` and report the slowest imports on stderr",
+    )
+
+    # Options shared by every pipeline-running subcommand
+    run_opts = argparse.ArgumentParser(add_help=False)
+    run_opts.add_argument("--records", default=None, help="Records JSONL to assess (.gz/.zst supported)")
+    run_opts.add_argument(
+        "--stream",
+        action="store_true",
+        help="Stream records and write normalized_assets/policy_results as JSONL (bounded memory)",
+    )
+
+    run_opts.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Processes for IaC file scanning and record classification only (one shared pool)",
+    )
+
+    run_opts.add_argument("--cache", action="store_true", help="Persist run-to-run caches under <out>/.cache")
+
+    run_opts.add_argument(
+        "--columnar",
+        action="store_true",
+        help="Evaluate policies as vectorized masks over asset batches (requires the columnar extra: numpy)",
+    )
+
+    run_opts.add_argument(
+        "--compact-json",
+        action="store_true",
+        help="Write normalized_assets/policy_results JSON without indentation (large inventories)",
+    )
+
+    run_opts.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Recompute only record chunks whose content or context changed (implies --cache)",
+    )
+
+    run_opts.add_argument(
+        "--shard",
+        default=None,
+        metavar="i/N",
+        help="Assess only records of shard i of N (by asset_id hash) and write partials for `merge`",
+    )
+
+    run_opts.add_argument(
+        "--receipt-ledger",
+        nargs="?",
+        const="json",
+        default=None,
+        choices=["json", "msgpack", "cbor"],
+        help="Append receipts to the hash-chained evidence/receipts.ledger instead of one file each (default codec: json)",
+    )
 
     sub = p.add_subparsers(dest="cmd", required=False)
 
     # Default: run full pipeline to repo-root/out
-    sub.add_parser("run", help="Run the full pipeline (default)")
+    sub.add_parser("run", parents=[run_opts], help="Run the full pipeline (default)")
 
-    p_demo = sub.add_parser("demo", help="Run pipeline writing outputs to --out (safe local demo)")
+    p_demo = sub.add_parser("demo", parents=[run_opts], help="Run pipeline writing outputs to --out (safe local demo)")
     p_demo.add_argument("--out", required=True, help="Output directory for artifacts")
 
-    p_ci = sub.add_parser("ci", help="Run pipeline writing outputs to --out (CI simulation)")
+    p_ci = sub.add_parser("ci", parents=[run_opts], help="Run pipeline writing outputs to --out (CI simulation)")
     p_ci.add_argument("--out", required=True, help="Output directory for artifacts")
 
+    p_merge = sub.add_parser("merge", help="Combine `--shard i/N` outputs into the single-node artifacts")
+    p_merge.add_argument("shards", nargs="+", help="Output directories of the shard runs")
+    p_merge.add_argument("--out", required=True, help="Output directory for the merged artifacts")
+    p_merge.add_argument("--stream", action="store_true", help="Write assets/policy results as JSONL")
+    p_merge.add_argument("--compact-json", action="store_true", help="Write assets/policy results without indentation")
+    p_merge.add_argument("--receipt-ledger", nargs="?", const="json", default=None, choices=["json", "msgpack", "cbor"])
+
+    p_serve = sub.add_parser(
+        "serve", help="Keep policies, tenants, IaC context and caches warm and answer evaluate/gate/scan over HTTP"
+    )
+    p_serve.add_argument("--host", default="127.0.0.1", help="Interface to listen on")
+    p_serve.add_argument("--port", type=int, default=8765, help="TCP port (0 picks a free one)")
+    p_serve.add_argument("--socket", default=None, help="Listen on this Unix socket instead of TCP")
+    p_serve.add_argument("--cache", action="store_true", help="Persist scan/classification caches under <out>/.cache")
+    p_serve.add_argument(
+        "--batch-window-ms", type=float, default=2.0, help="How long the first queued request waits for others to batch with"
+    )
+    p_serve.add_argument("--max-batch", type=int, default=1024, help="Most records assessed in one batch")
+
+    p_sls = sub.add_parser(
+        "scan-serverless", help="Scan every serverless.yml/.yaml under DIR, streaming findings as JSONL to stdout"
+    )
+    p_sls.add_argument("dir", help="Directory to search for serverless files")
+    p_sls.add_argument("--workers", type=int, default=1, help="Processes used for scanning")
+    p_sls.add_argument("--cache", default=None, help="Per-file result cache (JSON); unchanged files are skipped")
+
+    p_verify = sub.add_parser(
+        "verify", help="Re-hash a run's artifacts against its manifest; exits 1 on missing/changed/extra files"
+    )
+    p_verify.add_argument("--out", required=True, help="Output directory of the run (holds evidence/)")
+    p_verify.add_argument("--workers", type=int, default=4, help="Threads used for hashing")
+    p_verify.add_argument("--fail-fast", action="store_true", help="Stop at the first mismatch")
+    p_verify.add_argument("--sample", type=int, default=None, help="Check only N randomly chosen manifest entries")
+    p_verify.add_argument("--seed", type=int, default=0, help="Seed for --sample")
+
+    p_rc = sub.add_parser("receipts", help="Query (or export) the receipt ledger of a run")
+    p_rc.add_argument("--out", required=True, help="Output directory of the run (holds evidence/)")
+    p_rc.add_argument("--kind", default=None, help="Only receipts of this kind (CREATE, AUDIT, ...)")
+    p_rc.add_argument("--since", type=int, default=None, help="Only receipts with ts_epoch >= SINCE")
+    p_rc.add_argument("--until", type=int, default=None, help="Only receipts with ts_epoch <= UNTIL")
+    p_rc.add_argument("--verify", action="store_true", help="Check the hash chain; exits 1 if it is broken")
+    p_rc.add_argument(
+        "--export", action="store_true", help="Write the latest receipt of each kind as evidence/receipt_<kind>.json"
+    )
+
+    p_va = sub.add_parser(
+        "verify-artifact", help="Check one artifact against the run's Merkle root (re-hashes only that file)"
+    )
+    p_va.add_argument("file", help="Artifact to verify")
+    p_va.add_argument("--out", required=True, help="Output directory of the run (holds evidence/)")
+    p_va.add_argument("--root", default=None, help="Expected Merkle root (default: from evidence/receipt_audit.json)")
+
     args = p.parse_args()
+    if args.profile_startup:
+        raise SystemExit(_profile_startup([a for a in sys.argv[1:] if a != "--profile-startup"]))
     repo_root = Path(args.repo_root).resolve()
 
-    if args.cmd in (None, "run"):
+    if args.cmd is None:
+        from dspm_devsecops.orchestration.pipeline import run_pipeline
+
         run_pipeline(repo_root)
         return
 
-    if args.cmd in ("demo", "ci"):
+    if args.cmd in ("run", "demo", "ci"):
+        from dspm_devsecops.orchestration.pipeline import run_pipeline
+
+        if args.columnar:
+            from dspm_devsecops.policy_dsl.columnar import require_numpy
+
+            try:
+                require_numpy()
+            except RuntimeError as exc:
+                p.error(str(exc))
+        if args.cmd != "run":
+            _set_out(args.out)
+        run_pipeline(repo_root, **_pipeline_kwargs(args))
+        return
+
+    if args.cmd == "merge":
+        from dspm_devsecops.orchestration.pipeline import merge_shards
+
         _set_out(args.out)
-        run_pipeline(repo_root)
+        merge_shards(
+            repo_root,
+            [Path(d).resolve() for d in args.shards],
+            stream=args.stream,
+            compact_json=args.compact_json,
+            receipt_ledger=args.receipt_ledger,
+        )
+        return
+
+    if args.cmd == "serve":
+        from dspm_devsecops.orchestration.server import serve
+
+        serve(
+            repo_root,
+            host=args.host,
+            port=args.port,
+            socket_path=args.socket,
+            persist_cache=args.cache,
+            batch_window_ms=args.batch_window_ms,
+            max_batch=args.max_batch,
+        )
+        return
+
+    if args.cmd == "scan-serverless":
+        from dspm_devsecops.iac.serverless_scan import scan_serverless_dir
+
+        findings = scan_serverless_dir(
+            Path(args.dir), workers=args.workers, cache_path=Path(args.cache) if args.cache else None
+        )
+        for f in findings:
+            sys.stdout.write(json.dumps(f.__dict__) + "\n")
+        return
+
+    if args.cmd == "verify":
+        from dspm_devsecops.evidence.verify import verify_out_dir
+
+        report = verify_out_dir(
+            Path(args.out).resolve(),
+            workers=args.workers,
+            fail_fast=args.fail_fast,
+            sample=args.sample,
+            seed=args.seed,
+        )
+        for label, paths in (("MISSING", report.missing), ("CHANGED", report.changed), ("EXTRA", report.extra)):
+            for path in paths:
+                print(f"{label} {path}")
+        if not report.root_ok:
+            print("MERKLE merkle_root does not match the manifest entries")
+        print(
+            f"{'OK' if report.ok else 'FAIL'}: checked {report.checked} file(s), {len(report.missing)} missing, "
+            f"{len(report.changed)} changed, {len(report.extra)} extra"
+            + (" (stopped early)" if report.stopped_early else "")
+        )
+        if not report.ok:
+            raise SystemExit(1)
+        return
+
+    if args.cmd == "receipts":
+        from dspm_devsecops.evidence.ledger import ReceiptLedger
+
+        out_dir = Path(args.out).resolve()
+        evidence = out_dir / "evidence"
+        if not (evidence / "receipts.ledger").exists():
+            raise SystemExit(f"No receipt ledger in {evidence} (run with --receipt-ledger)")
+        ledger = ReceiptLedger(evidence / "receipts.ledger")
+        if args.verify:
+            ok, bad = ledger.verify()
+            print(f"OK: {ledger.seq} receipt(s), head {ledger.head}" if ok else f"FAIL: chain broken at seq {bad}")
+            if not ok:
+                raise SystemExit(1)
+            return
+        if args.export:
+            for fp in ledger.export_json(evidence):
+                print(fp.as_posix())
+            return
+        for rec in ledger.find(kind=args.kind, since=args.since, until=args.until):
+            sys.stdout.write(json.dumps(rec, sort_keys=True) + "\n")
+        return
+
+    if args.cmd == "verify-artifact":
+        from dspm_devsecops.evidence.manifest import verify_artifact
+
+        out_dir = Path(args.out).resolve()
+        evidence = out_dir / "evidence"
+        proofs = json.loads((evidence / "merkle_proofs.json").read_text(encoding="utf-8"))
+        root = args.root
+        if root is None and (evidence / "receipt_audit.json").exists():
+            audit = json.loads((evidence / "receipt_audit.json").read_text(encoding="utf-8"))
+            root = audit["outputs"]["merkle_root"]
+        elif root is None:  # receipts kept in the ledger
+            from dspm_devsecops.evidence.ledger import ReceiptLedger
+
+            root = ReceiptLedger(evidence / "receipts.ledger").latest()["AUDIT"]["outputs"]["merkle_root"]
+        ok, reason = verify_artifact(Path(args.file).resolve(), proofs, root, out_dir)
+        print(f"{'OK' if ok else 'FAIL'} {args.file}: {reason}")
+        if not ok:
+            raise SystemExit(1)
         return
 
     raise SystemExit(f"Unknown command: {args.cmd}")
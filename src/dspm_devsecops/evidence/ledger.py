@@ -0,0 +1,253 @@
+from __future__ import annotations
+import bisect
+import hashlib
+import json
+import os
+import struct
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from dspm_devsecops.orchestration.writer import dump_json_atomic
+
+# Append-only receipt ledger.
+#
+#   ledger file:  MAGIC | codec (1 byte) | record*
+#   record:       length (u32 BE) | encoded {"seq", "prev", "hash", "receipt"}
+#
+# hash = sha256(prev hash bytes + canonical JSON of the receipt). The chain is
+# defined over canonical JSON, so it verifies the same whatever codec stores
+# the records. A sidecar ``.idx`` file holds one fixed-size entry per record
+# (offset, seq, ts_epoch, kind) for lookups without decoding the ledger; it is
+# rebuilt from the ledger if missing or behind.
+
+MAGIC = b"DSPMLDG1"
+_LEN = struct.Struct(">I")
+_IDX = struct.Struct(">QQq16s")  # offset, seq, ts_epoch, kind (NUL-padded)
+GENESIS = "0" * 64
+
+def _kind_key(kind: Any) -> str:
+    # The index stores kinds in 16 bytes; lookups use the same truncation.
+    return str(kind).encode("utf-8")[:16].decode("utf-8", "ignore")
+
+def _canonical(receipt: Dict[str, Any]) -> bytes:
+    return json.dumps(receipt, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+def chain_hash(prev: str, receipt: Dict[str, Any]) -> str:
+    return hashlib.sha256(bytes.fromhex(prev) + _canonical(receipt)).hexdigest()
+
+def _json_codec() -> Tuple[Callable[[Any], bytes], Callable[[bytes], Any]]:
+    return (lambda obj: _canonical(obj)), (lambda raw: json.loads(raw))
+
+def _msgpack_codec() -> Tuple[Callable[[Any], bytes], Callable[[bytes], Any]]:
+    try:
+        import msgpack
+    except ImportError as e:  # pragma: no cover - optional dependency
+        raise RuntimeError("The msgpack ledger codec requires the 'msgpack' package") from e
+    return msgpack.packb, (lambda raw: msgpack.unpackb(raw, raw=False))
+
+def _cbor_codec() -> Tuple[Callable[[Any], bytes], Callable[[bytes], Any]]:
+    try:
+        import cbor2
+    except ImportError as e:  # pragma: no cover - optional dependency
+        raise RuntimeError("The cbor ledger codec requires the 'cbor2' package") from e
+    return cbor2.dumps, cbor2.loads
+
+# codec name -> (id byte stored in the header, loader)
+CODECS: Dict[str, Tuple[int, Callable[[], Tuple[Callable[[Any], bytes], Callable[[bytes], Any]]]]] = {
+    "json": (0, _json_codec),
+    "msgpack": (1, _msgpack_codec),
+    "cbor": (2, _cbor_codec),
+}
+
+class LedgerError(ValueError):
+    pass
+
+class ReceiptLedger:
+    """Hash-chained, length-prefixed receipt log at ``path``.
+
+    ``append`` buffers receipts; every ``batch_size`` appends (and on
+    ``flush``/``close``) the batch is written with one write and one fsync,
+    then the index is updated. An existing ledger keeps the codec it was
+    created with; ``codec`` only applies to new files. A torn record at the
+    end (crash mid-write) is truncated on open.
+    """
+
+    def __init__(self, path: Path, codec: str = "json", batch_size: int = 64) -> None:
+        self.path = path
+        self.index_path = path.with_name(path.name + ".idx")
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self._pending: List[bytes] = []
+        self._pending_index: List[Tuple[int, str, int]] = []  # seq, kind, ts
+        # kind -> sorted [(ts_epoch, seq)]; offsets by seq
+        self._by_kind: Dict[str, List[Tuple[int, int]]] = {}
+        self._offsets: List[int] = []
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if not path.exists() or path.stat().st_size == 0:
+            if codec not in CODECS:
+                raise LedgerError(f"Unknown ledger codec {codec!r} (choose from {sorted(CODECS)})")
+            with open(path, "wb") as fh:
+                fh.write(MAGIC + bytes([CODECS[codec][0]]))
+                fh.flush()
+                os.fsync(fh.fileno())
+            self.index_path.write_bytes(b"")
+        self.codec, (self._encode, self._decode) = self._open_codec()
+        self.seq, self.head = 0, GENESIS
+        self._size = self._recover()
+
+    def _open_codec(self):
+        with open(self.path, "rb") as fh:
+            header = fh.read(len(MAGIC) + 1)
+        if len(header) != len(MAGIC) + 1 or header[: len(MAGIC)] != MAGIC:
+            raise LedgerError(f"{self.path} is not a receipt ledger")
+        for name, (cid, load) in CODECS.items():
+            if cid == header[-1]:
+                return name, load()
+        raise LedgerError(f"{self.path} uses unknown codec id {header[-1]}")
+
+    def _iter_raw(self, start: int = len(MAGIC) + 1) -> Iterator[Tuple[int, bytes]]:
+        """(offset, payload) for each complete record from ``start``."""
+        with open(self.path, "rb") as fh:
+            fh.seek(start)
+            offset = start
+            while True:
+                head = fh.read(_LEN.size)
+                if len(head) < _LEN.size:
+                    return
+                (n,) = _LEN.unpack(head)
+                payload = fh.read(n)
+                if len(payload) < n:
+                    return
+                yield offset, payload
+                offset += _LEN.size + n
+
+    def _recover(self) -> int:
+        """Load the index (rebuilding its tail from the ledger), drop a torn tail record."""
+        entries: List[Tuple[int, int, int, str]] = []
+        raw_idx = self.index_path.read_bytes() if self.index_path.exists() else b""
+        for i in range(0, len(raw_idx) - len(raw_idx) % _IDX.size, _IDX.size):
+            offset, seq, ts, kind = _IDX.unpack_from(raw_idx, i)
+            entries.append((offset, seq, ts, kind.rstrip(b"\0").decode("utf-8")))
+        start = len(MAGIC) + 1
+        if entries:
+            start = entries[-1][0]  # re-read the last indexed record for the chain head
+            entries.pop()
+        end = start
+        rebuilt: List[Tuple[int, int, int, str]] = []
+        for offset, payload in self._iter_raw(start):
+            rec = self._decode(payload)
+            r = rec["receipt"]
+            rebuilt.append((offset, rec["seq"], int(r.get("ts_epoch", 0)), _kind_key(r.get("kind", ""))))
+            self.seq, self.head = rec["seq"], rec["hash"]
+            end = offset + _LEN.size + len(payload)
+        if os.path.getsize(self.path) > end:  # torn record from an interrupted write
+            with open(self.path, "r+b") as fh:
+                fh.truncate(end)
+        entries.extend(rebuilt)
+        if len(raw_idx) != len(entries) * _IDX.size:
+            self.index_path.write_bytes(b"".join(_IDX.pack(o, s, t, k.encode("utf-8")) for o, s, t, k in entries))
+        for offset, seq, ts, kind in entries:
+            self._offsets.append(offset)
+            self._by_kind.setdefault(kind, []).append((ts, seq))
+        for items in self._by_kind.values():
+            items.sort()
+        return end
+
+    def append(self, receipt: Dict[str, Any]) -> str:
+        """Chain ``receipt`` onto the ledger; returns its hash. Written on the next flush."""
+        with self._lock:
+            self.seq += 1
+            h = chain_hash(self.head, receipt)
+            rec = {"seq": self.seq, "prev": self.head, "hash": h, "receipt": receipt}
+            self.head = h
+            self._pending.append(self._encode(rec))
+            self._pending_index.append((self.seq, _kind_key(receipt.get("kind", "")), int(receipt.get("ts_epoch", 0))))
+            if len(self._pending) >= self.batch_size:
+                self._flush_locked()
+            return h
+
+    def extend(self, receipts: Iterable[Dict[str, Any]]) -> List[str]:
+        return [self.append(r) for r in receipts]
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        if not self._pending:
+            return
+        buf = bytearray()
+        idx = bytearray()
+        offset = self._size
+        for payload, (seq, kind, ts) in zip(self._pending, self._pending_index):
+            buf += _LEN.pack(len(payload)) + payload
+            idx += _IDX.pack(offset, seq, ts, kind.encode("utf-8"))
+            self._offsets.append(offset)
+            bisect.insort(self._by_kind.setdefault(kind, []), (ts, seq))
+            offset += _LEN.size + len(payload)
+        # Ledger first: the index can always be rebuilt from it.
+        with open(self.path, "ab") as fh:
+            fh.write(buf)
+            fh.flush()
+            os.fsync(fh.fileno())
+        with open(self.index_path, "ab") as fh:
+            fh.write(idx)
+            fh.flush()
+            os.fsync(fh.fileno())
+        self._size = offset
+        self._pending.clear()
+        self._pending_index.clear()
+
+    def close(self) -> None:
+        self.flush()
+
+    def __enter__(self) -> "ReceiptLedger":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def _read(self, seq: int) -> Dict[str, Any]:
+        with open(self.path, "rb") as fh:
+            fh.seek(self._offsets[seq - 1])
+            (n,) = _LEN.unpack(fh.read(_LEN.size))
+            return self._decode(fh.read(n))
+
+    def find(
+        self, kind: Optional[str] = None, since: Optional[int] = None, until: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Flushed records of ``kind`` (any if None) with ``since <= ts_epoch <= until``, in seq order."""
+        lo = since if since is not None else -(2**63)
+        hi = until if until is not None else 2**63 - 1
+        seqs: List[int] = []
+        for k, items in self._by_kind.items():
+            if kind is not None and k != _kind_key(kind):
+                continue
+            start = bisect.bisect_left(items, (lo, -1))
+            stop = bisect.bisect_right(items, (hi, 2**63))
+            seqs.extend(seq for _, seq in items[start:stop])
+        return [self._read(s) for s in sorted(seqs)]
+
+    def latest(self) -> Dict[str, Dict[str, Any]]:
+        """Most recent flushed receipt of each kind."""
+        return {k: self._read(max(seq for _, seq in items))["receipt"] for k, items in self._by_kind.items() if items}
+
+    def verify(self) -> Tuple[bool, Optional[int]]:
+        """Re-walk the chain; ``(True, None)`` or ``(False, first bad seq)``."""
+        prev, expected = GENESIS, 1
+        for _, payload in self._iter_raw():
+            rec = self._decode(payload)
+            if rec["seq"] != expected or rec["prev"] != prev or rec["hash"] != chain_hash(prev, rec["receipt"]):
+                return False, expected
+            prev, expected = rec["hash"], expected + 1
+        return True, None
+
+    def export_json(self, dest_dir: Path) -> List[Path]:
+        """Write the per-file view (``receipt_<kind>.json``, latest of each kind)."""
+        written = []
+        for kind, r in sorted(self.latest().items()):
+            fp = dest_dir / f"receipt_{kind.lower()}.json"
+            dump_json_atomic(fp, r, sort_keys=True)
+            written.append(fp)
+        return written
@@ -1,8 +1,15 @@
 from __future__ import annotations
 import hashlib
+import json
+import mmap
+import os
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from dspm_devsecops.evidence.merkle import leaf_hash, merkle_root, verify_proof
+from dspm_devsecops.orchestration.writer import dump_json_atomic
 
 @dataclass(frozen=True)
 class HashEntry:
@@ -10,31 +17,150 @@ class HashEntry:
     sha256: str
     bytes: int
 
+@dataclass
+class ManifestStats:
+    files_hashed: int = 0
+    bytes_hashed: int = 0
+    files_reused: int = 0
+    bytes_reused: int = 0
+
 def sha256_file(fp: Path) -> HashEntry:
-    h = hashlib.sha256()
-    size = 0
+    # Zero-copy reads: hashlib.file_digest (3.11+) or an mmap of the file.
+    # hashlib drops the GIL while hashing, so threads scale across files.
     with fp.open("rb") as f:
-        for chunk in iter(lambda: f.read(1024 * 1024), b""):
-            h.update(chunk)
-            size += len(chunk)
-    return HashEntry(path=fp.as_posix(), sha256=h.hexdigest(), bytes=size)
+        size = os.fstat(f.fileno()).st_size
+        if hasattr(hashlib, "file_digest"):
+            digest = hashlib.file_digest(f, "sha256").hexdigest()
+        elif size == 0:  # mmap cannot map empty files
+            digest = hashlib.sha256().hexdigest()
+        else:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+                digest = hashlib.sha256(m).hexdigest()
+    return HashEntry(path=fp.as_posix(), sha256=digest, bytes=size)
+
+# Incremental mode keeps (size, mtime_ns, sha256) per path in a sidecar JSON
+# file, so the manifest format itself stays unchanged. The inode is left out:
+# artifacts are rewritten via temp file + os.replace, which gives every
+# rewrite a new inode even when the content did not change. Files the
+# ArtifactWriter just wrote come with their digest (``known``), so they are
+# not read back either.
+_StatKey = Tuple[int, int]
 
-def build_manifest(root: Path, include_globs: List[str]) -> Dict[str, object]:
+def _load_stat_cache(path: Optional[Path]) -> Dict[str, List]:
+    if path is None or not path.exists():
+        return {}
+    try:
+        return json.loads(path.read_text(encoding="utf-8")).get("files", {})
+    except ValueError:
+        return {}
+
+# Artifacts (files, or directories walked recursively) covered by a run's manifest.
+MANIFEST_GLOBS = [
+    "scans",
+    "trigger_graph.json",
+    "risk_score_base.json",
+    "normalized_assets.json",
+    "normalized_assets.jsonl",
+    "policy_results.json",
+    "policy_results.jsonl",
+    "gate_status.json",
+]
+
+def collect_files(root: Path, include_globs: List[str]) -> List[Path]:
     files: List[Path] = []
     for g in include_globs:
         files.extend(sorted(root.glob(g)))
     seen = set()
-    entries: List[Dict[str, object]] = []
+    out: List[Path] = []
     for fp in files:
-        if fp.is_dir():
-            for f2 in sorted(fp.rglob("*")):
-                if f2.is_file() and f2.as_posix() not in seen:
-                    seen.add(f2.as_posix())
-                    e = sha256_file(f2)
-                    entries.append({"path": e.path, "sha256": e.sha256, "bytes": e.bytes})
-        else:
-            if fp.is_file() and fp.as_posix() not in seen:
-                seen.add(fp.as_posix())
-                e = sha256_file(fp)
-                entries.append({"path": e.path, "sha256": e.sha256, "bytes": e.bytes})
-    return {"entries": entries, "count": len(entries)}
+        candidates = sorted(fp.rglob("*")) if fp.is_dir() else [fp]
+        for f2 in candidates:
+            if f2.is_file() and f2.as_posix() not in seen:
+                seen.add(f2.as_posix())
+                out.append(f2)
+    return out
+
+def build_manifest(
+    root: Path,
+    include_globs: List[str],
+    workers: int = 4,
+    stat_cache: Optional[Path] = None,
+    stats: Optional[ManifestStats] = None,
+    known: Optional[Mapping[str, List]] = None,
+) -> Dict[str, object]:
+    """Hash every file matched by ``include_globs`` (dirs are walked) under ``root``.
+
+    Files are hashed on a pool of ``workers`` threads; entry order is the
+    same as a serial walk. With ``stat_cache``, a file whose (size,
+    mtime_ns) match the previous run reuses its recorded digest, as does one
+    whose (size, mtime_ns) match ``known`` (path -> ``[size, mtime_ns,
+    sha256]``, e.g. ``ArtifactWriter.written()``).
+    ``stats`` receives hashed vs reused file and byte counts. Entry paths
+    are POSIX paths relative to ``root``, so a copied or moved run still
+    verifies. ``merkle_root`` commits to every (path, sha256) pair (see
+    ``merkle``).
+    """
+    stats = stats if stats is not None else ManifestStats()
+    files = collect_files(root, include_globs)
+    previous = _load_stat_cache(stat_cache)
+    if known:
+        previous.update(known)
+
+    keys: List[_StatKey] = []
+    digests: List[Optional[str]] = []
+    for fp in files:
+        st = fp.stat()
+        key = (st.st_size, st.st_mtime_ns)
+        prev = previous.get(fp.as_posix())
+        keys.append(key)
+        digests.append(prev[-1] if prev is not None and tuple(prev[:2]) == key else None)
+
+    todo = [i for i, d in enumerate(digests) if d is None]
+    if workers > 1 and len(todo) > 1:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            hashed = list(pool.map(sha256_file, (files[i] for i in todo)))
+    else:
+        hashed = [sha256_file(files[i]) for i in todo]
+
+    sizes = [k[0] for k in keys]
+    for i, e in zip(todo, hashed):
+        digests[i] = e.sha256
+        sizes[i] = e.bytes
+        stats.files_hashed += 1
+        stats.bytes_hashed += e.bytes
+    stats.files_reused += len(files) - len(todo)
+    stats.bytes_reused += sum(sizes) - sum(e.bytes for e in hashed)
+
+    entries: List[Dict[str, object]] = [
+        {"path": fp.relative_to(root).as_posix(), "sha256": d, "bytes": n}
+        for fp, d, n in zip(files, digests, sizes)
+    ]
+    if stat_cache is not None:
+        files_state = {fp.as_posix(): [*k, d] for fp, k, d in zip(files, keys, digests)}
+        dump_json_atomic(stat_cache, {"files": files_state}, indent=None)
+    return {"entries": entries, "count": len(entries), "merkle_root": merkle_root(entries)}
+
+def verify_artifact(fp: Path, proofs: Dict[str, Any], root: str, out_dir: Path) -> Tuple[bool, str]:
+    """Check one file of the run in ``out_dir`` against a Merkle ``root`` using its entry in ``proofs``.
+
+    Re-hashes only ``fp`` and walks its O(log n) inclusion proof. Leaves are
+    keyed by the path relative to ``out_dir``; proofs from older runs, keyed
+    by absolute path, are looked up by ``fp`` itself.
+    Returns ``(ok, reason)``.
+    """
+    try:
+        key = fp.relative_to(out_dir).as_posix()
+    except ValueError:
+        return False, f"not under the run directory {out_dir.as_posix()}"
+    entry = proofs["proofs"].get(key)
+    if entry is None:
+        key = fp.as_posix()
+        entry = proofs["proofs"].get(key)
+    if entry is None:
+        return False, "not in manifest"
+    digest = sha256_file(fp).sha256
+    if digest != entry["sha256"]:
+        return False, f"content changed (sha256 {digest}, manifest {entry['sha256']})"
+    if not verify_proof(leaf_hash(key, digest), entry["proof"], root):
+        return False, "inclusion proof does not match root"
+    return True, "ok"
@@ -0,0 +1,75 @@
+from __future__ import annotations
+import hashlib
+from typing import Dict, List, Sequence, Tuple
+
+# Binary SHA-256 Merkle tree over manifest entries sorted by path. Paths are
+# POSIX and relative to the run directory, so leaves (and proofs, keyed by
+# the same path) stay valid when a run is copied elsewhere for audit.
+# Leaves and interior nodes are domain-separated (0x00 / 0x01 prefixes) so a
+# leaf can never be passed off as an interior node. An unpaired node at the
+# end of a level is promoted unchanged to the next level.
+
+ALGORITHM = "sha256-merkle-v1"
+
+# One proof step: ("L" | "R", sibling hash hex) -- the side the sibling is on.
+ProofStep = Tuple[str, str]
+
+def leaf_hash(path: str, sha256: str) -> bytes:
+    return hashlib.sha256(b"\x00" + path.encode("utf-8") + b"\x00" + sha256.encode("ascii")).digest()
+
+def _node(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(b"\x01" + left + right).digest()
+
+def build_levels(leaves: Sequence[bytes]) -> List[List[bytes]]:
+    """All tree levels, leaves first and the root level (one hash) last."""
+    levels = [list(leaves)]
+    while len(levels[-1]) > 1:
+        cur = levels[-1]
+        nxt = [_node(cur[i], cur[i + 1]) for i in range(0, len(cur) - 1, 2)]
+        if len(cur) % 2:
+            nxt.append(cur[-1])
+        levels.append(nxt)
+    return levels
+
+def root_of(levels: List[List[bytes]]) -> str:
+    # The root of an empty tree is the hash of nothing.
+    return levels[-1][0].hex() if levels[-1] else hashlib.sha256(b"").hexdigest()
+
+def inclusion_proof(levels: List[List[bytes]], index: int) -> List[ProofStep]:
+    """Sibling hashes from leaf ``index`` up to the root (O(log n) steps)."""
+    proof: List[ProofStep] = []
+    for level in levels[:-1]:
+        sibling = index ^ 1
+        if sibling < len(level):  # promoted nodes have no sibling at this level
+            proof.append(("L" if sibling < index else "R", level[sibling].hex()))
+        index //= 2
+    return proof
+
+def verify_proof(leaf: bytes, proof: Sequence[Sequence[str]], root: str) -> bool:
+    h = leaf
+    for side, sibling in proof:
+        s = bytes.fromhex(sibling)
+        h = _node(s, h) if side == "L" else _node(h, s)
+    return h.hex() == root
+
+def sorted_entries(entries: Sequence[Dict[str, object]]) -> List[Dict[str, object]]:
+    return sorted(entries, key=lambda e: str(e["path"]))
+
+def merkle_root(entries: Sequence[Dict[str, object]]) -> str:
+    """Root over manifest ``entries`` (any order; they are sorted by path)."""
+    leaves = [leaf_hash(str(e["path"]), str(e["sha256"])) for e in sorted_entries(entries)]
+    return root_of(build_levels(leaves))
+
+def build_proofs(entries: Sequence[Dict[str, object]]) -> Dict[str, object]:
+    """Root plus one inclusion proof per entry, keyed by path."""
+    ordered = sorted_entries(entries)
+    levels = build_levels([leaf_hash(str(e["path"]), str(e["sha256"])) for e in ordered])
+    return {
+        "algorithm": ALGORITHM,
+        "root": root_of(levels),
+        "count": len(ordered),
+        "proofs": {
+            str(e["path"]): {"index": i, "sha256": e["sha256"], "proof": inclusion_proof(levels, i)}
+            for i, e in enumerate(ordered)
+        },
+    }
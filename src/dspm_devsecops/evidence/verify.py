@@ -0,0 +1,94 @@
+from __future__ import annotations
+import json
+import random
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from dspm_devsecops.evidence.manifest import MANIFEST_GLOBS, collect_files, sha256_file
+from dspm_devsecops.evidence.merkle import merkle_root
+
+@dataclass
+class VerifyReport:
+    checked: int = 0
+    missing: List[str] = field(default_factory=list)
+    changed: List[str] = field(default_factory=list)
+    extra: List[str] = field(default_factory=list)
+    root_ok: bool = True        # manifest's merkle_root matches its entries
+    stopped_early: bool = False  # fail-fast hit a mismatch before checking everything
+
+    @property
+    def ok(self) -> bool:
+        return self.root_ok and not (self.missing or self.changed or self.extra)
+
+def load_manifest(out_dir: Path) -> Dict[str, Any]:
+    return json.loads((out_dir / "evidence" / "manifest.sha256.json").read_text(encoding="utf-8"))
+
+def _check(out_dir: Path, entry: Dict[str, Any]) -> Optional[str]:
+    """None when the file matches its entry, else "missing" / "changed"."""
+    fp = out_dir / entry["path"]  # relative to the run; older manifests hold absolute paths
+    try:
+        size = fp.stat().st_size
+    except FileNotFoundError:
+        return "missing"
+    if size != entry["bytes"]:  # no need to hash
+        return "changed"
+    return None if sha256_file(fp).sha256 == entry["sha256"] else "changed"
+
+def verify_out_dir(
+    out_dir: Path,
+    manifest: Optional[Dict[str, Any]] = None,
+    workers: int = 4,
+    fail_fast: bool = False,
+    sample: Optional[int] = None,
+    seed: int = 0,
+) -> VerifyReport:
+    """Re-hash the artifacts listed in ``out_dir``'s manifest.
+
+    Files are hashed on ``workers`` threads. ``sample`` checks a random
+    subset of that many entries (reproducible via ``seed``). With
+    ``fail_fast``, the first missing/changed file stops the run and
+    cancels hashes not yet started. Files matched by ``MANIFEST_GLOBS``
+    but absent from the manifest are reported as extra. Entries are
+    resolved against ``out_dir``, so a copied or moved run is checked
+    where it is now.
+    """
+    manifest = manifest if manifest is not None else load_manifest(out_dir)
+    entries: List[Dict[str, Any]] = list(manifest["entries"])
+    report = VerifyReport()
+    if "merkle_root" in manifest:
+        report.root_ok = manifest["merkle_root"] == merkle_root(entries)
+
+    listed = {(out_dir / e["path"]).as_posix() for e in entries}
+    report.extra = [
+        fp.relative_to(out_dir).as_posix() for fp in collect_files(out_dir, MANIFEST_GLOBS) if fp.as_posix() not in listed
+    ]
+    if fail_fast and (report.extra or not report.root_ok):
+        report.stopped_early = True
+        return report
+
+    if sample is not None and sample < len(entries):
+        entries = random.Random(seed).sample(entries, sample)
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        running: Dict[Future, Dict[str, Any]] = {pool.submit(_check, out_dir, e): e for e in entries}
+        while running:
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for fut in finished:
+                entry = running.pop(fut)
+                report.checked += 1
+                status = fut.result()
+                if status == "missing":
+                    report.missing.append(entry["path"])
+                elif status == "changed":
+                    report.changed.append(entry["path"])
+            if fail_fast and (report.missing or report.changed) and running:
+                for fut in running:
+                    fut.cancel()
+                report.stopped_early = True
+                break
+    # Completion order is nondeterministic; report in path order.
+    report.missing.sort()
+    report.changed.sort()
+    return report
@@ -0,0 +1,168 @@
+from __future__ import annotations
+import re
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from dspm_devsecops.iac.rules import Resource, RuleRegistry
+from dspm_devsecops.iac.scan_cache import FileScanCache, ScanStats, iter_cached_scans
+
+# NOTE: Bicep is read with a small line-oriented parser (no external deps):
+# ``resource <name> '<type>@<api>' = {`` opens a resource, nested objects
+# become dotted keys (``properties.siteConfig.minTlsVersion``) and arrays are
+# kept as their raw items. Values stay as source text and are never evaluated.
+
+@dataclass(frozen=True)
+class BicepFinding:
+    file: str
+    resource_type: str
+    name: str
+    severity: str
+    message: str
+    evidence: Dict[str, Any]
+
+# ARM resource types (lowercased) have a registry of their own, so these
+# rules never see Terraform or serverless resources and vice versa.
+BICEP_RULES = RuleRegistry()
+
+# Bump when parsing or rules change so cached per-file results are discarded.
+SCANNER_VERSION = "bicep-1"
+
+_RESOURCE = re.compile(r"resource\s+(\w+)\s+'([^'@]+)(?:@[^']*)?'(?:\s+existing)?\s*=.*\{$")
+_PROP = re.compile(r"('(?:[^']|'')*'|[A-Za-z_]\w*)\s*:\s*(.*)$")
+_STRING = re.compile(r"'(?:[^'\\]|\\.)*'")
+
+def scan_bicep_dir(
+    bicep_dir: Path,
+    workers: int = 1,
+    cache_path: Optional[Path] = None,
+    stats: Optional[ScanStats] = None,
+    pool: Optional[Executor] = None,
+) -> List[BicepFinding]:
+    """Scan every ``*.bicep`` under ``bicep_dir`` (sorted, so output is stable).
+
+    Same caching and pooling behavior as ``scan_terraform_dir``.
+    """
+    cache = FileScanCache(cache_path, SCANNER_VERSION)
+    files = sorted(bicep_dir.rglob("*.bicep"))
+    return [
+        BicepFinding(**d)
+        for found in iter_cached_scans(files, _scan_bicep_text, cache, workers=workers, stats=stats, pool=pool)
+        for d in found
+    ]
+
+def _scan_bicep_text(fp: Path, source: str) -> List[BicepFinding]:
+    findings: List[BicepFinding] = []
+    f = fp.as_posix()
+    for rtype, name, attrs in parse_bicep(source):
+        key = rtype.lower()  # ARM types are case-insensitive
+        if not BICEP_RULES.handles(key):
+            continue
+        for severity, message, evidence in BICEP_RULES.run(Resource(key, name, attrs)):
+            findings.append(BicepFinding(
+                file=f, resource_type=rtype, name=name, severity=severity, message=message, evidence=evidence,
+            ))
+    return findings
+
+def _strip_comment(line: str) -> str:
+    if "//" not in line:
+        return line
+    # Blank out string literals so comment markers inside them are ignored.
+    masked = _STRING.sub(lambda m: "'" + "x" * (len(m.group(0)) - 2) + "'", line)
+    cut = masked.find("//")
+    return (line if cut < 0 else line[:cut]).rstrip()
+
+def parse_bicep(text: str) -> List[Tuple[str, str, Dict[str, str]]]:
+    """Return ``(type, symbolic_name, flattened_attrs)`` for each resource.
+
+    Nested (child) resources are returned as resources of their own.
+    Malformed input never raises; unrecognized lines are skipped.
+    """
+    out: List[Tuple[str, str, Dict[str, str]]] = []
+    # One frame per open resource: (type, name, attrs, path of open objects/arrays)
+    frames: List[Tuple[str, str, Dict[str, str], List[str]]] = []
+    in_multiline = False
+    for raw in text.split("\n"):
+        if in_multiline:
+            if "'''" in raw:
+                in_multiline = False
+            continue
+        line = _strip_comment(raw.strip())
+        if not line:
+            continue
+        m = _RESOURCE.match(line)
+        if m is not None:
+            frames.append((m.group(2), m.group(1), {}, []))
+            continue
+        if not frames:
+            continue
+        rtype, name, attrs, path = frames[-1]
+        if line in ("}", "]", "})", "}]"):
+            if path:
+                path.pop()
+            else:
+                out.append((rtype, name, attrs))
+                frames.pop()
+            continue
+        prefix = ".".join(p for p in path if not p.endswith("["))
+        if path and path[-1].endswith("["):  # inside an array
+            arr = path[-1][:-1]
+            base = f"{prefix}.{arr}" if prefix else arr
+            if line == "{":
+                i = 0
+                while f"{base}[{i}]" in attrs:
+                    i += 1
+                attrs[f"{base}[{i}]"] = "{}"
+                path.append(f"{arr}[{i}]")  # object inside array; closed by "}"
+                continue
+            attrs[base] = f"{attrs[base]}, {line}" if attrs.get(base) else line
+            continue
+        pm = _PROP.match(line)
+        if pm is None:
+            continue
+        key = pm.group(1).strip("'")
+        value = pm.group(2).strip()
+        full = f"{prefix}.{key}" if prefix else key
+        if value == "{":
+            path.append(key)
+        elif value == "[":
+            attrs[full] = ""
+            path.append(key + "[")  # array marker; items are joined into attrs[full]
+        else:
+            if value.startswith("'''"):
+                in_multiline = value.count("'''") == 1
+            attrs[full] = value
+    for rtype, name, attrs, _ in reversed(frames):  # unterminated at end of file
+        out.append((rtype, name, attrs))
+    return out
+
+def _value(res: Resource, key: str) -> str:
+    return str(res.attrs.get(key, "")).strip("'").lower()
+
+@BICEP_RULES.rule("microsoft.web/sites")
+def bicep_site_https_only(res: Resource):
+    if _value(res, "properties.httpsOnly") != "true":
+        yield "HIGH", "App/Function app does not enforce HTTPS-only", {"attrs": res.attrs}
+
+@BICEP_RULES.rule("microsoft.web/sites", requires=("properties.siteConfig.cors.allowedOrigins",))
+def bicep_site_cors_any_origin(res: Resource):
+    if "'*'" in res.attrs["properties.siteConfig.cors.allowedOrigins"]:
+        yield "HIGH", "Function app CORS allows any origin ('*')", {"attrs": res.attrs}
+
+@BICEP_RULES.rule("microsoft.web/sites", requires=("properties.siteConfig.minTlsVersion",))
+def bicep_site_weak_tls(res: Resource):
+    if _value(res, "properties.siteConfig.minTlsVersion") in {"1.0", "1.1"}:
+        yield "MEDIUM", "Function app allows TLS below 1.2", {"attrs": res.attrs}
+
+@BICEP_RULES.rule("microsoft.storage/storageaccounts")
+def bicep_storage_public_blob(res: Resource):
+    if _value(res, "properties.allowBlobPublicAccess") == "true":
+        yield "HIGH", "Storage account allows public blob access", {"attrs": res.attrs}
+    if _value(res, "properties.supportsHttpsTrafficOnly") == "false":
+        yield "HIGH", "Storage account accepts plain HTTP traffic", {"attrs": res.attrs}
+
+@BICEP_RULES.rule("microsoft.storage/storageaccounts", requires=("properties.minimumTlsVersion",))
+def bicep_storage_weak_tls(res: Resource):
+    if _value(res, "properties.minimumTlsVersion") in {"tls1_0", "tls1_1"}:
+        yield "MEDIUM", "Storage account allows TLS below 1.2", {"attrs": res.attrs}
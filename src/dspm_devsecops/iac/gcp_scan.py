@@ -0,0 +1,102 @@
+from __future__ import annotations
+from concurrent.futures import Executor
+from pathlib import Path
+from typing import List, Optional
+
+from dspm_devsecops.iac.rules import Resource, RuleRegistry
+from dspm_devsecops.iac.scan_cache import FileScanCache, ScanStats, iter_cached_scans
+from dspm_devsecops.iac.terraform_scan import TerraformFinding, _scan_tf_text
+
+# GCP Terraform (google_* resources). Parsing and dispatch are the Terraform
+# scanner's; the google_* rules live in their own registry so plain Terraform
+# scans do not depend on whether this module was imported.
+GCP_RULES = RuleRegistry()
+
+# Bump when rules change so cached per-file results are discarded.
+SCANNER_VERSION = "gcp-1"
+
+_PUBLIC_MEMBERS = {"allusers", "allauthenticatedusers"}
+
+def scan_gcp_dir(
+    tf_dir: Path,
+    workers: int = 1,
+    cache_path: Optional[Path] = None,
+    stats: Optional[ScanStats] = None,
+    pool: Optional[Executor] = None,
+) -> List[TerraformFinding]:
+    """Scan every ``*.tf`` under ``tf_dir`` against the google_* rules.
+
+    Same caching and pooling behavior as ``scan_terraform_dir``.
+    """
+    cache = FileScanCache(cache_path, SCANNER_VERSION)
+    files = sorted(tf_dir.rglob("*.tf"))
+    return [
+        TerraformFinding(**d)
+        for found in iter_cached_scans(files, _scan_gcp_text, cache, workers=workers, stats=stats, pool=pool)
+        for d in found
+    ]
+
+def _scan_gcp_text(fp: Path, source: str) -> List[TerraformFinding]:
+    return _scan_tf_text(fp, source, GCP_RULES)
+
+def _unquote(v: str) -> str:
+    return v.strip().strip('"').lower()
+
+@GCP_RULES.rule(
+    "google_cloudfunctions_function_iam_member",
+    "google_cloudfunctions2_function_iam_member",
+    "google_cloud_run_service_iam_member",
+    requires=("member",),
+)
+def gcp_public_invoker(res: Resource):
+    if _unquote(res.attrs["member"]) in _PUBLIC_MEMBERS:
+        yield "CRITICAL", "Cloud Function invoker granted to allUsers/allAuthenticatedUsers", {"attrs": res.attrs}
+
+@GCP_RULES.rule(
+    "google_cloudfunctions_function_iam_binding",
+    "google_cloudfunctions2_function_iam_binding",
+    requires=("members",),
+)
+def gcp_public_invoker_binding(res: Resource):
+    members = res.attrs["members"].lower()
+    if any(m in members for m in _PUBLIC_MEMBERS):
+        yield "CRITICAL", "Cloud Function invoker granted to allUsers/allAuthenticatedUsers", {"attrs": res.attrs}
+
+@GCP_RULES.rule("google_cloudfunctions_function", "google_cloudfunctions2_function")
+def gcp_function_ingress_open(res: Resource):
+    ingress = next((_unquote(v) for k, v in res.attrs.items() if k.endswith("ingress_settings")), "allow_all")
+    if ingress == "allow_all":
+        yield (
+            "MEDIUM",
+            "Cloud Function ingress allows all traffic (restrict to internal / load balancer)",
+            {"attrs": res.attrs},
+        )
+
+@GCP_RULES.rule("google_cloudfunctions_function", "google_cloudfunctions2_function")
+def gcp_function_no_vpc_connector(res: Resource):
+    if not any(k.endswith("vpc_connector") for k in res.attrs):
+        yield (
+            "MEDIUM",
+            "Cloud Function has no VPC connector (ephemeral egress harder to bound)",
+            {"attrs": res.attrs},
+        )
+
+@GCP_RULES.rule("google_cloudfunctions_function", "google_cloudfunctions2_function")
+def gcp_function_secret_env(res: Resource):
+    env = " ".join(v for k, v in res.attrs.items() if k.endswith("environment_variables")).lower()
+    if any(s in env for s in ("api_key", "token", "secret", "password")):
+        yield (
+            "HIGH",
+            "Potential secret-like values in function environment (use Secret Manager)",
+            {"attrs": res.attrs},
+        )
+
+@GCP_RULES.rule("google_storage_bucket")
+def gcp_bucket_public_access(res: Resource):
+    prevention = _unquote(res.attrs.get("public_access_prevention", ""))
+    if prevention != "enforced" and _unquote(res.attrs.get("uniform_bucket_level_access", "")) != "true":
+        yield (
+            "MEDIUM",
+            "Storage bucket neither enforces public access prevention nor uniform bucket-level access",
+            {"attrs": res.attrs},
+        )
@@ -0,0 +1,270 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+# Single-pass HCL structure parser. It understands just enough of the syntax
+# (strings with ${...} templates, heredocs, comments, nested brackets) to
+# split a file into blocks and attributes. Attribute values are kept as raw
+# source text, so expressions are never evaluated.
+
+@dataclass
+class Block:
+    type: str
+    labels: List[str]
+    attrs: Dict[str, str] = field(default_factory=dict)
+    blocks: List["Block"] = field(default_factory=list)
+
+_NAME = r"[A-Za-z_][\w\-]*"
+_STRING = r'"[^"\\\n]*(?:\\.[^"\\\n]*)*"'  # one-line string literal with escapes
+_LABELS = r"(?:[ \t]+(?:" + _STRING + "|" + _NAME + r"))*"
+
+# Line fast path: the overwhelmingly common statement shapes fit on one line:
+# blank/comment, ``}``, ``type "label" {`` and ``name = value``. A one-line
+# value is accepted only when it provably ends on this line: a bare token run,
+# one string literal (templates without quotes), or one flat [...]/{...}/(...)
+# of such pieces. Anything else (multi-line values, heredocs, one-line blocks,
+# /* */ comments) falls back to the statement parser for just that stretch.
+_FSTR = r'"[^"\\$%\n]*(?:(?:[$%](?!\{)|[$%]\{[^{}"\n]*\})[^"\\$%\n]*)*"'
+_FGROUP = r"[\[{(][^\[\](){}\"\\\n#/<]*(?:" + _FSTR + r"[^\[\](){}\"\\\n#/<]*)*[\]})]"
+_PLAIN = r"[^\[\](){}<#/\"\\\s](?:[^\[\](){}<#/\"\\\n]*[^\[\](){}<#/\"\\\s])?"
+_LINE = re.compile(
+    r"[ \t]*(?:(?P<name>" + _NAME + r")[ \t]*=(?![=>])[ \t]*(?P<value>" + _FSTR + "|" + _FGROUP + "|" + _PLAIN + r")"
+    r"|(?P<type>" + _NAME + r")(?P<labels>" + _LABELS + r")[ \t]*\{"
+    r"|(?P<close>\})|(?:\#|//)[^\n]*)?[ \t]*\r?(?:\n|\Z)"
+)
+
+# Statement fallback: leading trivia, then a closing brace, an attribute head
+# (value finished by _scan_expr), a block header, or an unrecognized line
+# that is skipped.
+_STMT = re.compile(
+    r"(?:\s+|\#[^\n]*|//[^\n]*|/\*.*?\*/)*"
+    r"(?:\}(?P<close>)"
+    r"|(?P<name>" + _NAME + r")"
+    r"(?:[ \t]*=(?![=>])[ \t]*(?P<expr>)|(?P<labels>" + _LABELS + r")[ \t]*\{(?P<open>))"
+    r"|[^\n]+(?P<skip>))",
+    re.S,
+)
+_REST_OF_LINE = re.compile(r"[ \t]*(?:(?:\#|//)[^\n]*)?\r?\n")
+_LABEL = re.compile(r'"(' + _STRING[1:-1] + r')"|(' + _NAME + r")")
+_EXPR_SPECIAL = re.compile(r"[\"\n{}\[\]()#/<]")
+_STR_SPECIAL = re.compile(r'["\\]|[$%]\{')
+_HEREDOC = re.compile(r"<<(-?)([A-Za-z_][\w]*)[ \t]*\r?\n")
+_EOL = re.compile(r"\n|\Z")
+
+# Flat files (one-level blocks, one attribute per line, no heredocs or
+# templates) are read line by line with cheaper regexes, which keeps them as
+# fast as the line scanner this parser replaced. The first line that needs
+# more hands the whole file to the full parser.
+_FLAT_HEADER = re.compile(r'[ \t]*(' + _NAME + r')((?:[ \t]+"[^"\n]*")*)[ \t]*\{[ \t]*\r?$')
+_FLAT_RUN = r'[^\n"\[\](){}#/]*(?:(?:"[^"\n{}]*"|/(?!/))[^\n"\[\](){}#/]*)*'
+_FLAT_ATTR = re.compile(
+    r"[ \t]*(" + _NAME + r")[ \t]*=(?![=>])[ \t]*"
+    r"(" + _FLAT_RUN + r"(?:\[" + _FLAT_RUN + r"\]" + _FLAT_RUN + r")*)(?<![ \t\r])[ \t]*\r?$"
+)
+
+def _labels(raw: str) -> List[str]:
+    if not raw:
+        return []
+    parts = raw.split('"')
+    if "\\" not in raw and not "".join(parts[0::2]).strip():
+        return parts[1::2]  # all labels quoted (the usual case)
+    return [a or b for a, b in _LABEL.findall(raw)]
+
+def parse_hcl(text: str) -> List[Block]:
+    """Parse ``text`` into its top-level blocks.
+
+    Runs in one left-to-right pass with an explicit block stack. Malformed
+    input never raises: unrecognized lines and stray ``}`` at top level are
+    skipped, and blocks left open at end of file are closed there.
+    """
+    flat = _parse_flat(text)
+    if flat is not None:
+        return flat
+    root = Block(type="", labels=[])
+    stack = [root]
+    attrs = root.attrs
+    line_match = _LINE.match
+    pos = 0
+    n = len(text)
+    while pos < n:
+        m = line_match(text, pos)
+        if m is None:
+            pos = _parse_statements(text, pos, stack)
+            attrs = stack[-1].attrs
+            continue
+        pos = m.end()
+        kind = m.lastgroup
+        if kind == "value":
+            attrs[m[1]] = m[2]
+        elif kind == "labels":
+            child = Block(type=m.group(3), labels=_labels(m.group(4)))
+            stack[-1].blocks.append(child)
+            stack.append(child)
+            attrs = child.attrs
+        elif kind == "close":
+            if len(stack) > 1:
+                stack.pop()
+                attrs = stack[-1].attrs
+    return root.blocks
+
+def _parse_flat(text: str) -> Optional[List[Block]]:
+    # None unless every line is blank, a full-line comment, a ``type "label" {``
+    # header, a lone ``}`` or a one-line ``name = value`` inside a block.
+    if "<<" in text or "\\" in text or "/*" in text or "${" in text or "%{" in text:
+        return None
+    blocks: List[Block] = []
+    attrs = None  # of the open block
+    attr_match = _FLAT_ATTR.match
+    for line in text.split("\n"):
+        m = attr_match(line)
+        if m is None:
+            if "{" in line:
+                m = _FLAT_HEADER.match(line)
+                if m is None or attrs is not None:
+                    return None
+                attrs = {}
+                blocks.append(Block(m.group(1), m.group(2).split('"')[1::2], attrs))
+                continue
+            stripped = line.strip()
+            if stripped == "}" and attrs is not None:
+                attrs = None
+                continue
+            if not stripped or stripped[0] == "#" or stripped.startswith("//"):
+                continue
+            # brackets, a comment after the value, ...: _LINE decides where it ends
+            m = _LINE.match(line)
+            if m is None or m.lastgroup != "value":
+                return None
+        if attrs is None:
+            return None
+        attrs[m[1]] = m[2]
+    return None if attrs is not None else blocks
+
+def _parse_statements(text: str, pos: int, stack: List[Block]) -> int:
+    # Parse statements from pos until the rest of a line is trivia; returns
+    # the offset of the next line start (or len(text)).
+    n = len(text)
+    while pos < n:
+        m = _STMT.match(text, pos)
+        pos = m.end()
+        kind = m.lastgroup
+        if kind == "expr":
+            end = _scan_expr(text, pos)
+            stack[-1].attrs[m.group("name")] = text[pos:end].rstrip()
+            pos = end
+        elif kind == "open":
+            child = Block(type=m.group("name"), labels=_labels(m.group("labels")))
+            stack[-1].blocks.append(child)
+            stack.append(child)
+        elif kind == "close":
+            if len(stack) > 1:
+                stack.pop()
+        r = _REST_OF_LINE.match(text, pos)
+        if r is not None:
+            return r.end()
+    return n
+
+def _skip_string(text: str, pos: int) -> int:
+    # pos is just past the opening quote; returns the index after the closing one.
+    depth = 0  # nesting of ${ ... } template interpolations
+    while True:
+        if depth == 0:
+            m = _STR_SPECIAL.search(text, pos)
+            if m is None:
+                return len(text)
+            c = m.group(0)
+            pos = m.end()
+            if c == '"':
+                return pos
+            if c == "\\":
+                pos += 1
+            else:
+                depth = 1
+        else:
+            m = _EXPR_SPECIAL.search(text, pos)
+            if m is None:
+                return len(text)
+            c = m.group(0)
+            pos = m.end()
+            if c == '"':
+                pos = _skip_string(text, pos)
+            elif c == "{":
+                depth += 1
+            elif c == "}":
+                depth -= 1
+
+def _scan_expr(text: str, pos: int) -> int:
+    """Return the end offset of the expression starting at ``pos``.
+
+    The expression ends at a newline or comment outside any brackets, or at an
+    unbalanced ``}`` (a one-line block like ``x { a = 1 }``).
+    """
+    depth = 0
+    n = len(text)
+    while True:
+        m = _EXPR_SPECIAL.search(text, pos)
+        if m is None:
+            return n
+        c = m.group(0)
+        i = m.start()
+        if c == '"':
+            pos = _skip_string(text, i + 1)
+        elif c == "\n":
+            if depth == 0:
+                return i
+            pos = i + 1
+        elif c in "{[(":
+            depth += 1
+            pos = i + 1
+        elif c in "}])":
+            if depth == 0:
+                return i
+            depth -= 1
+            pos = i + 1
+        elif c == "#" or (c == "/" and text.startswith("//", i)):
+            if depth == 0:
+                return i
+            pos = _EOL.search(text, i).start()
+        elif c == "/" and text.startswith("/*", i):
+            close = text.find("*/", i + 2)
+            pos = n if close < 0 else close + 2
+        elif c == "<":
+            h = _HEREDOC.match(text, i)
+            if h is None:
+                pos = i + 1
+                continue
+            tag = re.escape(h.group(2))
+            term = re.compile(rf"^[ \t]*{tag}[ \t]*\r?$", re.M).search(text, h.end())
+            pos = n if term is None else term.end()
+        else:
+            pos = i + 1
+
+def flatten_attrs(block: Block) -> Dict[str, str]:
+    """Attributes of ``block`` with nested blocks folded in as dotted keys.
+
+    ``vpc_config { subnet_ids = [...] }`` becomes ``vpc_config.subnet_ids``;
+    repeated blocks are numbered (``ingress``, ``ingress[1]``, ...), and an
+    empty nested block is kept as ``{"name": "{}"}`` so its presence shows.
+    Blocks without nested blocks return their own ``attrs`` (no copy).
+    """
+    if not block.blocks:
+        return block.attrs
+    out = dict(block.attrs)
+    seen: Dict[str, int] = {}
+    for b in block.blocks:
+        prefix = ".".join([b.type, *b.labels])
+        k = seen.get(prefix, 0)
+        seen[prefix] = k + 1
+        if k:
+            prefix = f"{prefix}[{k}]"
+        sub = flatten_attrs(b)
+        if not sub:
+            out[prefix] = "{}"
+        for key, v in sub.items():
+            out[f"{prefix}.{key}"] = v
+    return out
+
+def resources(blocks: List[Block]) -> List[Tuple[str, str, Block]]:
+    return [(b.labels[0], b.labels[1], b) for b in blocks if b.type == "resource" and len(b.labels) >= 2]
@@ -0,0 +1,116 @@
+from __future__ import annotations
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+# One check engine for all IaC scanners. Rules register against resource
+# types (Terraform types like "aws_lambda_function", or "serverless_function"
+# for serverless.yml entries); dispatch is one dict lookup per resource.
+# Per-rule calls/hits/time are only measured inside ``collect_rule_stats()``,
+# which scan jobs open around each file so the counts travel back from
+# worker processes with the findings.
+
+Hit = Tuple[str, str, Dict[str, Any]]  # (severity, message, evidence)
+
+class Resource:
+    """What a rule sees: type, name, attributes and optional file context."""
+
+    __slots__ = ("type", "name", "attrs", "context", "_blob")
+
+    def __init__(self, rtype: str, name: str, attrs: Mapping[str, Any], context: Optional[Mapping[str, Any]] = None):
+        self.type = rtype
+        self.name = name
+        self.attrs = attrs
+        self.context = context or {}
+        self._blob = None
+
+    @property
+    def blob(self) -> str:
+        """Lowercased attribute values joined by spaces (built once, on first use)."""
+        if self._blob is None:
+            self._blob = " ".join(map(str, self.attrs.values())).lower()
+        return self._blob
+
+@dataclass
+class RuleStats:
+    calls: int = 0
+    hits: int = 0
+    seconds: float = 0.0
+
+    def add(self, other: "RuleStats") -> None:
+        self.calls += other.calls
+        self.hits += other.hits
+        self.seconds += other.seconds
+
+_active = threading.local()
+
+@contextmanager
+def collect_rule_stats() -> Iterator[Dict[str, RuleStats]]:
+    """Collect per-rule stats of every ``RuleRegistry.run`` on this thread into the yielded dict."""
+    prev = getattr(_active, "stats", None)
+    _active.stats = stats = {}
+    try:
+        yield stats
+    finally:
+        _active.stats = prev
+
+def merge_rule_stats(into: Dict[str, RuleStats], stats: Mapping[str, RuleStats]) -> None:
+    for name, s in stats.items():
+        into.setdefault(name, RuleStats()).add(s)
+
+def rule_timing_report(stats: Mapping[str, RuleStats]) -> List[Dict[str, Any]]:
+    """Per-rule counters, slowest first."""
+    rows = [
+        {"rule": name, "calls": s.calls, "hits": s.hits, "seconds": round(s.seconds, 6)}
+        for name, s in stats.items()
+    ]
+    return sorted(rows, key=lambda r: (-r["seconds"], r["rule"]))
+
+@dataclass(frozen=True)
+class _Rule:
+    name: str
+    fn: Callable[[Resource], Iterable[Hit]]
+    requires: Tuple[str, ...]
+
+class RuleRegistry:
+    def __init__(self) -> None:
+        self._by_type: Dict[str, List[_Rule]] = {}
+
+    def rule(self, *types: str, requires: Iterable[str] = ()) -> Callable:
+        """Decorator registering a generator of ``(severity, message, evidence)``.
+
+        The rule runs only for the given resource types, and only when every
+        attribute in ``requires`` is present. Rules run in registration order.
+        """
+        def register(fn: Callable[[Resource], Iterable[Hit]]) -> Callable[[Resource], Iterable[Hit]]:
+            r = _Rule(fn.__name__, fn, tuple(requires))
+            for t in types:
+                self._by_type.setdefault(t, []).append(r)
+            return fn
+        return register
+
+    def handles(self, rtype: str) -> bool:
+        return rtype in self._by_type
+
+    def run(self, res: Resource) -> Iterator[Hit]:
+        """Yield hits of every rule registered for ``res.type``."""
+        stats = getattr(_active, "stats", None)
+        for r in self._by_type.get(res.type, ()):
+            if r.requires and not all(k in res.attrs for k in r.requires):
+                continue
+            if stats is None:
+                yield from r.fn(res)
+                continue
+            t0 = time.perf_counter()
+            hits = list(r.fn(res))
+            st = stats.get(r.name)
+            if st is None:
+                st = stats[r.name] = RuleStats()
+            st.seconds += time.perf_counter() - t0
+            st.calls += 1
+            st.hits += len(hits)
+            yield from hits
+
+RULES = RuleRegistry()
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from dspm_devsecops.iac.rules import RuleStats, collect_rule_stats, merge_rule_stats
+
+@dataclass
+class ScanStats:
+    files_scanned: int = 0
+    files_skipped: int = 0
+    seconds_per_file: Dict[str, float] = field(default_factory=dict)
+    rules: Dict[str, RuleStats] = field(default_factory=dict)  # over the files scanned this run
+
+    def slowest(self) -> Optional[str]:
+        if not self.seconds_per_file:
+            return None
+        return max(self.seconds_per_file, key=self.seconds_per_file.__getitem__)
+
+class FileScanCache:
+    """Per-file scan results keyed on (path, mtime_ns, size, sha256, scanner version).
+
+    A file whose stat is unchanged is reused without being read. If the stat
+    changed, the caller re-hashes the content and can still reuse the entry
+    when the hash matches (e.g. a fresh checkout touching mtimes). Stored as
+    one JSON document; ``path=None`` gives a throwaway in-memory cache.
+    """
+
+    def __init__(self, path: Optional[Path], scanner_version: str) -> None:
+        self.path = path
+        self.scanner_version = scanner_version
+        self._files: Dict[str, Dict[str, Any]] = {}
+        self._dirty = False
+        if path is not None and path.exists():
+            try:
+                doc = json.loads(path.read_text(encoding="utf-8"))
+            except ValueError:
+                doc = {}
+            if doc.get("scanner_version") == scanner_version:
+                self._files = doc.get("files", {})
+
+    def fresh(self, key: str, st: os.stat_result) -> Optional[List[Dict[str, Any]]]:
+        e = self._files.get(key)
+        if e is not None and e["mtime_ns"] == st.st_mtime_ns and e["size"] == st.st_size:
+            return e["results"]
+        return None
+
+    def results(self, key: str) -> List[Dict[str, Any]]:
+        return self._files[key]["results"]
+
+    def cached_sha256(self, key: str) -> Optional[str]:
+        e = self._files.get(key)
+        return e["sha256"] if e is not None else None
+
+    def store(self, key: str, st: os.stat_result, sha256: str, results: List[Dict[str, Any]]) -> None:
+        self._files[key] = {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "sha256": sha256, "results": results}
+        self._dirty = True
+
+    def retain(self, keys: List[str]) -> None:
+        # Drop entries for files that no longer exist.
+        keep = set(keys)
+        stale = [k for k in self._files if k not in keep]
+        for k in stale:
+            del self._files[k]
+        self._dirty = self._dirty or bool(stale)
+
+    def save(self) -> None:
+        if self.path is None or not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent, prefix=self.path.name, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            json.dump({"scanner_version": self.scanner_version, "files": self._files}, fh)
+        os.replace(tmp, self.path)
+        self._dirty = False
+
+ScanText = Callable[[Path, str], List[Any]]  # (file, source) -> findings (dataclasses)
+
+ScanJobResult = Tuple[str, Optional[List[Dict[str, Any]]], float, Dict[str, RuleStats]]
+
+def scan_file_job(scan_text: ScanText, job: Tuple[Path, Optional[str]]) -> ScanJobResult:
+    # Returns (sha256, findings as dicts or None if the content hash matched,
+    # seconds, per-rule stats); the stats come back from pool workers this way.
+    fp, known_sha = job
+    t0 = time.perf_counter()
+    data = fp.read_bytes()
+    sha = hashlib.sha256(data).hexdigest()
+    if sha == known_sha:
+        return sha, None, time.perf_counter() - t0, {}
+    with collect_rule_stats() as rules:
+        found = [f.__dict__ for f in scan_text(fp, data.decode("utf-8", errors="ignore"))]
+    return sha, found, time.perf_counter() - t0, rules
+
+def iter_cached_scans(
+    files: List[Path],
+    scan_text: ScanText,
+    cache: FileScanCache,
+    workers: int = 1,
+    stats: Optional[ScanStats] = None,
+    pool: Optional[Executor] = None,
+) -> Iterator[List[Dict[str, Any]]]:
+    """Yield each file's findings (as dicts) in ``files`` order.
+
+    Cache hits are yielded without reading the file; misses are scanned
+    lazily, on ``pool`` if given (shared between scanners), else on a process
+    pool of its own when ``workers > 1``. ``scan_text`` must then be a
+    module-level function. The cache is saved once every file was yielded.
+    """
+    stats = stats if stats is not None else ScanStats()
+    keys = [fp.as_posix() for fp in files]
+    stat_results = [fp.stat() for fp in files]
+    hits = [cache.fresh(k, st) for k, st in zip(keys, stat_results)]
+    jobs = [(fp, cache.cached_sha256(k)) for fp, k, hit in zip(files, keys, hits) if hit is None]
+    job = partial(scan_file_job, scan_text)
+
+    with ExitStack() as stack:
+        if pool is not None and jobs:
+            results = pool.map(job, jobs)
+        elif workers > 1 and len(jobs) > 1:
+            pool = stack.enter_context(ProcessPoolExecutor(max_workers=workers))
+            results = pool.map(job, jobs, chunksize=max(1, len(jobs) // (workers * 4)))
+        else:
+            results = map(job, jobs)
+
+        for key, st, found in zip(keys, stat_results, hits):
+            if found is not None:
+                stats.files_skipped += 1
+                yield found
+                continue
+            sha, found, elapsed, rules = next(results)
+            if found is None:  # content unchanged, only the stat moved
+                found = cache.results(key)
+                stats.files_skipped += 1
+            else:
+                stats.files_scanned += 1
+                stats.seconds_per_file[key] = elapsed
+                merge_rule_stats(stats.rules, rules)
+            cache.store(key, st, sha, found)
+            yield found
+
+    cache.retain(keys)
+    cache.save()
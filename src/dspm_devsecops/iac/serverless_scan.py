@@ -1,10 +1,15 @@
 from __future__ import annotations
+import re
+from concurrent.futures import Executor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List, Optional
 
 import yaml
 
+from dspm_devsecops.iac.rules import RULES, Resource
+from dspm_devsecops.iac.scan_cache import FileScanCache, ScanStats, iter_cached_scans
+
 @dataclass(frozen=True)
 class ServerlessFinding:
     file: str
@@ -13,65 +18,136 @@ class ServerlessFinding:
     message: str
     evidence: Dict[str, Any]
 
+# libyaml-backed loader when PyYAML was built with it; same results, much faster.
+_Loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Bump when parsing or rules change so cached per-file results are discarded.
+SCANNER_VERSION = "sls-2"
+
+SERVERLESS_FILENAMES = ("serverless.yml", "serverless.yaml")
+
+def scan_serverless_dir(
+    sls_dir: Path,
+    workers: int = 1,
+    cache_path: Optional[Path] = None,
+    stats: Optional[ScanStats] = None,
+    pool: Optional[Executor] = None,
+) -> Iterator[ServerlessFinding]:
+    """Stream findings for every serverless.yml/.yaml under ``sls_dir``.
+
+    Files are visited in sorted path order and findings are yielded as each
+    file completes, scanned on ``pool`` if given, else on a process pool when
+    ``workers > 1``. With a ``cache_path``, unchanged files (same stat, or
+    same content hash) reuse their previous results; the cache is written
+    once the iterator is exhausted.
+    """
+    cache = FileScanCache(cache_path, SCANNER_VERSION)
+    files = sorted(fp for name in SERVERLESS_FILENAMES for fp in sls_dir.rglob(name))
+    for found in iter_cached_scans(files, _scan_sls_text, cache, workers=workers, stats=stats, pool=pool):
+        for d in found:
+            yield ServerlessFinding(**d)
+
 def scan_serverless_yaml(yaml_path: Path) -> List[ServerlessFinding]:
-    doc = yaml.safe_load(yaml_path.read_text(encoding="utf-8", errors="ignore")) or {}
+    return _scan_sls_text(yaml_path, yaml_path.read_text(encoding="utf-8", errors="ignore"))
+
+def _scan_sls_text(fp: Path, source: str) -> List[ServerlessFinding]:
     findings: List[ServerlessFinding] = []
-    functions = (doc.get("functions") or {})
-
-    provider = doc.get("provider") or {}
-    logs = provider.get("logs") or {}
-    vpc = provider.get("vpc")
-
-    for fn_name, fn in functions.items():
-        events = fn.get("events") or []
-        env = fn.get("environment") or {}
-        # Trigger surface checks
-        for ev in events:
-            if "http" in ev or "httpApi" in ev:
-                findings.append(ServerlessFinding(
-                    file=yaml_path.as_posix(),
-                    function=fn_name,
-                    severity="HIGH",
-                    message="HTTP-triggered function: treat as public invocation surface unless tightly authz-gated",
-                    evidence={"event": ev},
-                ))
-            if "s3" in ev or "sqs" in ev or "eventBridge" in ev:
+    f = fp.as_posix()
+    # A file may hold several documents (``---``); each is scanned on its own.
+    for doc in yaml.load_all(source, Loader=_Loader):
+        if not isinstance(doc, dict):
+            continue
+        functions = (doc.get("functions") or {})
+
+        provider = doc.get("provider") or {}
+        context = {"provider_logs": provider.get("logs") or {}, "provider_vpc": provider.get("vpc")}
+
+        for fn_name, fn in functions.items():
+            res = Resource("serverless_function", fn_name, fn or {}, context)
+            for severity, message, evidence in RULES.run(res):
                 findings.append(ServerlessFinding(
-                    file=yaml_path.as_posix(),
-                    function=fn_name,
-                    severity="MEDIUM",
-                    message="Event-triggered function: ensure least-privilege + event source allowlist",
-                    evidence={"event": ev},
+                    file=f, function=fn_name, severity=severity, message=message, evidence=evidence,
                 ))
 
-        # Env leakage hint
-        if any(k.lower() in {"api_key", "token", "secret"} for k in env.keys()):
-            findings.append(ServerlessFinding(
-                file=yaml_path.as_posix(),
-                function=fn_name,
-                severity="HIGH",
-                message="Potential secret-like keys in function environment (use secrets manager + runtime fetch)",
-                evidence={"environment_keys": list(env.keys())},
-            ))
-
-        # Logging / retention hint
-        if not logs:
-            findings.append(ServerlessFinding(
-                file=yaml_path.as_posix(),
-                function=fn_name,
-                severity="LOW",
-                message="Provider logging not explicitly configured; ensure retention + redaction policy",
-                evidence={"provider_logs": logs},
-            ))
-
-        # VPC attachment signal
-        if not (fn.get("vpc") or vpc):
-            findings.append(ServerlessFinding(
-                file=yaml_path.as_posix(),
-                function=fn_name,
-                severity="MEDIUM",
-                message="Function not VPC-attached: egress is less CIDR-bounded (model via identity + trigger graph)",
-                evidence={},
-            ))
-
     return findings
+
+# Trigger surface checks
+@RULES.rule("serverless_function")
+def trigger_surface(res: Resource):
+    for ev in res.attrs.get("events") or []:
+        if "http" in ev or "httpApi" in ev:
+            yield (
+                "HIGH",
+                "HTTP-triggered function: treat as public invocation surface unless tightly authz-gated",
+                {"event": ev},
+            )
+        if "s3" in ev or "sqs" in ev or "eventBridge" in ev:
+            yield (
+                "MEDIUM",
+                "Event-triggered function: ensure least-privilege + event source allowlist",
+                {"event": ev},
+            )
+
+# Env leakage hint
+@RULES.rule("serverless_function", requires=("environment",))
+def secret_like_env_keys(res: Resource):
+    env = res.attrs["environment"] or {}
+    if any(k.lower() in {"api_key", "token", "secret"} for k in env.keys()):
+        yield (
+            "HIGH",
+            "Potential secret-like keys in function environment (use secrets manager + runtime fetch)",
+            {"environment_keys": list(env.keys())},
+        )
+
+# Data a function is wired to: an inventory asset id
+# (``cloud:<provider>:<service>:<name>``) or an AWS ARN naming the same asset,
+# e.g. ``arn:aws:rds:us-east-1:123456789012:db:payments`` -> ``cloud:aws:rds:payments``.
+_ASSET_ID = re.compile(r"cloud:[\w-]+:[\w-]+:[^\s:]+")
+_AWS_ARN = re.compile(r"arn:aws[\w-]*:([\w-]+):[^:]*:[^:]*:(.+?)(?:[:/]\*)?")
+
+def _asset_ref(value: Any) -> Optional[str]:
+    if not isinstance(value, str):
+        return None
+    if _ASSET_ID.fullmatch(value):
+        return value
+    m = _AWS_ARN.fullmatch(value)
+    if m is None:
+        return None
+    return f"cloud:aws:{m.group(1)}:{re.split(r'[:/]', m.group(2))[-1]}"
+
+@RULES.rule("serverless_function")
+def data_asset_access(res: Resource):
+    # Environment values and per-function IAM statement resources
+    env = res.attrs.get("environment") or {}
+    values = list(env.values()) if isinstance(env, dict) else []
+    for st in res.attrs.get("iamRoleStatements") or []:
+        resource = st.get("Resource") if isinstance(st, dict) else None
+        values.extend(resource if isinstance(resource, list) else [resource])
+    assets = sorted({a for a in map(_asset_ref, values) if a})
+    if assets:
+        yield (
+            "INFO",
+            "Function references data assets: modeled as compute -> data exposure edges",
+            {"data_assets": assets},
+        )
+
+# Logging / retention hint
+@RULES.rule("serverless_function")
+def provider_logging_missing(res: Resource):
+    logs = res.context["provider_logs"]
+    if not logs:
+        yield (
+            "LOW",
+            "Provider logging not explicitly configured; ensure retention + redaction policy",
+            {"provider_logs": logs},
+        )
+
+# VPC attachment signal
+@RULES.rule("serverless_function")
+def function_not_vpc_attached(res: Resource):
+    if not (res.attrs.get("vpc") or res.context["provider_vpc"]):
+        yield (
+            "MEDIUM",
+            "Function not VPC-attached: egress is less CIDR-bounded (model via identity + trigger graph)",
+            {},
+        )
@@ -1,11 +1,16 @@
 from __future__ import annotations
 import re
+from concurrent.futures import Executor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
-# NOTE: This is intentionally lightweight (no full HCL parser) to keep the demo runnable everywhere.
-# It looks for "risk-relevant patterns" commonly present in Terraform.
+from dspm_devsecops.iac.hcl import flatten_attrs, parse_hcl, resources
+from dspm_devsecops.iac.rules import RULES, Resource, RuleRegistry
+from dspm_devsecops.iac.scan_cache import FileScanCache, ScanStats, iter_cached_scans
+
+# NOTE: Structure comes from the small built-in HCL parser (iac/hcl.py, no external deps);
+# checks look for "risk-relevant patterns" commonly present in Terraform.
 
 @dataclass(frozen=True)
 class TerraformFinding:
@@ -16,98 +21,82 @@ class TerraformFinding:
     message: str
     evidence: Dict[str, Any]
 
-_RESOURCE_RE = re.compile(r'resource\s+"([^"]+)"\s+"([^"]+)"\s*\{', re.IGNORECASE)
-_ATTR_RE = re.compile(r'^\s*([A-Za-z0-9_]+)\s*=\s*(.+?)\s*$', re.IGNORECASE)
-
-def scan_terraform_dir(tf_dir: Path) -> List[TerraformFinding]:
-    findings: List[TerraformFinding] = []
-    for fp in sorted(tf_dir.rglob("*.tf")):
-        findings.extend(_scan_tf_file(fp))
-    return findings
-
-def _scan_tf_file(fp: Path) -> List[TerraformFinding]:
-    text = fp.read_text(encoding="utf-8", errors="ignore").splitlines()
+# Bump when parsing or rules change so cached per-file results are discarded.
+SCANNER_VERSION = "tf-3"
+
+def scan_terraform_dir(
+    tf_dir: Path,
+    workers: int = 1,
+    cache_path: Optional[Path] = None,
+    stats: Optional[ScanStats] = None,
+    pool: Optional[Executor] = None,
+) -> List[TerraformFinding]:
+    """Scan every ``*.tf`` under ``tf_dir`` (sorted, so output is stable).
+
+    Files are scanned on ``pool`` if given, else on a process pool when
+    ``workers > 1``. With a ``cache_path``, results of unchanged files (same
+    stat, or same content hash) are reused from the previous run. ``stats`` receives scanned and
+    skipped counts plus per-file scan time.
+    """
+    cache = FileScanCache(cache_path, SCANNER_VERSION)
+    files = sorted(tf_dir.rglob("*.tf"))
+    return [
+        TerraformFinding(**d)
+        for found in iter_cached_scans(files, _scan_tf_text, cache, workers=workers, stats=stats, pool=pool)
+        for d in found
+    ]
+
+def _scan_tf_text(fp: Path, source: str, rules: RuleRegistry = RULES) -> List[TerraformFinding]:
     findings: List[TerraformFinding] = []
-
-    cur_res = None
-    attrs: Dict[str, str] = {}
-
-    for line in text:
-        m = _RESOURCE_RE.search(line)
-        if m:
-            # flush any previous resource
-            if cur_res:
-                findings.extend(_analyze_resource(fp, cur_res[0], cur_res[1], attrs))
-            cur_res = (m.group(1), m.group(2))
-            attrs = {}
-            continue
-
-        if cur_res:
-            if "}" in line:
-                # end resource
-                findings.extend(_analyze_resource(fp, cur_res[0], cur_res[1], attrs))
-                cur_res = None
-                attrs = {}
-                continue
-
-            am = _ATTR_RE.match(line)
-            if am:
-                attrs[am.group(1)] = am.group(2).strip()
-
-    # flush last
-    if cur_res:
-        findings.extend(_analyze_resource(fp, cur_res[0], cur_res[1], attrs))
-
-    return findings
-
-def _analyze_resource(fp: Path, rtype: str, name: str, attrs: Dict[str, str]) -> List[TerraformFinding]:
-    out: List[TerraformFinding] = []
     f = fp.as_posix()
-
-    # Example risk patterns
-    if rtype in {"aws_s3_bucket_public_access_block", "aws_s3_bucket_acl"}:
-        if "public" in " ".join(attrs.values()).lower():
-            out.append(TerraformFinding(
-                file=f, resource_type=rtype, name=name, severity="HIGH",
-                message="Potential public S3 exposure pattern detected",
-                evidence={"attrs": attrs},
-            ))
-
-    if rtype in {"aws_lambda_function", "aws_lambda_permission"}:
-        # Look for broad invoke permissions or missing VPC attachment
-        if rtype == "aws_lambda_permission":
-            principal = attrs.get("principal", "")
-            if "*" in principal.replace('"', ''):
-                out.append(TerraformFinding(
-                    file=f, resource_type=rtype, name=name, severity="CRITICAL",
-                    message="Lambda invoke permission appears wildcarded (principal='*')",
-                    evidence={"attrs": attrs},
-                ))
-        if rtype == "aws_lambda_function":
-            if "vpc_config" not in " ".join(attrs.keys()).lower():
-                out.append(TerraformFinding(
-                    file=f, resource_type=rtype, name=name, severity="MEDIUM",
-                    message="Lambda function appears not VPC-attached (ephemeral egress harder to bound)",
-                    evidence={"attrs": attrs},
-                ))
-
-    if rtype in {"aws_iam_policy", "aws_iam_role_policy"}:
-        blob = " ".join(attrs.values()).lower()
-        if "action" in blob and ("*" in blob or "admin" in blob):
-            out.append(TerraformFinding(
-                file=f, resource_type=rtype, name=name, severity="HIGH",
-                message="IAM policy may be overly broad (wildcards/admin-like patterns)",
-                evidence={"attrs": attrs},
-            ))
-
-    # Generic network egress hint
-    if rtype in {"aws_security_group", "aws_security_group_rule"}:
-        blob = " ".join(attrs.values()).lower()
-        if "0.0.0.0/0" in blob and ("egress" in blob or "from_port" in blob):
-            out.append(TerraformFinding(
-                file=f, resource_type=rtype, name=name, severity="HIGH",
-                message="Security group rule may allow broad internet egress/ingress",
-                evidence={"attrs": attrs},
+    for rtype, name, block in resources(parse_hcl(source)):
+        if not rules.handles(rtype):
+            continue
+        res = Resource(rtype, name, flatten_attrs(block))
+        for severity, message, evidence in rules.run(res):
+            findings.append(TerraformFinding(
+                file=f, resource_type=rtype, name=name, severity=severity,
+                message=message, evidence=evidence,
             ))
+    return findings
 
-    return out
+# Example risk patterns
+
+@RULES.rule("aws_s3_bucket_public_access_block", "aws_s3_bucket_acl")
+def s3_public_exposure(res: Resource):
+    if "public" in res.blob:
+        yield "HIGH", "Potential public S3 exposure pattern detected", {"attrs": res.attrs}
+
+@RULES.rule("aws_lambda_permission", requires=("principal",))
+def lambda_wildcard_principal(res: Resource):
+    # Look for broad invoke permissions
+    if "*" in res.attrs["principal"].replace('"', ''):
+        yield "CRITICAL", "Lambda invoke permission appears wildcarded (principal='*')", {"attrs": res.attrs}
+
+@RULES.rule("aws_lambda_function")
+def lambda_not_vpc_attached(res: Resource):
+    if not any("vpc_config" in k.lower() for k in res.attrs):
+        yield (
+            "MEDIUM",
+            "Lambda function appears not VPC-attached (ephemeral egress harder to bound)",
+            {"attrs": res.attrs},
+        )
+
+@RULES.rule("aws_iam_policy", "aws_iam_role_policy")
+def iam_broad_policy(res: Resource):
+    blob = res.blob
+    if "action" in blob and ("*" in blob or "admin" in blob):
+        yield "HIGH", "IAM policy may be overly broad (wildcards/admin-like patterns)", {"attrs": res.attrs}
+
+# Generic network egress hint
+_SG_DIRECTION_KEY = re.compile(r"(?:^|\.)(?:(?:egress|ingress)(?:\[\d+\])?(?:\.|$)|from_port$)", re.I)
+
+@RULES.rule("aws_security_group", "aws_security_group_rule")
+def sg_broad_cidr(res: Resource):
+    # Direction lives in the keys (``egress = ...``, nested ``ingress.cidr_blocks``,
+    # ``from_port``) or, for aws_security_group_rule, in ``type = "egress"``.
+    blob = res.blob
+    if "0.0.0.0/0" in blob and (
+        "egress" in blob or "from_port" in blob or any(_SG_DIRECTION_KEY.search(k) for k in res.attrs)
+    ):
+        yield "HIGH", "Security group rule may allow broad internet egress/ingress", {"attrs": res.attrs}
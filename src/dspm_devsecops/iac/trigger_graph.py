@@ -1,25 +1,196 @@
 from __future__ import annotations
+from collections import deque
 from dataclasses import dataclass
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Set, Tuple
 
-import networkx as nx
+# Exposure graph: trigger -> compute -> data asset edges. Node names are
+# interned to dense ints, adjacency is per-node dicts of int ids, and for
+# each indexed source (e.g. ``http:public``) a bytearray marks every node
+# reachable from it, so "is X exposed via source S?" is one lookup. Adding
+# an edge extends the affected closures in place; removing one marks them
+# stale and they are rebuilt on the next query.
+
+PUBLIC_SOURCE = "http:public"
+EVENT_SOURCE = "eventbus:demo"
 
 @dataclass(frozen=True)
 class TriggerEdge:
-    source: str   # e.g., 'http', 's3:bucket', 'eventbridge:rule'
-    target: str   # e.g., 'lambda:fn'
+    source: str   # e.g., 'http', 's3:bucket', 'eventbridge:rule'; or 'lambda:fn' for data access
+    target: str   # e.g., 'lambda:fn'; or a data asset id such as 'cloud:aws:rds:payments'
     meta: Dict[str, Any]
 
-def build_trigger_graph(edges: List[TriggerEdge]) -> nx.DiGraph:
-    g = nx.DiGraph()
-    for e in edges:
-        g.add_node(e.source, kind="trigger")
-        g.add_node(e.target, kind="compute")
-        g.add_edge(e.source, e.target, **e.meta)
+class ExposureGraph:
+    """Directed graph over interned node ids with indexed reachability.
+
+    Re-adding a node or edge merges its attributes, adding an edge adds
+    missing endpoints, and nodes/edges iterate in insertion order (edges
+    grouped by source node), as with networkx ``DiGraph``. Attribute dicts
+    are interned, so millions of edges sharing a few shapes store a few
+    dicts, not one per edge.
+    """
+
+    def __init__(self) -> None:
+        self._ids: Dict[str, int] = {}
+        self.names: List[str] = []
+        self._node_attrs: List[int] = []                # attrs code per node
+        self._succ: List[Dict[int, int]] = []          # node -> {target: attrs code}
+        self._attrs: List[Dict[str, Any]] = [{}]       # interned attribute dicts
+        self._attr_codes: Dict[Tuple[Tuple[str, Any], ...], int] = {(): 0}
+        self._reach: Dict[int, bytearray] = {}         # indexed source -> reachable mark per node
+        self._stale: Set[int] = set()                # sources needing a rebuild
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._ids
+
+    def _intern_attrs(self, attrs: Dict[str, Any]) -> int:
+        key = tuple(attrs.items())
+        try:
+            code = self._attr_codes.get(key)
+        except TypeError:  # unhashable values: stored, not shared
+            self._attrs.append(dict(attrs))
+            return len(self._attrs) - 1
+        if code is None:
+            code = self._attr_codes[key] = len(self._attrs)
+            self._attrs.append(dict(attrs))
+        return code
+
+    def _merge(self, code: int, attrs: Dict[str, Any]) -> int:
+        return self._intern_attrs({**self._attrs[code], **attrs}) if attrs else code
+
+    def node_id(self, name: str) -> int:
+        """Interned id of ``name`` (added without attributes if new)."""
+        i = self._ids.get(name)
+        if i is None:
+            i = self._ids[name] = len(self.names)
+            self.names.append(name)
+            self._node_attrs.append(0)
+            self._succ.append({})
+            for marks in self._reach.values():
+                marks.append(0)
+        return i
+
+    def add_node(self, name: str, **attrs: Any) -> int:
+        i = self.node_id(name)
+        self._node_attrs[i] = self._merge(self._node_attrs[i], attrs)
+        return i
+
+    def add_edge(self, u: str, v: str, **attrs: Any) -> None:
+        ids = self._ids
+        ui = ids.get(u)
+        if ui is None:
+            ui = self.node_id(u)
+        vi = ids.get(v)
+        if vi is None:
+            vi = self.node_id(v)
+        succ = self._succ[ui]
+        prev = succ.get(vi, 0)
+        succ[vi] = self._intern_attrs(attrs) if not prev else self._merge(prev, attrs)
+        if self._reach:
+            for s, marks in self._reach.items():
+                if s not in self._stale and marks[ui] and not marks[vi]:
+                    self._mark_from(vi, marks)
+
+    def add_edges(self, edges: Iterable[TriggerEdge], source_kind: str = "trigger", target_kind: str = "compute") -> None:
+        for e in edges:
+            self.add_node(e.source, kind=source_kind)
+            self.add_node(e.target, kind=target_kind)
+            self.add_edge(e.source, e.target, **e.meta)
+
+    def remove_edge(self, u: str, v: str) -> None:
+        ui, vi = self._ids[u], self._ids[v]
+        del self._succ[ui][vi]
+        # Other paths may still reach v (or what it reaches); rebuild lazily.
+        self._stale.update(s for s, marks in self._reach.items() if marks[ui])
+
+    def nodes(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        for name, code in zip(self.names, self._node_attrs):
+            yield name, self._attrs[code]
+
+    def edges(self) -> Iterator[Tuple[str, str, Dict[str, Any]]]:
+        names, attrs = self.names, self._attrs
+        for u, succ in enumerate(self._succ):
+            for v, code in succ.items():
+                yield names[u], names[v], attrs[code]
+
+    def successors(self, name: str) -> List[str]:
+        return [self.names[v] for v in self._succ[self._ids[name]]]
+
+    def _mark_from(self, start: int, marks: bytearray) -> None:
+        marks[start] = 1
+        queue = deque([start])
+        succ = self._succ
+        while queue:
+            for v in succ[queue.popleft()]:
+                if not marks[v]:
+                    marks[v] = 1
+                    queue.append(v)
+
+    def index(self, source: str) -> None:
+        """Precompute (and from now on maintain) reachability from ``source``."""
+        s = self.node_id(source)
+        marks = bytearray(len(self.names))
+        self._mark_from(s, marks)
+        self._reach[s] = marks
+        self._stale.discard(s)
+
+    def _marks(self, source: str) -> bytearray:
+        s = self._ids.get(source)
+        if s is None or s not in self._reach:
+            raise KeyError(f"Reachability from {source!r} is not indexed (call index() first)")
+        if s in self._stale:
+            self.index(source)
+        return self._reach[s]
+
+    def reaches(self, source: str, target: str) -> bool:
+        """True if ``target`` is reachable from the indexed ``source`` (a node reaches itself)."""
+        marks = self._marks(source)
+        t = self._ids.get(target)
+        return t is not None and bool(marks[t])
+
+    def reachable(self, source: str) -> List[str]:
+        """Names reachable from the indexed ``source``, in node order (``source`` included)."""
+        marks = self._marks(source)
+        return [n for n, m in zip(self.names, marks) if m]
+
+def trigger_edges(serverless_findings: Iterable[Any]) -> List[TriggerEdge]:
+    """Trigger -> compute edges from serverless trigger-surface findings."""
+    edges: List[TriggerEdge] = []
+    for f in serverless_findings:
+        if "HTTP-triggered" in f.message:
+            edges.append(TriggerEdge(source=PUBLIC_SOURCE, target=f"lambda:{f.function}", meta={"surface": "public"}))
+        if "Event-triggered" in f.message:
+            edges.append(TriggerEdge(source=EVENT_SOURCE, target=f"lambda:{f.function}", meta={"surface": "event"}))
+    return edges
+
+def access_edges(serverless_findings: Iterable[Any]) -> List[TriggerEdge]:
+    """Compute -> data asset edges from serverless data-access findings."""
+    return [
+        TriggerEdge(source=f"lambda:{f.function}", target=asset, meta={"access": "data"})
+        for f in serverless_findings
+        if "data_assets" in f.evidence
+        for asset in f.evidence["data_assets"]
+    ]
+
+def build_trigger_graph(edges: List[TriggerEdge], access: Iterable[TriggerEdge] = ()) -> ExposureGraph:
+    g = ExposureGraph()
+    g.add_edges(edges)
+    g.add_edges(access, source_kind="compute", target_kind="data")
     return g
 
-def graph_to_json(g: nx.DiGraph) -> Dict[str, Any]:
+def accessors(g: ExposureGraph) -> Dict[str, List[str]]:
+    """Data asset -> the compute nodes with an edge to it, in edge order."""
+    out: Dict[str, List[str]] = {}
+    data = {name for name, attrs in g.nodes() if attrs.get("kind") == "data"}
+    for u, v, _ in g.edges():
+        if v in data:
+            out.setdefault(v, []).append(u)
+    return out
+
+def graph_to_json(g: ExposureGraph) -> Dict[str, Any]:
     return {
-        "nodes": [{"id": n, **g.nodes[n]} for n in g.nodes],
-        "edges": [{"source": u, "target": v, **g.edges[u, v]} for u, v in g.edges],
+        "nodes": [{"id": n, **attrs} for n, attrs in g.nodes()],
+        "edges": [{"source": u, "target": v, **attrs} for u, v, attrs in g.edges()],
     }
@@ -0,0 +1,128 @@
+from __future__ import annotations
+from array import array
+from typing import Any, Dict, Iterator, List, Sequence, Set, Tuple
+
+from dspm_devsecops.orchestration.writer import LazyList
+from dspm_devsecops.policy_dsl.compiler import CompiledPolicies
+
+# Low-cardinality fields, stored as codes into an interned value table.
+CATEGORICAL = (
+    "provider",
+    "native_type",
+    "canonical_type",
+    "tenant",
+    "principal",
+    "principal_tenant",
+    "classification",
+    "exposure",
+)
+
+_STATUS = ("PASS", "WARN", "FAIL")
+
+class _Interned:
+    """Value <-> dense int code table."""
+    __slots__ = ("codes", "values")
+
+    def __init__(self) -> None:
+        self.codes: Dict[Any, int] = {}
+        self.values: List[Any] = []
+
+    def code(self, value: Any) -> int:
+        c = self.codes.get(value)
+        if c is None:
+            c = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return c
+
+class AssetTable:
+    """Assessed assets stored column-wise instead of as per-asset dicts.
+
+    Categorical fields and classification-signal patterns are interned and
+    kept as ``array('I')`` codes, risk as ``array('q')``, and each asset's
+    policy outcome as a bitset of matched rule indices (``words`` 64-bit
+    words per asset). ``assets()`` / ``policy_results()`` return ``LazyList``
+    views that build the usual dicts one at a time during serialization;
+    assets with the same matched rules share one gate/decisions object.
+    """
+
+    def __init__(self, policies: CompiledPolicies) -> None:
+        self.policies = policies
+        self.words = max(1, (len(policies) + 63) // 64)
+        self._ids: List[str] = []
+        self._vocab = {f: _Interned() for f in CATEGORICAL}
+        self._cols = {f: array("I") for f in CATEGORICAL}
+        self._cross = bytearray()
+        self._risk = array("q")
+        self._signals = _Interned()
+        self._signal_codes = array("I")
+        self._bits = array("Q")
+        self._status = bytearray()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def append(self, ctx: Dict[str, Any], signals: Dict[str, int], hits: Sequence[int]) -> None:
+        """Add one asset: its context, classification signals and sorted matched rule indices."""
+        self._ids.append(ctx["asset_id"])
+        for f in CATEGORICAL:
+            self._cols[f].append(self._vocab[f].code(ctx[f]))
+        self._cross.append(1 if ctx["cross_tenant"] else 0)
+        self._risk.append(ctx["risk_0_100"])
+        self._signal_codes.append(self._signals.code(tuple(signals.items())))
+        words = [0] * self.words
+        for i in hits:
+            words[i >> 6] |= 1 << (i & 63)
+        self._bits.extend(words)
+        self._status.append(_STATUS.index(self.policies.status(hits)))
+
+    def statuses(self) -> Set[str]:
+        return {_STATUS[s] for s in set(self._status)}
+
+    def hits(self, row: int) -> List[int]:
+        out: List[int] = []
+        base = row * self.words
+        for w in range(self.words):
+            word = self._bits[base + w]
+            while word:
+                low = word & -word
+                out.append((w << 6) + low.bit_length() - 1)
+                word ^= low
+        return out
+
+    def iter_assets(self) -> Iterator[Dict[str, Any]]:
+        (prov, prov_v), (nt, nt_v), (ct, ct_v), (ten, ten_v), (pr, pr_v), (pt, pt_v), (cls, cls_v), (exp, exp_v) = (
+            (self._cols[f], self._vocab[f].values) for f in CATEGORICAL
+        )
+        cross, risk, sig, sig_v = self._cross, self._risk, self._signal_codes, self._signals.values
+        for i, asset_id in enumerate(self._ids):
+            # Same keys, same order as the pipeline's context dicts.
+            yield {
+                "asset_id": asset_id,
+                "provider": prov_v[prov[i]],
+                "native_type": nt_v[nt[i]],
+                "canonical_type": ct_v[ct[i]],
+                "tenant": ten_v[ten[i]],
+                "principal": pr_v[pr[i]],
+                "principal_tenant": pt_v[pt[i]],
+                "cross_tenant": bool(cross[i]),
+                "classification": cls_v[cls[i]],
+                "exposure": exp_v[exp[i]],
+                "risk_0_100": risk[i],
+                "classification_signals": dict(sig_v[sig[i]]),
+            }
+
+    def iter_policy_results(self) -> Iterator[Dict[str, Any]]:
+        shared: Dict[Tuple[int, ...], Dict[str, Any]] = {}
+        w = self.words
+        for row, asset_id in enumerate(self._ids):
+            key = tuple(self._bits[row * w:(row + 1) * w])
+            r = shared.get(key)
+            if r is None:
+                r = shared[key] = self.policies.result("", self.hits(row))
+            yield {"asset_id": asset_id, "gate": r["gate"], "decisions": r["decisions"]}
+
+    def assets(self) -> LazyList:
+        return LazyList(len(self), self.iter_assets)
+
+    def policy_results(self) -> LazyList:
+        return LazyList(len(self), self.iter_policy_results)
@@ -0,0 +1,174 @@
+from __future__ import annotations
+import hashlib
+import json
+import os
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, TextIO, Tuple
+
+from dspm_devsecops.orchestration.writer import list_framing, open_atomic
+
+# Changed-only runs. The records file is cut into content-defined chunks (a
+# chunk ends after a line whose CRC32 hits the boundary mask, or at
+# MAX_CHUNK lines), so inserting or editing a record only changes the
+# fingerprint of the chunk it lands in. Each chunk's assessed output is
+# cached under a key combining the chunk fingerprint with a context
+# fingerprint (policies, tenants, IaC-derived risk inputs, classifier and
+# pipeline versions); any context change invalidates every chunk.
+
+# Bump when normalization/risk/policy logic changes so cached chunks are discarded.
+INCREMENTAL_VERSION = "inc-2"
+
+AVG_CHUNK = 1024   # expected lines per chunk (power of two)
+MAX_CHUNK = 8192   # hard cap so a run of non-boundary lines stays bounded
+
+_BOUNDARY_MASK = AVG_CHUNK - 1
+
+@dataclass
+class IncrementalStats:
+    chunks_reused: int = 0
+    chunks_computed: int = 0
+    records_reused: int = 0
+    records_computed: int = 0
+
+def fingerprint(*parts: Any) -> str:
+    h = hashlib.sha256()
+    for p in parts:
+        h.update(p if isinstance(p, bytes) else str(p).encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+def file_fingerprint(fp: Path) -> str:
+    return hashlib.sha256(fp.read_bytes()).hexdigest() if fp.exists() else "missing"
+
+def iter_chunks(fh: TextIO) -> Iterator[Tuple[str, List[str]]]:
+    """``(fingerprint, stripped non-empty lines)`` per content-defined chunk."""
+    lines: List[str] = []
+    h = hashlib.sha256()
+    for line in fh:
+        line = line.strip()
+        if not line:
+            continue
+        raw = line.encode("utf-8")
+        lines.append(line)
+        h.update(raw + b"\n")
+        if (zlib.crc32(raw) & _BOUNDARY_MASK) == 0 or len(lines) >= MAX_CHUNK:
+            yield h.hexdigest(), lines
+            lines, h = [], hashlib.sha256()
+    if lines:
+        yield h.hexdigest(), lines
+
+class ChunkStore:
+    """Cached per-chunk outputs, one file per key under ``root``.
+
+    The first line is ``{"count", "statuses", "assets", "results"}`` (the
+    latter two are UTF-8 byte lengths), followed by the chunk's encoded
+    assets and policy results exactly as they appear in the artifacts.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        root.mkdir(parents=True, exist_ok=True)
+        self._existing: Set[str] = {p.stem for p in root.glob("*.chunk")}
+
+    def has(self, key: str) -> bool:
+        return key in self._existing
+
+    def read(self, key: str) -> Tuple[Dict[str, Any], str, str]:
+        with (self.root / f"{key}.chunk").open("rb") as fh:
+            meta = json.loads(fh.readline())
+            assets = fh.read(meta["assets"]).decode("utf-8")
+            results = fh.read(meta["results"]).decode("utf-8")
+        return meta, assets, results
+
+    def write(self, key: str, count: int, statuses: Set[str], assets: str, results: str) -> None:
+        a, r = assets.encode("utf-8"), results.encode("utf-8")
+        meta = {"count": count, "statuses": sorted(statuses), "assets": len(a), "results": len(r)}
+        tmp = self.root / f".{key}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as fh:
+            fh.write(json.dumps(meta).encode("utf-8") + b"\n" + a + r)
+        os.replace(tmp, self.root / f"{key}.chunk")
+        self._existing.add(key)
+
+    def prune(self, keep: Set[str]) -> None:
+        """Drop chunks not used by this run, so the cache tracks the current estate."""
+        for key in self._existing - keep:
+            try:
+                os.unlink(self.root / f"{key}.chunk")
+            except FileNotFoundError:
+                pass
+        self._existing &= keep
+
+def plan_chunks(open_records: Callable[[], TextIO]) -> List[Tuple[str, int]]:
+    """First pass: ``(fingerprint, record count)`` per chunk; nothing is parsed."""
+    with open_records() as fh:
+        return [(fp, len(lines)) for fp, lines in iter_chunks(fh)]
+
+def assess_incremental(
+    open_records: Callable[[], TextIO],
+    plan: List[Tuple[str, int]],
+    store: ChunkStore,
+    context: str,
+    assess: Callable[[Iterable[Dict[str, Any]]], Iterator[Tuple[Dict[str, Any], Dict[str, Any]]]],
+    assets_path: Path,
+    results_path: Path,
+    indent: Optional[int] = 2,
+    jsonl: bool = False,
+    stats: Optional[IncrementalStats] = None,
+) -> Tuple[int, Set[str]]:
+    """Write assets/policy results for every record; returns (count, gate statuses).
+
+    Chunks cached under ``context`` (and this output format) are copied
+    as encoded text. Only records of the other chunks are parsed and handed,
+    as one lazy stream, to ``assess``, so the work scales with what changed.
+    Output is byte-identical to writing the full lists with ``iter_json``
+    (or one ``json.dumps`` line per item with ``jsonl=True``).
+    """
+    stats = stats if stats is not None else IncrementalStats()
+    if jsonl:
+        open_, sep, close, encode = "", "", "", (lambda item: json.dumps(item) + "\n")
+    else:
+        open_, sep, close, encode = list_framing(indent)
+    fmt = "jsonl" if jsonl else f"indent={indent}"
+    keys = [fingerprint(context, fmt, fp) for fp, _ in plan]
+    cached = [store.has(k) for k in keys]
+    changed = {fp for (fp, _), hit in zip(plan, cached) if not hit}
+
+    def changed_records() -> Iterator[Dict[str, Any]]:
+        # Second pass over the input; chunking is deterministic so it lines up with ``plan``.
+        if not changed:
+            return
+        with open_records() as fh:
+            for fp, lines in iter_chunks(fh):
+                if fp in changed:
+                    for line in lines:
+                        yield json.loads(line)
+
+    assessed = assess(changed_records())
+    count = 0
+    statuses: Set[str] = set()
+    with open_atomic(assets_path) as na_fh, open_atomic(results_path) as pr_fh:
+        for i, ((fp, n), key, hit) in enumerate(zip(plan, keys, cached)):
+            if hit:
+                meta, assets, results = store.read(key)
+                statuses.update(meta["statuses"])
+                stats.chunks_reused += 1
+                stats.records_reused += n
+            else:
+                items = [next(assessed) for _ in range(n)]
+                chunk_statuses = {pe["gate"]["status"] for _, pe in items}
+                assets = sep.join(encode(a) for a, _ in items)
+                results = sep.join(encode(pe) for _, pe in items)
+                store.write(key, n, chunk_statuses, assets, results)
+                statuses |= chunk_statuses
+                stats.chunks_computed += 1
+                stats.records_computed += n
+            for fh, text in ((na_fh, assets), (pr_fh, results)):
+                fh.write((open_ if i == 0 else sep) + text)
+            count += n
+        empty = "" if jsonl else "[]"
+        for fh in (na_fh, pr_fh):
+            fh.write(close if count else empty)
+    store.prune(set(keys))
+    return count, statuses
@@ -0,0 +1,121 @@
+from __future__ import annotations
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+@dataclass(frozen=True)
+class Stage:
+    """One pipeline step.
+
+    ``fn`` is called with one keyword argument per name in ``inputs`` and
+    returns a dict holding exactly the names in ``outputs`` (or None when it
+    has none). Outputs may be plain tokens (e.g. ``"scans_json": True``) that
+    only order a stage after the artifact it depends on.
+    """
+    name: str
+    fn: Callable[..., Optional[Dict[str, Any]]]
+    inputs: Tuple[str, ...] = ()
+    outputs: Tuple[str, ...] = ()
+
+@dataclass(frozen=True)
+class StageTiming:
+    name: str
+    start: float    # seconds since the run started
+    seconds: float
+
+def _check(stages: List[Stage], provided: Dict[str, Any]) -> None:
+    producer: Dict[str, str] = {}
+    for s in stages:
+        for o in s.outputs:
+            if o in producer or o in provided:
+                raise ValueError(f"Output {o!r} of stage {s.name!r} is produced more than once")
+            producer[o] = s.name
+    for s in stages:
+        missing = [i for i in s.inputs if i not in producer and i not in provided]
+        if missing:
+            raise ValueError(f"Stage {s.name!r} needs {missing} which no stage produces")
+    # Kahn's algorithm: anything left over sits on a cycle.
+    done = set(provided)
+    pending = list(stages)
+    while pending:
+        ready = [s for s in pending if all(i in done for i in s.inputs)]
+        if not ready:
+            raise ValueError(f"Stages form a cycle: {sorted(s.name for s in pending)}")
+        for s in ready:
+            done.update(s.outputs)
+        pending = [s for s in pending if s not in ready]
+
+def _run_one(stage: Stage, kwargs: Dict[str, Any], t0: float) -> Tuple[Dict[str, Any], StageTiming]:
+    start = time.perf_counter()
+    out = stage.fn(**kwargs) or {}
+    if set(out) != set(stage.outputs):
+        raise ValueError(f"Stage {stage.name!r} returned {sorted(out)}, declared {sorted(stage.outputs)}")
+    return out, StageTiming(stage.name, start - t0, time.perf_counter() - start)
+
+def run_stages(
+    stages: List[Stage],
+    max_workers: int = 4,
+    provided: Optional[Dict[str, Any]] = None,
+) -> Tuple[Dict[str, Any], List[StageTiming]]:
+    """Run ``stages`` as a DAG; returns (all values, timings in completion order).
+
+    A stage starts as soon as every input exists, on a thread pool of
+    ``max_workers``; ``max_workers=1`` runs them one by one in declaration
+    order (dependencies permitting). The first failing stage's exception is
+    re-raised once running stages finish; stages not yet started are skipped.
+    """
+    values: Dict[str, Any] = dict(provided or {})
+    _check(stages, values)
+    timings: List[StageTiming] = []
+    pending = list(stages)
+    t0 = time.perf_counter()
+
+    def ready() -> List[Stage]:
+        return [s for s in pending if all(i in values for i in s.inputs)]
+
+    def args(s: Stage) -> Dict[str, Any]:
+        return {k: values[k] for k in s.inputs}
+
+    if max_workers <= 1:
+        while pending:
+            s = ready()[0]
+            pending.remove(s)
+            out, timing = _run_one(s, args(s), t0)
+            values.update(out)
+            timings.append(timing)
+        return values, timings
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        running: Dict[Future, Stage] = {}
+        error: Optional[BaseException] = None
+        while pending or running:
+            if error is None:
+                for s in ready():
+                    pending.remove(s)
+                    running[pool.submit(_run_one, s, args(s), t0)] = s
+            if not running:
+                break
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for fut in finished:
+                del running[fut]
+                try:
+                    out, timing = fut.result()
+                except BaseException as e:  # keep the first failure, let the rest drain
+                    error = error or e
+                    continue
+                values.update(out)
+                timings.append(timing)
+        if error is not None:
+            raise error
+    return values, timings
+
+def timing_report(timings: List[StageTiming]) -> List[Dict[str, Any]]:
+    """Per-stage rows (start order) plus the wall-clock total of the run."""
+    rows = [
+        {"stage": t.name, "start_s": round(t.start, 6), "seconds": round(t.seconds, 6)}
+        for t in sorted(timings, key=lambda t: t.start)
+    ]
+    wall = max((t.start + t.seconds for t in timings), default=0.0)
+    rows.append({"stage": "(wall clock)", "start_s": 0.0, "seconds": round(wall, 6)})
+    return rows
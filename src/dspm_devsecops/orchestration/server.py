@@ -0,0 +1,358 @@
+from __future__ import annotations
+import asyncio
+import json
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from dspm_devsecops.classification.cache import ClassificationCache
+from dspm_devsecops.classification.pii import classify_many
+from dspm_devsecops.config import default_paths
+from dspm_devsecops.iac.trigger_graph import PUBLIC_SOURCE, build_trigger_graph, trigger_edges
+from dspm_devsecops.orchestration.pipeline import (
+    _assess_records,
+    _cache_dir,
+    _classify_records,
+    _load_policies,
+    _load_tenant_model,
+    _overall_gate,
+    _result_pairs,
+    _scan_iac,
+)
+from dspm_devsecops.policy_dsl.compiler import compile_policies
+from dspm_devsecops.risk.scoring import score_findings
+
+# Long-running pipeline daemon. ``ServeState`` keeps compiled policies, the
+# tenant model, the IaC-derived base risk and exposure graph, and the
+# classification/scan caches warm; every state access runs on one worker
+# thread, so none of them needs locking. Concurrent /evaluate and /gate
+# requests are queued and assessed together in micro-batches.
+#
+#   GET  /health                       -> liveness + what is loaded
+#   POST /evaluate {"records": [...]}  -> normalized asset + policy result per record
+#   POST /gate     {"records": [...]}  -> overall gate + per-asset policy results
+#   POST /classify {"texts": [...]}    -> classification + signals per text
+#   POST /scan     {}                  -> rescan IaC (cached per file), refresh base risk/exposure
+#   POST /reload   {}                  -> reload policies/tenants and rescan
+#
+# ``{"record": {...}}`` is accepted wherever ``records`` is.
+
+REQUIRED_FIELDS = ("asset_id", "provider", "native_type")
+
+_MAX_BODY = 64 * 1024 * 1024
+
+_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+}
+
+_ROUTES = ("/health", "/evaluate", "/gate", "/classify", "/scan", "/reload")
+
+class RequestError(ValueError):
+    """Client error, answered with HTTP 400."""
+
+class ServeState:
+    """Warm pipeline inputs for ``repo_root``.
+
+    Policies and tenants are reloaded automatically when their files change
+    (checked by mtime before each batch). With ``cache_dir`` the scan and
+    classification caches persist like ``run_pipeline(persist_cache=True)``;
+    otherwise scan caches live in a temporary directory for the server's
+    lifetime and classification results in memory.
+    """
+
+    def __init__(self, repo_root: Path, cache_dir: Optional[Path] = None) -> None:
+        self.repo_root = repo_root
+        self._tmp = tempfile.TemporaryDirectory(prefix="dspm-serve-") if cache_dir is None else None
+        self.cache_dir = cache_dir
+        self.scan_cache_dir = cache_dir if cache_dir is not None else Path(self._tmp.name)
+        self.cls_cache = ClassificationCache(path=cache_dir / "classification.sqlite" if cache_dir else None)
+        self._config_files = (repo_root / "policies" / "policies.yml", repo_root / "examples" / "tenancy" / "tenants.yml")
+        self._config_mtimes: Tuple[int, ...] = ()
+        self.reload_config()
+        self.rescan()
+
+    def _mtimes(self) -> Tuple[int, ...]:
+        return tuple(fp.stat().st_mtime_ns if fp.exists() else 0 for fp in self._config_files)
+
+    def reload_config(self) -> None:
+        self._config_mtimes = self._mtimes()
+        self.policies = compile_policies(_load_policies(self.repo_root))
+        self.tenant_model = _load_tenant_model(self.repo_root)
+
+    def refresh(self) -> bool:
+        """Reload policies/tenants if either file changed; True if reloaded."""
+        if self._mtimes() == self._config_mtimes:
+            return False
+        self.reload_config()
+        return True
+
+    def rescan(self) -> Dict[str, Any]:
+        scans = _scan_iac(default_paths(self.repo_root).examples_iac, self.scan_cache_dir, workers=1)
+        self.base_rs = score_findings(
+            scans["terraform"][0], scans["serverless"][0], bicep=scans["bicep"][0], gcp=scans["gcp"][0]
+        )
+        graph = build_trigger_graph(trigger_edges(scans["serverless"][0]))
+        graph.index(PUBLIC_SOURCE)
+        self.exposure_graph = graph
+        return {
+            "findings": {name: [f.__dict__ for f in findings] for name, (findings, _) in scans.items()},
+            "files": {name: {"scanned": s.files_scanned, "reused": s.files_skipped} for name, (_, s) in scans.items()},
+            "base_risk": self.base_rs.__dict__,
+        }
+
+    def evaluate(self, records: List[Dict[str, Any]]) -> List[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """(normalized asset, policy result) per record, exactly as the pipeline writes them."""
+        self.refresh()
+        assessed = _assess_records(
+            _classify_records(records, cls_cache=self.cls_cache),
+            self.policies, self.tenant_model, self.base_rs.normalized_0_100, self.exposure_graph,
+        )
+        pairs = list(_result_pairs(assessed, self.policies))
+        self.cls_cache.flush()
+        return pairs
+
+    def classify(self, texts: List[str]) -> List[Dict[str, Any]]:
+        found = classify_many(((str(i), t) for i, t in enumerate(texts)), cache=self.cls_cache)
+        return [{"classification": f.classification, "signals": f.signals} for f in found]
+
+    def health(self) -> Dict[str, Any]:
+        return {
+            "status": "ok",
+            "policies": len(self.policies),
+            "base_risk": self.base_rs.normalized_0_100,
+            "public": self.exposure_graph.reachable(PUBLIC_SOURCE),
+            "classification_cache": self.cls_cache.stats(),
+        }
+
+    def close(self) -> None:
+        self.cls_cache.close()
+        if self._tmp is not None:
+            self._tmp.cleanup()
+
+class _Batcher:
+    """Coalesces concurrent evaluate calls into one ``ServeState.evaluate`` per batch.
+
+    The first queued request opens a window of ``window_s``; whatever
+    arrives in it (up to ``max_batch`` records) is assessed together.
+    """
+
+    def __init__(self, state: ServeState, executor: ThreadPoolExecutor, window_s: float, max_batch: int) -> None:
+        self.state = state
+        self.executor = executor
+        self.window_s = window_s
+        self.max_batch = max_batch
+        self.queue: "asyncio.Queue[Tuple[List[Dict[str, Any]], asyncio.Future]]" = asyncio.Queue()
+        self.batches = 0
+
+    async def evaluate(self, records: List[Dict[str, Any]]) -> List[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        fut = asyncio.get_running_loop().create_future()
+        await self.queue.put((records, fut))
+        return await fut
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            size = len(batch[0][0])
+            deadline = loop.time() + self.window_s
+            while size < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self.queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                batch.append(item)
+                size += len(item[0])
+            records = [r for recs, _ in batch for r in recs]
+            self.batches += 1
+            try:
+                pairs = await loop.run_in_executor(self.executor, self.state.evaluate, records)
+            except Exception:
+                # One request broke the batch; rerun each on its own so only
+                # the offending request gets the error.
+                for recs, fut in batch:
+                    try:
+                        own = await loop.run_in_executor(self.executor, self.state.evaluate, recs)
+                    except Exception as e:
+                        if not fut.done():
+                            fut.set_exception(e)
+                    else:
+                        if not fut.done():
+                            fut.set_result(own)
+                continue
+            start = 0
+            for recs, fut in batch:
+                if not fut.done():
+                    fut.set_result(pairs[start:start + len(recs)])
+                start += len(recs)
+
+def _records(body: Dict[str, Any]) -> List[Dict[str, Any]]:
+    records = body.get("records")
+    if records is None and "record" in body:
+        records = [body["record"]]
+    if not isinstance(records, list) or not records:
+        raise RequestError('Body must hold a non-empty "records" list (or a "record" object)')
+    for i, r in enumerate(records):
+        if not isinstance(r, dict) or any(not isinstance(r.get(k), str) for k in REQUIRED_FIELDS):
+            raise RequestError(f"Record {i} must be an object with string fields {', '.join(REQUIRED_FIELDS)}")
+        if not isinstance(r.get("text", ""), str):
+            raise RequestError(f'Record {i}: "text" must be a string')
+    return records
+
+def _content_length(method: str, headers: Dict[str, str]) -> int:
+    raw = headers.get("content-length")
+    if raw is None:
+        if method == "POST":
+            raise RequestError("Content-Length header required")
+        return 0
+    if not raw.isdigit():
+        raise RequestError(f"Invalid Content-Length {raw!r}")
+    return int(raw)
+
+class PipelineServer:
+    """HTTP/1.1 JSON API (keep-alive) over TCP or a Unix socket."""
+
+    def __init__(self, state: ServeState, batch_window_ms: float = 2.0, max_batch: int = 1024) -> None:
+        self.state = state
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="serve-state")
+        self.batch_window_s = batch_window_ms / 1000.0
+        self.max_batch = max_batch
+        self.started = time.time()
+        self.batcher: Optional[_Batcher] = None  # created on the serving loop
+
+    def _on_state(self, fn, *args) -> "asyncio.Future":
+        # Everything touching ServeState runs on its single worker thread.
+        return asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
+
+    async def _route(self, method: str, path: str, body: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        if path not in _ROUTES:
+            return 404, {"error": f"Unknown path {path}"}
+        if path == "/health":
+            if method != "GET":
+                return 405, {"error": "Use GET /health"}
+            out = await self._on_state(self.state.health)
+            return 200, {**out, "uptime_s": round(time.time() - self.started, 3), "batches": self.batcher.batches}
+        if method != "POST":
+            return 405, {"error": f"Use POST {path}"}
+        if path == "/evaluate":
+            pairs = await self.batcher.evaluate(_records(body))
+            return 200, {"results": [{"asset": a, "result": r} for a, r in pairs]}
+        if path == "/gate":
+            pairs = await self.batcher.evaluate(_records(body))
+            results = [r for _, r in pairs]
+            return 200, {"status": _overall_gate(r["gate"]["status"] for r in results), "results": results}
+        if path == "/classify":
+            texts = body.get("texts", [body["text"]] if "text" in body else None)
+            if not isinstance(texts, list) or not all(isinstance(t, str) for t in texts):
+                raise RequestError('Body must hold "texts" (list of strings) or "text"')
+            return 200, {"results": await self._on_state(self.state.classify, texts)}
+        if path == "/reload":
+            await self._on_state(self.state.reload_config)
+        return 200, await self._on_state(self.state.rescan)  # /scan, /reload
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    return
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    return
+                headers: Dict[str, str] = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                keep_alive = False  # unless the body is read in full below
+                try:
+                    length = _content_length(method, headers)
+                except RequestError as e:
+                    length, status, payload = None, 400, {"error": str(e)}
+                if length is not None and length > _MAX_BODY:
+                    status, payload = 413, {"error": "Request body too large"}
+                elif length is not None:
+                    raw = await reader.readexactly(length) if length else b""
+                    keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                    try:
+                        body = json.loads(raw) if raw else {}
+                        if not isinstance(body, dict):
+                            raise RequestError("Body must be a JSON object")
+                        status, payload = await self._route(method, target.split("?", 1)[0], body)
+                    except (RequestError, ValueError) as e:
+                        status, payload = 400, {"error": str(e)}
+                    except Exception as e:  # keep serving; report the failure to this client
+                        status, payload = 500, {"error": f"{type(e).__name__}: {e}"}
+                data = json.dumps(payload).encode("utf-8")
+                writer.write(
+                    f"HTTP/1.1 {status} {_REASONS.get(status, 'Error')}\r\n"
+                    f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + data
+                )
+                await writer.drain()
+                if not keep_alive:
+                    return
+        except (ConnectionError, asyncio.IncompleteReadError):
+            return
+        finally:
+            writer.close()
+
+    async def serve(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8765,
+        socket_path: Optional[str] = None,
+        ready: Optional[Callable[[str], None]] = None,
+    ) -> None:
+        """Serve until cancelled; ``ready(address)`` is called once listening."""
+        self.batcher = _Batcher(self.state, self.executor, self.batch_window_s, self.max_batch)
+        batch_task = asyncio.create_task(self.batcher.run())
+        if socket_path:
+            sock = Path(socket_path)
+            if sock.is_socket():  # left behind by a server that was killed
+                sock.unlink()
+            server = await asyncio.start_unix_server(self._handle, path=socket_path)
+            address = socket_path
+        else:
+            server = await asyncio.start_server(self._handle, host=host, port=port)
+            address = "http://%s:%d" % server.sockets[0].getsockname()[:2]
+        if ready is not None:
+            ready(address)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            batch_task.cancel()
+            await asyncio.get_running_loop().run_in_executor(self.executor, self.state.close)
+            self.executor.shutdown(wait=False)
+
+def serve(
+    repo_root: Path,
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    socket_path: Optional[str] = None,
+    persist_cache: bool = False,
+    batch_window_ms: float = 2.0,
+    max_batch: int = 1024,
+) -> None:
+    """Load state once and serve requests until interrupted."""
+    cache_dir = _cache_dir(default_paths(repo_root).out_dir) if persist_cache else None
+    state = ServeState(repo_root, cache_dir=cache_dir)
+    server = PipelineServer(state, batch_window_ms=batch_window_ms, max_batch=max_batch)
+    announce = lambda address: print(f"dspm-devsecops serving on {address}", flush=True)
+    try:
+        asyncio.run(server.serve(host, port, socket_path, ready=announce))
+    except KeyboardInterrupt:
+        pass
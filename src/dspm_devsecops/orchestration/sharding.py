@@ -0,0 +1,82 @@
+from __future__ import annotations
+import hashlib
+import heapq
+import json
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+# Multi-node runs. Shard i of N assesses the records whose asset_id hashes to
+# i and writes them as JSONL partials plus the input position of each record
+# (``shard_positions.bin``) and a small ``shard.json``. ``merge`` k-way merges
+# the partials by position, which restores the single-node order exactly.
+
+SHARD_META = "shard.json"
+POSITIONS = "shard_positions.bin"
+PARTIALS = ("normalized_assets", "policy_results")
+
+# Artifacts every shard computes in full; merge checks they agree and keeps one copy.
+SHARED_ARTIFACTS = ("scans", "trigger_graph.json", "risk_score_base.json")
+
+def parse_shard(spec: str) -> Tuple[int, int]:
+    """``"i/N"`` (0-based ``i``) -> ``(i, N)``."""
+    try:
+        i, n = (int(x) for x in spec.split("/"))
+    except ValueError:
+        raise ValueError(f"Shard must look like i/N, got {spec!r}") from None
+    if n < 1 or not 0 <= i < n:
+        raise ValueError(f"Shard index must satisfy 0 <= i < N, got {spec!r}")
+    return i, n
+
+def shard_of(key: str, shards: int) -> int:
+    # sha256 rather than hash(): stable across processes, machines and Python versions.
+    return int.from_bytes(hashlib.sha256(key.encode("utf-8")).digest()[:8], "big") % shards
+
+def select_shard(
+    records: Iterable[Dict[str, Any]], index: int, shards: int, positions: array
+) -> Iterator[Dict[str, Any]]:
+    """Records of shard ``index``; their input positions are appended to ``positions``."""
+    for pos, r in enumerate(records):
+        if shard_of(r["asset_id"], shards) == index:
+            positions.append(pos)
+            yield r
+
+def write_positions(path: Path, positions: array) -> None:
+    with path.open("wb") as fh:
+        positions.tofile(fh)
+
+def read_positions(path: Path) -> array:
+    positions = array("q")
+    positions.frombytes(path.read_bytes())
+    return positions
+
+def load_shards(shard_dirs: List[Path]) -> List[Tuple[Path, Dict[str, Any]]]:
+    """Shard dirs ordered by index; checks the set is complete and ran on the same inputs."""
+    shards = []
+    for d in shard_dirs:
+        meta_path = d / SHARD_META
+        if not meta_path.exists():
+            raise ValueError(f"{d} is not a shard output (no {SHARD_META})")
+        shards.append((d, json.loads(meta_path.read_text(encoding="utf-8"))))
+    shards.sort(key=lambda s: s[1]["shard"])
+    counts = {m["shards"] for _, m in shards}
+    if len(counts) != 1:
+        raise ValueError(f"Shards come from runs with different shard counts: {sorted(counts)}")
+    expected = list(range(counts.pop()))
+    found = [m["shard"] for _, m in shards]
+    if found != expected:
+        raise ValueError(f"Need exactly one output per shard {expected}, got {found}")
+    inputs = {m["inputs"] for _, m in shards}
+    if len(inputs) != 1:
+        raise ValueError("Shards were run on different inputs (records, policies or tenants differ)")
+    return shards
+
+def iter_merged_lines(shards: List[Tuple[Path, Dict[str, Any]]], name: str) -> Iterator[str]:
+    """Lines of every shard's ``<name>.jsonl`` in original input order."""
+    def keyed(d: Path) -> Iterator[Tuple[int, str]]:
+        positions = read_positions(d / POSITIONS)
+        with (d / f"{name}.jsonl").open("r", encoding="utf-8") as fh:
+            yield from zip(positions, fh)
+
+    for _, line in heapq.merge(*(keyed(d) for d, _ in shards), key=lambda t: t[0]):
+        yield line
@@ -0,0 +1,182 @@
+from __future__ import annotations
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+# Background JSON artifact writer. Encoding streams straight into the file
+# (no whole-document string), each file appears atomically (temp file in the
+# same directory + os.replace), and writes run on a small thread pool while
+# the caller keeps computing. The SHA-256 of each file is
+# computed from the bytes as they are written and kept with the file's
+# (size, mtime_ns), so the manifest need not read the file back.
+
+_BATCH = 4096  # encoded chunks joined per file write
+
+@contextmanager
+def open_atomic(path: Path, binary: bool = False) -> Iterator[IO]:
+    """Open a temp file next to ``path``; it replaces ``path`` only on success."""
+    # Named per process/thread and opened exclusively (not mkstemp), so the
+    # artifact keeps the usual umask-derived permissions.
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with (open(tmp, "xb") if binary else open(tmp, "x", encoding="utf-8")) as fh:
+            yield fh
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        raise
+
+class LazyList:
+    """A JSON array whose items are produced on demand.
+
+    ``iter_json`` (and so ``ArtifactWriter``) encodes it like a list of what
+    ``factory()`` yields, so large collections can be kept compact and only
+    turned into dicts one at a time while being written.
+    """
+
+    def __init__(self, length: int, factory: Callable[[], Iterator[Any]]) -> None:
+        self._length = length
+        self._factory = factory
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self) -> Iterator[Any]:
+        return self._factory()
+
+def list_framing(indent: Optional[int] = 2, sort_keys: bool = False) -> Tuple[str, str, str, Callable[[Any], str]]:
+    """``(open, separator, close, encode_item)`` for a non-empty top-level list.
+
+    ``open + separator.join(map(encode_item, items)) + close`` equals
+    ``iter_json(items, indent=indent, sort_keys=sort_keys)``, so lists can be
+    assembled from separately encoded (e.g. cached) fragments.
+    """
+    separators = (",", ":") if indent is None else None
+    enc = json.JSONEncoder(indent=indent, sort_keys=sort_keys, separators=separators)
+    if indent is None:
+        return "[", ",", "]", enc.encode
+    # Encoded strings never contain raw newlines, so re-indenting an element
+    # by one level is a plain replace.
+    pad = "\n" + " " * indent
+    return "[" + pad, "," + pad, "\n]", lambda item: enc.encode(item).replace("\n", pad)
+
+def iter_json(payload: Any, indent: Optional[int] = 2, sort_keys: bool = False) -> Iterator[str]:
+    """Chunks whose concatenation equals ``json.dumps(payload, indent=..., sort_keys=...)``.
+
+    ``indent=None`` gives compact output (no whitespace). Top-level lists are
+    encoded one element at a time, which keeps the C encoder for compact
+    output and bounds memory by the largest element.
+    """
+    if isinstance(payload, LazyList):
+        payload = payload if len(payload) else []
+    if not isinstance(payload, (list, LazyList)) or not payload:
+        separators = (",", ":") if indent is None else None
+        yield from json.JSONEncoder(indent=indent, sort_keys=sort_keys, separators=separators).iterencode(payload)
+        return
+    open_, sep, close, encode = list_framing(indent, sort_keys)
+    yield open_
+    for i, item in enumerate(payload):
+        yield (sep if i else "") + encode(item)
+    yield close
+
+def _dump(path: Path, payload: Any, indent: Optional[int], sort_keys: bool) -> str:
+    # Returns the SHA-256 of what was written.
+    digest = hashlib.sha256()
+    with open_atomic(path, binary=True) as fh:
+        buf: List[str] = []
+        for chunk in iter_json(payload, indent=indent, sort_keys=sort_keys):
+            buf.append(chunk)
+            if len(buf) >= _BATCH:
+                data = "".join(buf).encode("utf-8")
+                digest.update(data)
+                fh.write(data)
+                buf.clear()
+        data = "".join(buf).encode("utf-8")
+        digest.update(data)
+        fh.write(data)
+    return digest.hexdigest()
+
+def dump_json_atomic(path: Path, payload: Any, indent: Optional[int] = 2, sort_keys: bool = False) -> None:
+    """Synchronous counterpart of ``ArtifactWriter.write_json``."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    _dump(path, payload, indent, sort_keys)
+
+class ArtifactWriter:
+    """Writes JSON artifacts in the background.
+
+    ``write_json`` returns immediately with a Future; ``flush()`` waits for
+    everything submitted so far and re-raises the first failure. Payloads must
+    not be mutated after submission. ``compact=True`` makes non-indented
+    output the default for writes that do not pass ``compact``. ``written()``
+    maps each finished path to ``[size, mtime_ns, sha256]`` (the layout of
+    the manifest's stat cache).
+    """
+
+    def __init__(self, max_in_flight: int = 4, compact: bool = False) -> None:
+        self.compact = compact
+        self._io = ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix="artifact-io")
+        self._lock = threading.Lock()
+        self._pending: List[Future] = []
+        self._dirs: set = set()
+        self._written: Dict[str, List] = {}
+
+    def write_json(
+        self, path: Path, payload: Any, sort_keys: bool = False, compact: Optional[bool] = None
+    ) -> Future:
+        indent = None if (self.compact if compact is None else compact) else 2
+        parent = path.parent
+        with self._lock:
+            if parent not in self._dirs:  # one mkdir per directory, not per file
+                parent.mkdir(parents=True, exist_ok=True)
+                self._dirs.add(parent)
+        fut = self._io.submit(self._dump, path, payload, indent, sort_keys)
+        with self._lock:
+            self._pending.append(fut)
+        return fut
+
+    def _dump(self, path: Path, payload: Any, indent: Optional[int], sort_keys: bool) -> None:
+        digest = _dump(path, payload, indent, sort_keys)
+        st = path.stat()
+        with self._lock:
+            self._written[path.as_posix()] = [st.st_size, st.st_mtime_ns, digest]
+
+    def written(self) -> Dict[str, List]:
+        """Snapshot of ``path -> [size, mtime_ns, sha256]`` for every finished write."""
+        with self._lock:
+            return dict(self._written)
+
+    def flush(self) -> None:
+        with self._lock:
+            pending, self._pending = self._pending, []
+        error: Optional[BaseException] = None
+        for fut in pending:
+            try:
+                fut.result()
+            except BaseException as e:
+                error = error or e
+        if error is not None:
+            raise error
+
+    def close(self, raise_errors: bool = True) -> None:
+        try:
+            self.flush()
+        except BaseException:
+            if raise_errors:
+                raise
+        finally:
+            self._io.shutdown()
+
+    def __enter__(self) -> "ArtifactWriter":
+        return self
+
+    def __exit__(self, exc_type: Any, *exc: Any) -> None:
+        # Don't let a write error mask the exception already propagating.
+        self.close(raise_errors=exc_type is None)
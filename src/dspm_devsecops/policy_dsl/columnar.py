@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+from dspm_devsecops.policy_dsl.compiler import CompiledPolicies
+
+GATE_STATUSES = ("PASS", "WARN", "FAIL")
+
+def require_numpy() -> None:
+    """Raise if numpy (the ``columnar`` extra) is not installed."""
+    if np is None:
+        raise RuntimeError(
+            "Columnar policy evaluation requires the 'numpy' package "
+            "(pip install 'dspm-devsecops[columnar]')"
+        )
+
+@dataclass
+class AssetColumns:
+    """Struct-of-arrays view of normalized asset contexts.
+
+    Categorical fields are dictionary-encoded (``vocab[field][value] -> code``);
+    ``risk`` holds ``risk_0_100`` as float64, matching the scalar evaluator's
+    ``float()`` comparison.
+    """
+
+    n: int
+    codes: Dict[str, Any]
+    vocab: Dict[str, Dict[Any, int]]
+    risk: Any
+
+def encode_columns(ctxs: Sequence[Dict[str, Any]], fields: Sequence[str]) -> AssetColumns:
+    require_numpy()
+    codes: Dict[str, Any] = {}
+    vocab: Dict[str, Dict[Any, int]] = {}
+    for f in fields:
+        v: Dict[Any, int] = {}
+        codes[f] = np.fromiter((v.setdefault(c.get(f), len(v)) for c in ctxs), dtype=np.int32, count=len(ctxs))
+        vocab[f] = v
+    risk = np.fromiter((float(c.get("risk_0_100", 0)) for c in ctxs), dtype=np.float64, count=len(ctxs))
+    return AssetColumns(n=len(ctxs), codes=codes, vocab=vocab, risk=risk)
+
+@dataclass
+class ColumnarResult:
+    policies: CompiledPolicies
+    matched: Any  # bool[n_assets, n_rules]
+    status: Any  # int8[n_assets], index into GATE_STATUSES
+
+    def overall_status(self) -> str:
+        return GATE_STATUSES[int(self.status.max())] if len(self.status) else "PASS"
+
+    def iter_hits(self) -> Iterator[List[int]]:
+        """Sorted matched rule indices per asset."""
+        # One nonzero() over the whole matrix instead of a scan per asset.
+        rows, cols = np.nonzero(self.matched)
+        bounds = np.searchsorted(rows, np.arange(self.matched.shape[0] + 1)).tolist()
+        cols = cols.tolist()
+        for j in range(len(bounds) - 1):
+            yield cols[bounds[j]:bounds[j + 1]]
+
+    def iter_policy_results(self, asset_ids: Sequence[str]) -> Iterator[Dict[str, Any]]:
+        # Dicts are only materialized here, in the same shape run_pipeline writes.
+        for asset_id, hits in zip(asset_ids, self.iter_hits()):
+            yield self.policies.result(asset_id, hits)
+
+def evaluate_columnar(policies: CompiledPolicies, ctxs: Sequence[Dict[str, Any]]) -> ColumnarResult:
+    """Evaluate every rule as a vectorized mask over the whole asset batch.
+
+    Gate statuses come from OR-reductions over the fail/warn rule masks, the
+    same precedence :func:`gate` applies per asset.
+    """
+    require_numpy()
+    fields = sorted({k for r in policies.rules for k, _ in r.equals})
+    cols = encode_columns(ctxs, fields)
+    masks = np.ones((len(policies.rules), cols.n), dtype=bool)
+    for r in policies.rules:
+        m = masks[r.index]
+        for k, v in r.equals:
+            try:
+                code = cols.vocab[k].get(v)
+            except TypeError:
+                code = None
+            if code is None:
+                m[:] = False
+                break
+            m &= cols.codes[k] == code
+        if r.min_risk != float("-inf"):
+            m &= cols.risk >= r.min_risk
+
+    fail_rows = [r.index for r in policies.rules if r.hit.action == "fail_pipeline"]
+    warn_rows = [r.index for r in policies.rules if r.hit.action == "warn"]
+    fail = masks[fail_rows].any(axis=0) if fail_rows else np.zeros(cols.n, dtype=bool)
+    warn = masks[warn_rows].any(axis=0) if warn_rows else np.zeros(cols.n, dtype=bool)
+    status = np.where(fail, 2, np.where(warn, 1, 0)).astype(np.int8)
+    return ColumnarResult(policies=policies, matched=masks.T, status=status)
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Sequence, Tuple
+
+from dspm_devsecops.policy_dsl.evaluator import PolicyDecision
+
+# Equality keys rules are indexed on, most selective first.
+INDEX_KEYS = ("classification", "canonical_type", "exposure", "provider", "cross_tenant")
+
+_NO_THRESHOLD = float("-inf")
+
+@dataclass(frozen=True)
+class CompiledRule:
+    index: int
+    equals: Tuple[Tuple[str, Any], ...]
+    min_risk: float
+    hit: PolicyDecision
+    miss: PolicyDecision
+
+    def matches(self, ctx: Dict[str, Any]) -> bool:
+        for k, v in self.equals:
+            if ctx.get(k) != v:
+                return False
+        return True
+
+@dataclass
+class _Bucket:
+    # Rules sorted by min_risk; bisect on the asset's risk gives the prefix
+    # whose threshold is met.
+    thresholds: List[float] = field(default_factory=list)
+    rules: List[CompiledRule] = field(default_factory=list)
+
+    def add(self, rule: CompiledRule) -> None:
+        i = bisect_right(self.thresholds, rule.min_risk)
+        self.thresholds.insert(i, rule.min_risk)
+        self.rules.insert(i, rule)
+
+    def qualifying(self, risk: float) -> List[CompiledRule]:
+        return self.rules[: bisect_right(self.thresholds, risk)]
+
+def _hashable(v: Any) -> bool:
+    try:
+        hash(v)
+    except TypeError:
+        return False
+    return True
+
+def _compile_rule(i: int, p: Dict[str, Any]) -> CompiledRule:
+    name = p.get("name", "unnamed")
+    action = p.get("action", "pass")
+    severity = p.get("severity", "INFO")
+    cond = p.get("condition", {}) or {}
+    min_risk = float(cond["min_risk"]) if "min_risk" in cond else _NO_THRESHOLD
+    return CompiledRule(
+        index=i,
+        equals=tuple((k, v) for k, v in cond.items() if k != "min_risk"),
+        min_risk=min_risk,
+        hit=PolicyDecision(name=name, action=action, severity=severity, matched=True, reason=p.get("reason", "")),
+        miss=PolicyDecision(name=name, action=action, severity=severity, matched=False, reason="no_match"),
+    )
+
+class CompiledPolicies:
+    """Policies compiled once into predicate objects and indexed for lookup.
+
+    Each rule is filed under one of its equality conditions (see
+    ``INDEX_KEYS``), so an asset is only checked against rules whose indexed
+    value it shares, plus rules with no indexable condition. Decisions are
+    identical to :func:`evaluate_policies`.
+    """
+
+    def __init__(self, policies: List[Dict[str, Any]]) -> None:
+        self.rules: List[CompiledRule] = [_compile_rule(i, p) for i, p in enumerate(policies)]
+        self._misses: List[PolicyDecision] = [r.miss for r in self.rules]
+        self._index: Dict[str, Dict[Any, _Bucket]] = {}
+        self._unindexed = _Bucket()
+        for r in self.rules:
+            eq = dict(r.equals)
+            anchor = next((k for k in INDEX_KEYS if k in eq and _hashable(eq[k])), None)
+            if anchor is None:
+                self._unindexed.add(r)
+            else:
+                self._index.setdefault(anchor, {}).setdefault(eq[anchor], _Bucket()).add(r)
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def matched_indices(self, ctx: Dict[str, Any]) -> List[int]:
+        risk = float(ctx.get("risk_0_100", 0))
+        out = [r.index for r in self._unindexed.qualifying(risk) if r.matches(ctx)]
+        for key, buckets in self._index.items():
+            v = ctx.get(key)
+            try:
+                b = buckets.get(v)
+            except TypeError:  # unhashable ctx value cannot equal an indexed one
+                continue
+            if b is not None:
+                out.extend(r.index for r in b.qualifying(risk) if r.matches(ctx))
+        out.sort()
+        return out
+
+    def status(self, hits: Sequence[int]) -> str:
+        """Gate status for matched rule indices, with :func:`gate`'s precedence."""
+        actions = {self.rules[i].hit.action for i in hits}
+        if "fail_pipeline" in actions:
+            return "FAIL"
+        return "WARN" if "warn" in actions else "PASS"
+
+    def result(self, asset_id: str, hits: Sequence[int]) -> Dict[str, Any]:
+        """The policy-results record for an asset given its sorted matched rule indices.
+
+        Same shape as ``{"asset_id", "gate": gate(decisions), "decisions"}``.
+        """
+        decisions = [d.__dict__ for d in self._misses]
+        for i in hits:
+            decisions[i] = self.rules[i].hit.__dict__
+        return {
+            "asset_id": asset_id,
+            "gate": {
+                "status": self.status(hits),
+                "matched": [self.rules[i].hit.__dict__ for i in hits],
+                "total_rules": len(self.rules),
+                "matched_rules": len(hits),
+            },
+            "decisions": decisions,
+        }
+
+    def evaluate(self, ctx: Dict[str, Any]) -> List[PolicyDecision]:
+        out = list(self._misses)
+        for i in self.matched_indices(ctx):
+            out[i] = self.rules[i].hit
+        return out
+
+def compile_policies(policies: List[Dict[str, Any]]) -> CompiledPolicies:
+    return CompiledPolicies(policies)
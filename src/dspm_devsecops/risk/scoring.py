@@ -1,10 +1,17 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
 
 from dspm_devsecops.classification.pii import CLASS_MULTIPLIER
+from dspm_devsecops.normalization.cloud_map import CANONICAL
 
 SEVERITY_WEIGHT = {
+    "INFO": 0,  # context for the exposure graph, not a risk on its own
     "LOW": 1,
     "MEDIUM": 3,
     "HIGH": 6,
@@ -17,12 +24,27 @@ class RiskScore:
     breakdown: Dict[str, int]
     normalized_0_100: int
 
-def score_findings(terraform_findings: List[Any], serverless_findings: List[Any]) -> RiskScore:
+# Integer codes for the batch API. Unknown values encode to -1, which maps to
+# the same defaults the scalar path uses (multiplier 1.0, no type nudge).
+CLASSIFICATIONS = tuple(CLASS_MULTIPLIER)
+CANONICAL_TYPES = tuple(sorted(CANONICAL))
+_CLASS_CODE = {c: i for i, c in enumerate(CLASSIFICATIONS)}
+_CANONICAL_CODE = {c: i for i, c in enumerate(CANONICAL_TYPES)}
+_NUDGE_TYPES = {"event_bus", "api_gateway"}
+
+def score_findings(
+    terraform_findings: Iterable[Any],
+    serverless_findings: Iterable[Any],
+    **other_findings: Iterable[Any],
+) -> RiskScore:
+    # Each source is consumed once, so generators/streams are fine. Extra
+    # sources (e.g. bicep=..., gcp=...) get their own breakdown entry.
+    sources = {"terraform": terraform_findings, "serverless": serverless_findings, **other_findings}
     breakdown: Dict[str, int] = {
-        "terraform": sum(SEVERITY_WEIGHT.get(getattr(f, "severity", "LOW"), 1) for f in terraform_findings),
-        "serverless": sum(SEVERITY_WEIGHT.get(getattr(f, "severity", "LOW"), 1) for f in serverless_findings),
+        name: sum(SEVERITY_WEIGHT.get(getattr(f, "severity", "LOW"), 1) for f in findings)
+        for name, findings in sources.items()
     }
-    total = breakdown["terraform"] + breakdown["serverless"]
+    total = sum(breakdown.values())
     normalized = min(100, int((total / 60) * 100))  # demo calibration
     return RiskScore(total=total, breakdown=breakdown, normalized_0_100=normalized)
 
@@ -51,3 +73,57 @@ def adjust_risk(
 
     # Provider is used only for labeling here (kept for future).
     return int(r)
+
+def encode_classifications(values: Iterable[str]) -> Any:
+    codes = (_CLASS_CODE.get(v, -1) for v in values)
+    return list(codes) if np is None else np.fromiter(codes, dtype=np.int8)
+
+def encode_canonical_types(values: Iterable[str]) -> Any:
+    codes = (_CANONICAL_CODE.get(v, -1) for v in values)
+    return list(codes) if np is None else np.fromiter(codes, dtype=np.int8)
+
+def _adjust_risk_scalar(
+    base_risk_0_100: Any,
+    classification_codes: Any,
+    cross_tenant: Any,
+    canonical_codes: Any,
+) -> List[int]:
+    # numpy-free path: decode the codes and apply adjust_risk row by row.
+    codes = list(classification_codes)
+    bases = [base_risk_0_100] * len(codes) if isinstance(base_risk_0_100, (int, float)) else base_risk_0_100
+    return [
+        adjust_risk(
+            base,
+            CLASSIFICATIONS[c] if c >= 0 else "",
+            bool(ct),
+            "",
+            CANONICAL_TYPES[t] if t >= 0 else "",
+        )
+        for base, c, ct, t in zip(bases, codes, cross_tenant, canonical_codes)
+    ]
+
+def adjust_risk_many(
+    base_risk_0_100: Any,
+    classification_codes: Any,
+    cross_tenant: Any,
+    canonical_codes: Any,
+) -> Any:
+    """Vectorized :func:`adjust_risk` over asset batches.
+
+    Takes code arrays from :func:`encode_classifications` /
+    :func:`encode_canonical_types` and a bool array of cross-tenant flags;
+    ``base_risk_0_100`` may be a scalar or an array. ``np.rint`` rounds half
+    to even like ``round()``, so results match the scalar path exactly.
+    Without numpy the codes are lists and a list of ints is returned,
+    computed with :func:`adjust_risk`.
+    """
+    if np is None:
+        return _adjust_risk_scalar(base_risk_0_100, classification_codes, cross_tenant, canonical_codes)
+    mult = np.array([CLASS_MULTIPLIER[c] for c in CLASSIFICATIONS] + [1.0], dtype=np.float64)
+    nudge = np.array([c in _NUDGE_TYPES for c in CANONICAL_TYPES] + [False], dtype=bool)
+
+    base = np.asarray(base_risk_0_100, dtype=np.float64)
+    r = np.minimum(100, np.rint(base * mult[np.asarray(classification_codes)])).astype(np.int64)
+    r = np.where(np.asarray(cross_tenant, dtype=bool), np.minimum(100, r + 12), r)
+    r = np.where(nudge[np.asarray(canonical_codes)], np.minimum(100, r + 5), r)
+    return r
@@ -1,13 +1,28 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Dict, List, Tuple
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Dict, List
+
+from dspm_devsecops.tenancy.resolver import TenantResolver
 
 @dataclass(frozen=True)
 class TenantModel:
     tenants: List[str]
     asset_tenant: Dict[str, str]
     principal_tenant: Dict[str, str]
+    # [{"prefix" | "glob": ..., "tenant": ...}] applied when no exact mapping exists
+    asset_rules: List[Dict[str, str]] = field(default_factory=list)
+    principal_rules: List[Dict[str, str]] = field(default_factory=list)
+    default_tenant: str = "retail"
+
+    @cached_property
+    def assets(self) -> TenantResolver:
+        return TenantResolver.from_rules(self.asset_tenant, self.asset_rules, default=self.default_tenant)
+
+    @cached_property
+    def principals(self) -> TenantResolver:
+        return TenantResolver.from_rules(self.principal_tenant, self.principal_rules, default=self.default_tenant)
 
 def infer_cross_tenant(asset_tenant: str, principal_tenant: str) -> bool:
     return asset_tenant != principal_tenant
@@ -0,0 +1,99 @@
+from __future__ import annotations
+import fnmatch
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Tenant assignment rules, most specific first:
+#
+#   exact   asset/principal id -> tenant (the existing flat mappings)
+#   prefix  longest matching id prefix wins (e.g. an account or project path)
+#   glob    first matching fnmatch pattern, in declaration order
+#   default when nothing matches
+#
+# Prefixes are indexed by length: a lookup probes one dict per distinct
+# prefix length, longest first (in CPython this beats walking a character
+# trie, which costs one dict probe per character of the id). Globs are
+# indexed the same way by their literal head, so only the few whose head
+# matches are run as regexes. Results are memoized.
+
+_WILDCARD = re.compile(r"[*?\[]")
+
+class TenantResolver:
+    """Resolves ids to tenants from exact, prefix and glob rules."""
+
+    def __init__(
+        self,
+        exact: Optional[Dict[str, str]] = None,
+        prefixes: Optional[Dict[str, str]] = None,
+        globs: Optional[List[Tuple[str, str]]] = None,
+        default: str = "retail",
+        memo_size: int = 1 << 16,
+    ) -> None:
+        self.exact = dict(exact or {})
+        self.default = default
+        self._prefixes = dict(prefixes or {})
+        self._prefix_lengths = sorted({len(p) for p in self._prefixes}, reverse=True)
+        # Each glob is indexed under its literal head (the text before the
+        # first wildcard); only globs whose head prefixes the id are tried.
+        self._globs = [(re.compile(fnmatch.translate(p)), tenant) for p, tenant in globs or []]
+        self._glob_heads: Dict[str, List[int]] = {}
+        for i, (pattern, _) in enumerate(globs or []):
+            self._glob_heads.setdefault(_WILDCARD.split(pattern, 1)[0], []).append(i)
+        self._glob_head_lengths = sorted({len(h) for h in self._glob_heads})
+        # Rule matching only; exact hits are cheaper than the memo itself.
+        self._match = lru_cache(maxsize=memo_size)(self._match_rules)
+
+    @classmethod
+    def from_rules(
+        cls, exact: Dict[str, str], rules: Iterable[Dict[str, str]], default: str = "retail"
+    ) -> "TenantResolver":
+        """Build from ``[{"prefix": ..., "tenant": ...} | {"glob": ..., "tenant": ...}]`` (YAML form)."""
+        prefixes: Dict[str, str] = {}
+        globs: List[Tuple[str, str]] = []
+        for i, rule in enumerate(rules):
+            kinds = [k for k in ("prefix", "glob") if k in rule]
+            if len(kinds) != 1 or not isinstance(rule.get("tenant"), str):
+                raise ValueError(f"Tenant rule {i} needs exactly one of prefix/glob and a tenant: {rule!r}")
+            if kinds[0] == "prefix":
+                prefixes.setdefault(str(rule["prefix"]), rule["tenant"])
+            else:
+                globs.append((str(rule["glob"]), rule["tenant"]))
+        return cls(exact, prefixes, globs, default=default)
+
+    def _match_rules(self, key: str) -> str:
+        prefixes, n = self._prefixes, len(key)
+        for length in self._prefix_lengths:
+            if length <= n:
+                tenant = prefixes.get(key[:length])
+                if tenant is not None:
+                    return tenant
+        if self._globs:
+            heads = self._glob_heads
+            candidates = [i for length in self._glob_head_lengths if length <= n for i in heads.get(key[:length], ())]
+            for i in sorted(candidates):
+                rx, tenant = self._globs[i]
+                if rx.match(key):
+                    return tenant
+        return self.default
+
+    def resolve(self, key: str) -> str:
+        tenant = self.exact.get(key)
+        return tenant if tenant is not None else self._match(key)
+
+    def resolve_many(self, keys: Iterable[str]) -> List[str]:
+        """Tenants for ``keys`` in order; each distinct key is resolved once."""
+        # Batch-local memo: ids in a batch are mostly unique, so churning the
+        # shared LRU would cost more than it saves.
+        exact, match = self.exact, self._match_rules
+        seen: Dict[str, str] = {}
+        out: List[str] = []
+        for k in keys:
+            tenant = seen.get(k)
+            if tenant is None:
+                tenant = exact.get(k)
+                if tenant is None:
+                    tenant = match(k)
+                seen[k] = tenant
+            out.append(tenant)
+        return out
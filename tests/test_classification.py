@@ -0,0 +1,47 @@
+import json
+from pathlib import Path
+
+from dspm_devsecops.classification.pii import classify_many, classify_text
+
+RECORDS = Path(__file__).resolve().parents[1] / "examples" / "data" / "synthetic" / "records.jsonl"
+
+def _items():
+    rows = [json.loads(line) for line in RECORDS.read_text(encoding="utf-8").splitlines() if line.strip()]
+    return [(r["asset_id"], r.get("text", "")) for r in rows] * 5
+
+def test_classify_many_process_pool_matches_serial():
+    items = _items()
+    serial = [classify_text(a, t) for a, t in items]
+    assert list(classify_many(items, workers=2, chunk_size=4)) == serial
+    assert list(classify_many(iter(items))) == serial
+
+def test_fused_scan_matches_findall_counts():
+    from dspm_devsecops.classification.pii import CC_RE, EMAIL_RE, PHONE_RE, SSN_RE
+
+    texts = [t for _, t in _items()] + ["", "١٢٣-٤٥-٦٧٨٩", "a@b.co 123-45-6789 (555) 123-4567 4111 1111 1111 1111"]
+    for text in texts:
+        f = classify_text("x", text)
+        assert f.signals["email"] == len(EMAIL_RE.findall(text))
+        assert f.signals["ssn"] == len(SSN_RE.findall(text))
+        assert f.signals["cc_like"] == len(CC_RE.findall(text))
+        assert f.signals["phone"] == len(PHONE_RE.findall(text))
+        assert classify_text("x", text, early_exit=True).classification == f.classification
+
+def test_classification_cache_tiers_and_eviction(tmp_path):
+    from dspm_devsecops.classification.cache import ClassificationCache
+
+    items = _items()
+    db = tmp_path / "cls.sqlite"
+    cache = ClassificationCache(max_entries=2, path=db)
+    first = list(classify_many(items, cache=cache))
+    assert first == [classify_text(a, t) for a, t in items]
+    assert cache.misses == len({t for _, t in items})
+    cache.close()
+
+    warm = ClassificationCache(path=db, max_disk_entries=3)
+    assert list(classify_many(items, workers=2, chunk_size=4, cache=warm)) == first
+    assert warm.misses == 0 and warm.disk_hits > 0
+    warm.close()
+
+    import sqlite3
+    assert sqlite3.connect(str(db)).execute("SELECT COUNT(*) FROM classification").fetchone()[0] == 3
@@ -0,0 +1,176 @@
+import hashlib
+import os
+
+from dspm_devsecops.evidence.manifest import ManifestStats, build_manifest
+
+def test_manifest_parallel_and_incremental(tmp_path):
+    (tmp_path / "scans").mkdir()
+    for i in range(5):
+        (tmp_path / "scans" / f"f{i}.json").write_text("x" * (i * 1000))
+    (tmp_path / "gate.json").write_text("{}")
+    globs = ["scans", "gate.json", "missing.json"]
+
+    serial = build_manifest(tmp_path, globs, workers=1)
+    assert build_manifest(tmp_path, globs, workers=4) == serial
+    assert serial["count"] == 6
+    assert serial["entries"][0]["sha256"] == hashlib.sha256(b"").hexdigest()
+
+    cache = tmp_path / ".cache" / "manifest_stat.json"
+    first = ManifestStats()
+    assert build_manifest(tmp_path, globs, stat_cache=cache, stats=first) == serial
+    assert (first.files_hashed, first.files_reused) == (6, 0)
+
+    (tmp_path / "gate.json").write_text('{"status": "PASS"}')
+    second = ManifestStats()
+    m = build_manifest(tmp_path, globs, stat_cache=cache, stats=second)
+    assert (second.files_hashed, second.files_reused) == (1, 5)
+    assert second.bytes_reused == sum(range(5)) * 1000
+    assert m["entries"][-1]["sha256"] == hashlib.sha256(b'{"status": "PASS"}').hexdigest()
+
+    # An atomic rewrite (new inode) with the same size and mtime is still a hit.
+    gate = tmp_path / "gate.json"
+    st = gate.stat()
+    (tmp_path / "tmp.json").write_text('{"status": "PASS"}')
+    os.replace(tmp_path / "tmp.json", gate)
+    os.utime(gate, ns=(st.st_atime_ns, st.st_mtime_ns))
+    third = ManifestStats()
+    assert build_manifest(tmp_path, globs, stat_cache=cache, stats=third) == m
+    assert (third.files_hashed, third.files_reused) == (0, 6)
+
+def test_manifest_reuses_digests_recorded_by_the_writer(tmp_path):
+    from dspm_devsecops.orchestration.writer import ArtifactWriter
+
+    with ArtifactWriter() as w:
+        w.write_json(tmp_path / "gate.json", {"status": "PASS"})
+        w.write_json(tmp_path / "scans" / "a.json", [1, 2])
+    (tmp_path / "scans" / "b.json").write_text("[]")
+    globs = ["scans", "gate.json"]
+    stats = ManifestStats()
+    m = build_manifest(tmp_path, globs, stats=stats, known=w.written())
+    assert m == build_manifest(tmp_path, globs)
+    assert (stats.files_hashed, stats.files_reused) == (1, 2)
+
+def test_merkle_proofs_verify_every_entry_and_reject_tampering(tmp_path):
+    from dspm_devsecops.evidence.manifest import verify_artifact
+    from dspm_devsecops.evidence.merkle import build_proofs, merkle_root
+
+    for n in (1, 2, 3, 7):
+        d = tmp_path / str(n)
+        d.mkdir()
+        for i in range(n):
+            (d / f"a{i}.json").write_text(str(i))
+        m = build_manifest(tmp_path, [str(n)])
+        proofs = build_proofs(m["entries"])
+        assert proofs["root"] == m["merkle_root"] == merkle_root(list(reversed(m["entries"])))
+        for e in m["entries"]:
+            assert len(proofs["proofs"][e["path"]]["proof"]) <= n.bit_length()
+            assert verify_artifact(tmp_path / e["path"], proofs, m["merkle_root"], tmp_path) == (True, "ok")
+
+    target = tmp_path / "7" / "a3.json"
+    target.write_text("tampered")
+    assert verify_artifact(target, proofs, m["merkle_root"], tmp_path)[0] is False
+    assert verify_artifact(tmp_path / "7" / "a4.json", proofs, "00" * 32, tmp_path)[1] == "inclusion proof does not match root"
+
+def test_merkle_proofs_verify_after_the_run_is_moved(tmp_path):
+    import shutil
+
+    from dspm_devsecops.evidence.manifest import verify_artifact
+    from dspm_devsecops.evidence.merkle import build_proofs
+
+    run = tmp_path / "run"
+    (run / "scans").mkdir(parents=True)
+    for i in range(3):
+        (run / "scans" / f"s{i}.json").write_text(str(i))
+    m = build_manifest(run, ["scans"])
+    proofs = build_proofs(m["entries"])
+    assert sorted(proofs["proofs"]) == ["scans/s0.json", "scans/s1.json", "scans/s2.json"]
+
+    moved = tmp_path / "audit" / "copy"
+    shutil.move(str(run), str(moved))
+    assert verify_artifact(moved / "scans" / "s1.json", proofs, m["merkle_root"], moved) == (True, "ok")
+    (moved / "scans" / "s2.json").write_text("tampered")
+    assert verify_artifact(moved / "scans" / "s2.json", proofs, m["merkle_root"], moved)[0] is False
+    assert verify_artifact(tmp_path / "x.json", proofs, m["merkle_root"], moved)[0] is False
+
+def test_verify_out_dir_reports_missing_changed_and_extra(tmp_path):
+    import json
+
+    from dspm_devsecops.evidence.manifest import MANIFEST_GLOBS
+    from dspm_devsecops.evidence.verify import verify_out_dir
+
+    (tmp_path / "scans").mkdir()
+    for i in range(4):
+        (tmp_path / "scans" / f"s{i}.json").write_text("[]" * (i + 1))
+    (tmp_path / "gate_status.json").write_text('{"status": "PASS"}')
+    m = build_manifest(tmp_path, MANIFEST_GLOBS)
+    (tmp_path / "evidence").mkdir()
+    (tmp_path / "evidence" / "manifest.sha256.json").write_text(json.dumps(m))
+    assert verify_out_dir(tmp_path).ok
+
+    (tmp_path / "gate_status.json").write_text('{"status": "FAIL"}')
+    (tmp_path / "scans" / "s1.json").unlink()
+    (tmp_path / "scans" / "zz.json").write_text("{}")
+    report = verify_out_dir(tmp_path, workers=2)
+    assert not report.ok and report.checked == 5
+    assert report.changed == ["gate_status.json"]
+    assert report.missing == ["scans/s1.json"]
+    assert report.extra == ["scans/zz.json"]
+    assert verify_out_dir(tmp_path, sample=2, seed=3).checked == 2
+    assert verify_out_dir(tmp_path, fail_fast=True).stopped_early
+
+def test_verify_checks_a_relocated_run_where_it_is_now(tmp_path):
+    import json
+    import shutil
+
+    from dspm_devsecops.evidence.manifest import MANIFEST_GLOBS
+    from dspm_devsecops.evidence.verify import verify_out_dir
+
+    run = tmp_path / "run"
+    (run / "scans").mkdir(parents=True)
+    (run / "scans" / "s.json").write_text("[]")
+    (run / "gate_status.json").write_text('{"status": "PASS"}')
+    (run / "evidence").mkdir()
+    (run / "evidence" / "manifest.sha256.json").write_text(json.dumps(build_manifest(run, MANIFEST_GLOBS)))
+
+    copy = tmp_path / "copy"
+    shutil.copytree(run, copy)
+    assert verify_out_dir(copy).ok
+    with open(copy / "gate_status.json", "a") as fh:
+        fh.write(" ")
+    report = verify_out_dir(copy)
+    assert (report.changed, report.missing, report.extra) == (["gate_status.json"], [], [])
+    assert verify_out_dir(run).ok
+
+def test_receipt_ledger_chains_indexes_and_recovers(tmp_path):
+    import json
+
+    from dspm_devsecops.evidence.ledger import ReceiptLedger
+
+    path = tmp_path / "receipts.ledger"
+    with ReceiptLedger(path, batch_size=3) as ledger:
+        for i in range(10):
+            ledger.append({"kind": "AUDIT" if i % 2 else "CREATE", "ts_epoch": 100 + i, "outputs": {"i": i}})
+    head = ledger.head
+
+    ledger = ReceiptLedger(path)
+    assert (ledger.seq, ledger.head) == (10, head)
+    assert ledger.verify() == (True, None)
+    assert [r["receipt"]["ts_epoch"] for r in ledger.find(kind="AUDIT", since=103, until=107)] == [103, 105, 107]
+    assert len(ledger.find()) == 10
+
+    # A torn tail record is dropped on open and the chain continues from the last complete one.
+    with open(path, "ab") as fh:
+        fh.write(b"\x00\x00\x01\x00{partial")
+    path.with_name(path.name + ".idx").unlink()
+    ledger = ReceiptLedger(path)
+    assert ledger.seq == 10 and len(ledger.find(kind="CREATE")) == 5
+    ledger.append({"kind": "DESTROY", "ts_epoch": 200})
+    ledger.flush()
+    assert ledger.verify() == (True, None)
+
+    ledger.export_json(tmp_path / "view")
+    assert json.loads((tmp_path / "view" / "receipt_audit.json").read_text())["outputs"] == {"i": 9}
+
+    data = path.read_bytes()
+    path.write_bytes(data.replace(b'{"i":4}', b'{"i":5}'))
+    assert ReceiptLedger(path).verify() == (False, 5)
@@ -0,0 +1,312 @@
+import os
+import shutil
+from pathlib import Path
+
+from dspm_devsecops.iac.bicep_scan import BICEP_RULES, parse_bicep, scan_bicep_dir
+from dspm_devsecops.iac.gcp_scan import scan_gcp_dir
+from dspm_devsecops.iac.hcl import flatten_attrs, parse_hcl, resources
+from dspm_devsecops.iac.rules import RULES, Resource, RuleRegistry, collect_rule_stats, rule_timing_report
+from dspm_devsecops.iac.scan_cache import ScanStats
+from dspm_devsecops.iac.serverless_scan import scan_serverless_dir, scan_serverless_yaml
+from dspm_devsecops.iac.terraform_scan import _scan_tf_text, scan_terraform_dir
+from dspm_devsecops.iac.trigger_graph import TriggerEdge, build_trigger_graph, graph_to_json
+
+TF_DIR = Path(__file__).resolve().parents[1] / "examples" / "iac" / "terraform"
+SAMPLES_DIR = Path(__file__).resolve().parents[1] / "examples" / "iac" / "bicep_gcp_samples"
+SLS_YML = Path(__file__).resolve().parents[1] / "examples" / "iac" / "serverless" / "serverless.yml"
+
+def _tf_tree(tmp_path, copies=6):
+    src = (TF_DIR / "main.tf").read_text()
+    for i in range(copies):
+        d = tmp_path / "tf" / f"mod{i}"
+        d.mkdir(parents=True)
+        (d / "main.tf").write_text(src)
+    return tmp_path / "tf"
+
+def test_parallel_cached_terraform_scan(tmp_path):
+    tf = _tf_tree(tmp_path)
+    expected = [f for fp in sorted(tf.rglob("*.tf")) for f in _scan_tf_text(fp, fp.read_text())]
+    cache = tmp_path / "cache.json"
+
+    cold = ScanStats()
+    assert scan_terraform_dir(tf, workers=2, cache_path=cache, stats=cold) == expected
+    assert (cold.files_scanned, cold.files_skipped) == (6, 0)
+    # Rule counters come back from the pool workers with the findings.
+    assert cold.rules["lambda_wildcard_principal"].calls == 6
+
+    # Touched but unchanged files are reused via the content hash; edited ones rescan.
+    os.utime(tf / "mod0" / "main.tf", ns=(1, 1))
+    edited = tf / "mod1" / "main.tf"
+    edited.write_text(edited.read_text().replace('principal     = "*"', 'principal = "s3.amazonaws.com"'))
+    warm = ScanStats()
+    got = scan_terraform_dir(tf, cache_path=cache, stats=warm)
+    assert (warm.files_scanned, warm.files_skipped) == (1, 5)
+    assert warm.rules["lambda_wildcard_principal"].calls == 1
+    assert got == [f for fp in sorted(tf.rglob("*.tf")) for f in _scan_tf_text(fp, fp.read_text())]
+    assert got != expected
+
+def test_hcl_parser_keeps_nested_blocks_and_heredocs():
+    src = """
+# comment
+resource "aws_lambda_function" "fn" {
+  function_name = "fn-${var.stage}"
+  vpc_config {
+    subnet_ids = ["a", "b"]
+  }
+  environment { variables = { A = "}" } }
+  tags = {
+    team = "x"
+  }
+  runtime = "python3.11"
+}
+resource "aws_iam_role_policy" "p" {
+  policy = <<-EOT
+    { "Action": "*" }
+  EOT
+  role = aws_iam_role.r.id
+}
+"""
+    (t1, n1, fn), (t2, n2, pol) = resources(parse_hcl(src))
+    assert (t1, n1, t2, n2) == ("aws_lambda_function", "fn", "aws_iam_role_policy", "p")
+    attrs = flatten_attrs(fn)
+    assert attrs["function_name"] == '"fn-${var.stage}"'
+    assert attrs["vpc_config.subnet_ids"] == '["a", "b"]'
+    assert attrs["environment.variables"] == '{ A = "}" }'
+    assert attrs["tags"].startswith("{") and attrs["runtime"] == '"python3.11"'
+    assert '"Action": "*"' in pol.attrs["policy"]
+    assert pol.attrs["role"] == "aws_iam_role.r.id"
+
+def test_hcl_flat_files_parse_like_the_full_parser(monkeypatch):
+    import dspm_devsecops.iac.hcl as hcl
+
+    src = """
+# rule
+resource "aws_security_group_rule" "r" {
+  type        = "ingress"
+  cidr_blocks = ["0.0.0.0/0"]
+  description = "a } in a string"
+  from_port   = 443
+}
+
+variable "stage" {
+  default = "dev"
+}
+"""
+    flat = hcl._parse_flat(src)
+    nested = hcl._parse_flat(src + 'resource "a" "b" {\n  x {\n  }\n}\n')
+    monkeypatch.setattr(hcl, "_parse_flat", lambda text: None)
+    assert flat is not None and flat == parse_hcl(src)
+    assert flat[0].attrs["from_port"] == "443"
+    assert nested is None
+
+def test_rule_registry_dispatch_and_counters():
+    reg = RuleRegistry()
+
+    @reg.rule("a", "b", requires=("x",))
+    def needs_x(res):
+        yield "HIGH", "x is set", {"x": res.attrs["x"]}
+
+    @reg.rule("a")
+    def blob_rule(res):
+        assert res.blob is res.blob  # built once
+        if "secret" in res.blob:
+            yield "LOW", "mentions secret", {}
+
+    assert not reg.handles("c")
+    with collect_rule_stats() as stats:
+        assert list(reg.run(Resource("c", "n", {"x": "1"}))) == []
+        assert [h[1] for h in reg.run(Resource("a", "n", {"x": "SECRET"}))] == ["x is set", "mentions secret"]
+        assert [h[1] for h in reg.run(Resource("b", "n", {"y": "1"}))] == []
+    assert len(list(reg.run(Resource("a", "n", {"x": "1"})))) == 1  # not collected
+    counters = {r["rule"]: (r["calls"], r["hits"]) for r in rule_timing_report(stats)}
+    assert counters == {"needs_x": (1, 1), "blob_rule": (1, 1)}
+
+def test_sg_broad_cidr_reads_nested_direction_blocks():
+    src = """
+resource "aws_security_group" "nested" {
+  name = "web"
+  egress {
+    from_port   = 0
+    to_port     = 0
+    cidr_blocks = ["0.0.0.0/0"]
+  }
+}
+resource "aws_security_group" "ingress_only" {
+  ingress {
+    cidr_blocks = ["0.0.0.0/0"]
+  }
+  ingress {
+    cidr_blocks = ["10.0.0.0/8"]
+  }
+}
+resource "aws_security_group" "scoped" {
+  egress {
+    cidr_blocks = ["10.0.0.0/8"]
+  }
+}
+resource "aws_security_group" "no_direction" {
+  description = "allows 0.0.0.0/0 nowhere"
+}
+"""
+    findings = _scan_tf_text(Path("sg.tf"), src)
+    assert [f.name for f in findings] == ["nested", "ingress_only"]
+    assert findings[0].evidence["attrs"]["egress.cidr_blocks"] == '["0.0.0.0/0"]'
+
+def test_serverless_dir_scan_multi_document_and_cache(tmp_path):
+    src = SLS_YML.read_text()
+    (tmp_path / "a").mkdir()
+    (tmp_path / "b").mkdir()
+    (tmp_path / "a" / "serverless.yml").write_text(src)
+    (tmp_path / "b" / "serverless.yaml").write_text(src + "\n---\n" + src)
+    single = scan_serverless_yaml(SLS_YML)
+    cache = tmp_path / "cache.json"
+
+    cold = ScanStats()
+    got = list(scan_serverless_dir(tmp_path, workers=2, cache_path=cache, stats=cold))
+    assert len(got) == 3 * len(single)
+    assert [(f.function, f.message) for f in got[: len(single)]] == [(f.function, f.message) for f in single]
+    assert (cold.files_scanned, cold.files_skipped) == (2, 0)
+
+    warm = ScanStats()
+    assert list(scan_serverless_dir(tmp_path, cache_path=cache, stats=warm)) == got
+    assert (warm.files_scanned, warm.files_skipped) == (0, 2)
+
+def test_bicep_parser_flattens_nested_objects_and_arrays():
+    src = """
+resource app 'Microsoft.Web/sites@2022-09-01' = {
+  name: 'a' // trailing comment
+  properties: {
+    httpsOnly: true
+    siteConfig: {
+      cors: {
+        allowedOrigins: [
+          'https://x.example'
+          '*'
+        ]
+      }
+      appSettings: [
+        {
+          name: 'K'
+        }
+      ]
+    }
+  }
+  resource cfg 'config' = {
+    name: 'web'
+  }
+}
+"""
+    (t1, n1, cfg), (t2, n2, app) = parse_bicep(src)
+    assert (t1, n1, cfg) == ("config", "cfg", {"name": "'web'"})
+    assert (t2, n2) == ("Microsoft.Web/sites", "app")
+    assert app["name"] == "'a'"
+    assert app["properties.httpsOnly"] == "true"
+    assert app["properties.siteConfig.cors.allowedOrigins"] == "'https://x.example', '*'"
+    assert app["properties.siteConfig.appSettings[0].name"] == "'K'"
+
+def test_bicep_and_gcp_sample_findings():
+    bicep = {(f.name, f.severity) for f in scan_bicep_dir(SAMPLES_DIR)}
+    assert ("demoStorage", "HIGH") in bicep and ("demoFnApp", "HIGH") in bicep
+    gcp = {(f.resource_type, f.severity) for f in scan_gcp_dir(SAMPLES_DIR)}
+    assert ("google_cloudfunctions_function_iam_member", "CRITICAL") in gcp
+    # Each scanner dispatches on its own registry.
+    assert BICEP_RULES.handles("microsoft.web/sites") and not RULES.handles("microsoft.web/sites")
+    assert not BICEP_RULES.handles("aws_lambda_function")
+
+def test_pipeline_scanners_walk_the_whole_iac_root(tmp_path):
+    from dspm_devsecops.orchestration.pipeline import _scan_iac
+
+    (tmp_path / "infra" / "gcp").mkdir(parents=True)
+    shutil.copy(SAMPLES_DIR / "gcp_cloudfunctions.tf", tmp_path / "infra" / "gcp" / "fn.tf")
+    shutil.copy(TF_DIR / "main.tf", tmp_path / "infra" / "main.tf")
+    scans = _scan_iac(tmp_path, None, workers=1)
+    assert {f.file for f in scans["gcp"][0]} == {(tmp_path / "infra" / "gcp" / "fn.tf").as_posix()}
+    assert {f.file for f in scans["terraform"][0]} == {(tmp_path / "infra" / "main.tf").as_posix()}
+    assert scans["gcp"][1].files_scanned == scans["terraform"][1].files_scanned == 2
+
+def test_trigger_graph_json_order_and_attribute_merge():
+    edges = [
+        TriggerEdge("http:public", "lambda:a", {"surface": "public"}),
+        TriggerEdge("eventbus:demo", "lambda:b", {"surface": "event"}),
+        TriggerEdge("http:public", "lambda:b", {"surface": "public"}),
+        TriggerEdge("http:public", "lambda:a", {"path": "/x"}),
+    ]
+    assert graph_to_json(build_trigger_graph(edges)) == {
+        "nodes": [
+            {"id": "http:public", "kind": "trigger"},
+            {"id": "lambda:a", "kind": "compute"},
+            {"id": "eventbus:demo", "kind": "trigger"},
+            {"id": "lambda:b", "kind": "compute"},
+        ],
+        "edges": [
+            {"source": "http:public", "target": "lambda:a", "surface": "public", "path": "/x"},
+            {"source": "http:public", "target": "lambda:b", "surface": "public"},
+            {"source": "eventbus:demo", "target": "lambda:b", "surface": "event"},
+        ],
+    }
+
+def test_exposure_graph_reachability_tracks_edge_updates():
+    g = build_trigger_graph([
+        TriggerEdge("http:public", "lambda:api", {"surface": "public"}),
+        TriggerEdge("eventbus:demo", "lambda:ingest", {"surface": "event"}),
+    ])
+    g.index("http:public")
+    assert g.reaches("http:public", "lambda:api")
+    assert not g.reaches("http:public", "lambda:ingest")
+    assert not g.reaches("http:public", "no-such-node")
+
+    # lambda:api publishes to the event bus: ingest and its data become public
+    g.add_edge("lambda:api", "eventbus:demo")
+    g.add_edge("lambda:ingest", "s3:customer-exports")
+    assert g.reaches("http:public", "s3:customer-exports")
+
+    g.remove_edge("lambda:api", "eventbus:demo")
+    assert not g.reaches("http:public", "lambda:ingest")
+    assert not g.reaches("http:public", "s3:customer-exports")
+    assert g.reachable("http:public") == ["http:public", "lambda:api"]
+
+def test_serverless_data_references_drive_asset_exposure(tmp_path):
+    from dspm_devsecops.classification.pii import ClassificationFinding
+    from dspm_devsecops.iac.serverless_scan import scan_serverless_yaml
+    from dspm_devsecops.iac.trigger_graph import access_edges, accessors, trigger_edges
+    from dspm_devsecops.orchestration.pipeline import _iter_contexts
+    from dspm_devsecops.tenancy.model import TenantModel
+
+    sls = tmp_path / "serverless.yml"
+    sls.write_text("""
+functions:
+  web:
+    handler: h.web
+    events:
+      - http: {path: /, method: get}
+    iamRoleStatements:
+      - Resource: [arn:aws:s3:::orders-payments/*, "*"]
+  batch:
+    handler: h.batch
+    events:
+      - sqs: {arn: q}
+    environment:
+      LAKE: cloud:gcp:gcs:lake
+      PAYMENTS_DB: arn:aws:rds:us-east-1:1:db:payments
+""")
+    found = scan_serverless_yaml(sls)
+    g = build_trigger_graph(trigger_edges(found), access_edges(found))
+    g.index("http:public")
+    assert accessors(g) == {
+        "cloud:aws:s3:orders-payments": ["lambda:web"],
+        "cloud:gcp:gcs:lake": ["lambda:batch"],
+        "cloud:aws:rds:payments": ["lambda:batch"],
+    }
+    tenants = TenantModel(
+        tenants=["a", "b"], asset_tenant={"cloud:aws:rds:payments": "b"}, principal_tenant={}, default_tenant="a",
+    )
+    ids = ["cloud:aws:s3:orders-payments", "cloud:aws:rds:payments", "cloud:ibm:cos:unused"]
+    pairs = [({"asset_id": a, "provider": "aws", "native_type": "aws_s3_bucket"},
+              ClassificationFinding(asset_id=a, classification="internal", signals={})) for a in ids]
+    ctxs = [ctx for ctx, _ in _iter_contexts(pairs, tenants, 10, g)]
+    # Exposure follows graph paths only; "payments" in an asset id means nothing.
+    assert [(c["principal"], c["exposure"], c["cross_tenant"]) for c in ctxs] == [
+        ("lambda:web", "public", False),
+        ("lambda:batch", "event", True),
+        (None, "event", False),
+    ]
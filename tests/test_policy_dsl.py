@@ -0,0 +1,91 @@
+import itertools
+import random
+from pathlib import Path
+
+import yaml
+
+from dspm_devsecops.policy_dsl.compiler import compile_policies
+from dspm_devsecops.policy_dsl.evaluator import evaluate_policies
+
+POLICIES = yaml.safe_load((Path(__file__).resolve().parents[1] / "policies" / "policies.yml").read_text())["policies"]
+
+CLASSES = ["public", "internal", "pii_low", "pii_high", "regulated"]
+TYPES = ["object_storage", "api_gateway", "event_bus", "unknown"]
+
+def _random_policies(rnd, n):
+    out = list(POLICIES)
+    for i in range(n):
+        cond = {}
+        if rnd.random() < 0.6:
+            cond["classification"] = rnd.choice(CLASSES)
+        if rnd.random() < 0.4:
+            cond["exposure"] = rnd.choice(["public", "event"])
+        if rnd.random() < 0.3:
+            cond["cross_tenant"] = rnd.choice([True, False])
+        if rnd.random() < 0.2:
+            cond["tenant"] = rnd.choice(["retail", "finance"])
+        if rnd.random() < 0.5:
+            cond["min_risk"] = rnd.randint(0, 100)
+        out.append({"name": f"r{i}", "action": rnd.choice(["warn", "fail_pipeline", "pass"]), "condition": cond or None})
+    return out
+
+def _contexts():
+    for cls, typ, exp, ct, tenant in itertools.product(CLASSES, TYPES, ["public", "event"], [True, False], ["retail", "finance"]):
+        for risk in (0, 35, 70, 90, 100):
+            yield {"classification": cls, "canonical_type": typ, "exposure": exp, "cross_tenant": ct,
+                   "tenant": tenant, "provider": "aws", "risk_0_100": risk}
+
+def test_compiled_policies_match_interpreted_evaluator():
+    policies = _random_policies(random.Random(3), 200)
+    compiled = compile_policies(policies)
+    for ctx in _contexts():
+        assert compiled.evaluate(ctx) == evaluate_policies(policies, ctx)
+
+def test_columnar_results_match_row_evaluation():
+    import pytest
+
+    pytest.importorskip("numpy")
+    from dspm_devsecops.policy_dsl.columnar import evaluate_columnar
+    from dspm_devsecops.policy_dsl.evaluator import gate
+
+    policies = _random_policies(random.Random(5), 50)
+    compiled = compile_policies(policies)
+    ctxs = list(_contexts())
+    ids = [f"a{i}" for i in range(len(ctxs))]
+    expected = []
+    for asset_id, ctx in zip(ids, ctxs):
+        decisions = evaluate_policies(policies, ctx)
+        expected.append({"asset_id": asset_id, "gate": gate(decisions), "decisions": [d.__dict__ for d in decisions]})
+    result = evaluate_columnar(compiled, ctxs)
+    assert list(result.iter_policy_results(ids)) == expected
+
+def test_asset_table_matches_dict_results():
+    from dspm_devsecops.normalization.asset_store import AssetTable
+
+    policies = _random_policies(random.Random(7), 150)  # > 64 rules: multi-word bitsets
+    compiled = compile_policies(policies)
+    table = AssetTable(compiled)
+    assets, results = [], []
+    for i, ctx in enumerate(_contexts()):
+        ctx = {"asset_id": f"a{i}", "native_type": "s3", "principal": "p", "principal_tenant": "retail", **ctx}
+        signals = {"email": i % 3} if i % 2 else {}
+        hits = compiled.matched_indices(ctx)
+        table.append(ctx, signals, hits)
+        assets.append({**ctx, "classification_signals": signals})
+        results.append(compiled.result(ctx["asset_id"], hits))
+    assert len(table.assets()) == len(assets)
+    assert [dict(sorted(a.items())) for a in table.assets()] == [dict(sorted(a.items())) for a in assets]
+    assert list(table.policy_results()) == results
+    assert table.statuses() == {r["gate"]["status"] for r in results}
+
+def test_columnar_run_without_numpy_fails_before_any_output(tmp_path, monkeypatch):
+    import pytest
+
+    from dspm_devsecops.orchestration.pipeline import run_pipeline
+    from dspm_devsecops.policy_dsl import columnar
+
+    monkeypatch.setattr(columnar, "np", None)
+    monkeypatch.setenv("DSPM_OUT_DIR", str(tmp_path / "out"))
+    with pytest.raises(RuntimeError, match=r"dspm-devsecops\[columnar\]"):
+        run_pipeline(Path(__file__).resolve().parents[1], columnar=True)
+    assert not (tmp_path / "out").exists()
@@ -0,0 +1,52 @@
+import itertools
+
+import pytest
+
+from dspm_devsecops.risk import scoring
+from dspm_devsecops.risk.scoring import (
+    CANONICAL_TYPES,
+    CLASSIFICATIONS,
+    adjust_risk,
+    adjust_risk_many,
+    encode_canonical_types,
+    encode_classifications,
+    score_findings,
+)
+
+def _batch_rows():
+    return list(itertools.product(
+        range(0, 101),
+        CLASSIFICATIONS + ("unlabelled",),
+        (True, False),
+        CANONICAL_TYPES + ("unknown",),
+    ))
+
+def test_adjust_risk_many_matches_scalar():
+    pytest.importorskip("numpy")
+    rows = _batch_rows()
+    got = adjust_risk_many(
+        [r[0] for r in rows],
+        encode_classifications(r[1] for r in rows),
+        [r[2] for r in rows],
+        encode_canonical_types(r[3] for r in rows),
+    ).tolist()
+    assert got == [adjust_risk(b, cls, ct, "aws", typ) for b, cls, ct, typ in rows]
+
+def test_adjust_risk_many_falls_back_without_numpy(monkeypatch):
+    monkeypatch.setattr(scoring, "np", None)
+    rows = _batch_rows()
+    got = adjust_risk_many(
+        [r[0] for r in rows],
+        encode_classifications(r[1] for r in rows),
+        [r[2] for r in rows],
+        encode_canonical_types(r[3] for r in rows),
+    )
+    assert got == [adjust_risk(b, cls, ct, "aws", typ) for b, cls, ct, typ in rows]
+    assert adjust_risk_many(40, encode_classifications(["unlabelled"]), [True], encode_canonical_types(["unknown"])) == [52]
+
+def test_score_findings_accepts_streams():
+    class F:
+        severity = "HIGH"
+
+    rs = score_findings((F() for _ in range(3)), iter([]))
+    assert rs.breakdown == {"terraform": 18, "serverless": 0}
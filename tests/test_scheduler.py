@@ -0,0 +1,53 @@
+import threading
+import time
+
+import pytest
+
+from dspm_devsecops.orchestration.scheduler import Stage, run_stages, timing_report
+
+def test_independent_stages_overlap_and_outputs_flow():
+    barrier = threading.Barrier(2, timeout=5)
+
+    def a():
+        barrier.wait()  # only passes if b runs at the same time
+        return {"x": 1}
+
+    def b():
+        barrier.wait()
+        return {"y": 2}
+
+    stages = [
+        Stage("sum", lambda x, y: {"z": x + y}, ("x", "y"), ("z",)),
+        Stage("a", a, outputs=("x",)),
+        Stage("b", b, outputs=("y",)),
+    ]
+    values, timings = run_stages(stages, max_workers=2)
+    assert values["z"] == 3
+    assert [t.name for t in timings][-1] == "sum"
+    assert timing_report(timings)[-1]["stage"] == "(wall clock)"
+
+def test_serial_mode_keeps_declaration_order():
+    order = []
+    stages = [Stage(n, lambda n=n: order.append(n)) for n in "abc"]
+    run_stages(stages, max_workers=1)
+    assert order == ["a", "b", "c"]
+
+def test_invalid_graphs_and_failures():
+    with pytest.raises(ValueError, match="cycle"):
+        run_stages([Stage("a", dict, ("y",), ("x",)), Stage("b", dict, ("x",), ("y",))])
+    with pytest.raises(ValueError, match="no stage produces"):
+        run_stages([Stage("a", dict, ("missing",))])
+
+    ran = []
+
+    def boom():
+        time.sleep(0.01)
+        raise RuntimeError("boom")
+
+    stages = [
+        Stage("boom", boom, outputs=("x",)),
+        Stage("after", lambda x: ran.append(x), ("x",)),
+    ]
+    with pytest.raises(RuntimeError, match="boom"):
+        run_stages(stages, max_workers=2)
+    assert ran == []
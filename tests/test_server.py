@@ -0,0 +1,89 @@
+import asyncio
+import json
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from http.client import HTTPConnection
+from pathlib import Path
+
+from dspm_devsecops.orchestration.pipeline import _iter_synthetic_records
+from dspm_devsecops.orchestration.server import PipelineServer, ServeState
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+RECORDS = list(_iter_synthetic_records(REPO_ROOT / "examples" / "data" / "synthetic" / "records.jsonl"))
+
+def _post(port, path, body):
+    conn = HTTPConnection("127.0.0.1", port, timeout=30)
+    conn.request("POST", path, json.dumps(body))
+    resp = conn.getresponse()
+    return resp.status, json.loads(resp.read())
+
+@contextmanager
+def _serving(server):
+    """Run ``server`` on a free port in a background loop; yields the port."""
+    loop = asyncio.new_event_loop()
+    ready = threading.Event()
+    address = []
+
+    def on_ready(a):
+        address.append(a)
+        ready.set()
+
+    task = loop.create_task(server.serve(port=0, ready=on_ready))
+
+    def run():
+        try:
+            loop.run_until_complete(task)
+        except asyncio.CancelledError:
+            pass
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    try:
+        assert ready.wait(30)
+        yield int(address[0].rsplit(":", 1)[1])
+    finally:
+        loop.call_soon_threadsafe(task.cancel)
+        thread.join(30)
+
+def test_serve_batches_concurrent_gate_requests():
+    state = ServeState(REPO_ROOT)
+    expected = [r for _, r in state.evaluate(RECORDS)]
+    server = PipelineServer(state, batch_window_ms=20)
+    with _serving(server) as port:
+        with ThreadPoolExecutor(len(RECORDS)) as ex:
+            answers = list(ex.map(lambda r: _post(port, "/gate", {"record": r}), RECORDS))
+        assert [a[1]["results"][0] for a in answers] == expected
+        assert server.batcher.batches < len(RECORDS)
+
+        status, body = _post(port, "/evaluate", {"records": [{"asset_id": "x"}]})
+        assert status == 400 and "native_type" in body["error"]
+        status, body = _post(port, "/gate", {"record": {**RECORDS[0], "text": 123}})
+        assert status == 400 and "text" in body["error"]
+        assert _post(port, "/nope", {})[0] == 404
+
+        with socket.create_connection(("127.0.0.1", port), timeout=30) as sock:
+            sock.sendall(b"POST /gate HTTP/1.1\r\nContent-Length: abc\r\n\r\n")
+            assert sock.recv(1024).startswith(b"HTTP/1.1 400")
+
+def test_failing_request_does_not_fail_its_batch():
+    state = ServeState(REPO_ROOT)
+    evaluate = state.evaluate
+
+    def flaky(records):
+        if any(r["asset_id"] == "boom" for r in records):
+            raise RuntimeError("boom")
+        return evaluate(records)
+
+    state.evaluate = flaky
+    server = PipelineServer(state, batch_window_ms=200)
+    bad = {**RECORDS[0], "asset_id": "boom"}
+    with _serving(server) as port:
+        with ThreadPoolExecutor(2) as ex:
+            good_f = ex.submit(_post, port, "/gate", {"record": RECORDS[0]})
+            bad_f = ex.submit(_post, port, "/gate", {"record": bad})
+            good, failed = good_f.result(), bad_f.result()
+    assert good[0] == 200 and good[1]["results"] == [r for _, r in evaluate(RECORDS[:1])]
+    assert failed[0] == 500 and "boom" in failed[1]["error"]
+    assert server.batcher.batches == 1
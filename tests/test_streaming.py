@@ -0,0 +1,115 @@
+import gzip
+import json
+from pathlib import Path
+
+import pytest
+
+from dspm_devsecops.orchestration.pipeline import _iter_synthetic_records, run_pipeline
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+RECORDS = REPO_ROOT / "examples" / "data" / "synthetic" / "records.jsonl"
+
+def test_iter_records_reads_gzip(tmp_path):
+    gz = tmp_path / "records.jsonl.gz"
+    with gzip.open(gz, "wt", encoding="utf-8") as fh:
+        fh.write(RECORDS.read_text(encoding="utf-8"))
+    assert list(_iter_synthetic_records(gz)) == list(_iter_synthetic_records(RECORDS))
+
+def test_stream_mode_matches_batch_outputs(tmp_path, monkeypatch):
+    monkeypatch.setenv("DSPM_OUT_DIR", str(tmp_path / "batch"))
+    run_pipeline(REPO_ROOT)
+    monkeypatch.setenv("DSPM_OUT_DIR", str(tmp_path / "stream"))
+    run_pipeline(REPO_ROOT, stream=True)
+
+    for name in ("normalized_assets", "policy_results"):
+        batch = json.loads((tmp_path / "batch" / f"{name}.json").read_text())
+        lines = (tmp_path / "stream" / f"{name}.jsonl").read_text().splitlines()
+        assert [json.loads(x) for x in lines] == batch
+    assert (tmp_path / "batch" / "gate_status.json").read_text() == (tmp_path / "stream" / "gate_status.json").read_text()
+
+def test_manifest_lists_only_this_runs_asset_format(tmp_path, monkeypatch):
+    monkeypatch.setenv("DSPM_OUT_DIR", str(tmp_path))
+    run_pipeline(REPO_ROOT)
+    run_pipeline(REPO_ROOT, stream=True)
+
+    manifest = json.loads((tmp_path / "evidence" / "manifest.sha256.json").read_text())
+    names = {Path(e["path"]).name for e in manifest["entries"]}
+    assert {"normalized_assets.jsonl", "policy_results.jsonl"} <= names
+    assert not names & {"normalized_assets.json", "policy_results.json"}
+    assert not (tmp_path / "normalized_assets.json").exists()
+
+def test_incremental_run_reuses_unchanged_chunks(tmp_path, monkeypatch):
+    from dspm_devsecops.orchestration import incremental
+
+    monkeypatch.setattr(incremental, "MAX_CHUNK", 2)  # several chunks from the small sample
+    lines = RECORDS.read_text(encoding="utf-8").splitlines()
+    records = tmp_path / "records.jsonl"
+    records.write_text("\n".join(lines) + "\n")
+
+    def run(name, **kw):
+        monkeypatch.setenv("DSPM_OUT_DIR", str(tmp_path / name))
+        run_pipeline(REPO_ROOT, records_path=records, **kw)
+        return {
+            f: (tmp_path / name / f).read_text()
+            for f in ("normalized_assets.json", "policy_results.json", "gate_status.json")
+        }
+
+    full = run("full")
+    assert run("inc", incremental=True) == full
+    chunks = sorted((tmp_path / "inc" / ".cache" / "incremental").glob("*.chunk"))
+    mtimes = {p: p.stat().st_mtime_ns for p in chunks}
+
+    # Edit the last record: only its chunk is recomputed, output matches a full run.
+    lines[-1] = lines[-1].replace('"text": "', '"text": "card 4111 1111 1111 1111 ', 1)
+    records.write_text("\n".join(lines) + "\n")
+    assert run("inc", incremental=True) == run("full")
+    after = sorted((tmp_path / "inc" / ".cache" / "incremental").glob("*.chunk"))
+    assert len(after) == len(chunks) and sum(p in mtimes and p.stat().st_mtime_ns == mtimes[p] for p in after) == len(chunks) - 1
+
+def test_sharded_runs_merge_to_single_node_output(tmp_path, monkeypatch):
+    from dspm_devsecops.orchestration.pipeline import merge_shards
+
+    monkeypatch.setenv("DSPM_OUT_DIR", str(tmp_path / "single"))
+    run_pipeline(REPO_ROOT)
+    for i in range(3):
+        monkeypatch.setenv("DSPM_OUT_DIR", str(tmp_path / f"s{i}"))
+        run_pipeline(REPO_ROOT, shard=(i, 3))
+    monkeypatch.setenv("DSPM_OUT_DIR", str(tmp_path / "merged"))
+    merge_shards(REPO_ROOT, [tmp_path / f"s{i}" for i in (2, 0, 1)])
+
+    for name in ("normalized_assets.json", "policy_results.json", "gate_status.json", "scans/terraform_findings.json"):
+        assert (tmp_path / "merged" / name).read_text() == (tmp_path / "single" / name).read_text()
+    with pytest.raises(ValueError):
+        merge_shards(REPO_ROOT, [tmp_path / "s0", tmp_path / "s1"])
+
+def test_classification_overlaps_the_iac_scan_with_workers(tmp_path, monkeypatch):
+    import threading
+
+    from dspm_devsecops.orchestration import pipeline
+
+    started = threading.Event()
+    seen = []
+    classify_many, scan_gcp = pipeline.classify_many, pipeline._SCANNERS["gcp"]
+
+    def classify_spy(items, **kw):
+        started.set()
+        yield from classify_many(items, **kw)
+
+    def scan_waiting_for_classification(root, **kw):
+        # Held open until classification has begun; a lazy classify would time out here.
+        seen.append(started.wait(timeout=20))
+        return scan_gcp(root, **kw)
+
+    monkeypatch.setattr(pipeline, "classify_many", classify_spy)
+    monkeypatch.setitem(pipeline._SCANNERS, "gcp", scan_waiting_for_classification)
+    monkeypatch.setenv("DSPM_OUT_DIR", str(tmp_path / "w2"))
+    run_pipeline(REPO_ROOT, workers=2)
+    monkeypatch.setenv("DSPM_OUT_DIR", str(tmp_path / "w1"))
+    run_pipeline(REPO_ROOT)
+
+    assert seen[0] is True
+    rows = {r["stage"]: r for r in json.loads((tmp_path / "w2" / "stage_timings.json").read_text())}
+    scan, cls = rows["scan_iac"], rows["classify"]
+    assert cls["start_s"] < scan["start_s"] + scan["seconds"] and scan["start_s"] < cls["start_s"] + cls["seconds"]
+    for name in ("normalized_assets.json", "policy_results.json", "gate_status.json"):
+        assert (tmp_path / "w2" / name).read_text() == (tmp_path / "w1" / name).read_text()
@@ -0,0 +1,36 @@
+import pytest
+
+from dspm_devsecops.tenancy.model import TenantModel
+from dspm_devsecops.tenancy.resolver import TenantResolver
+
+def test_resolver_precedence_exact_prefix_glob_default():
+    model = TenantModel(
+        tenants=["retail", "finance", "hr"],
+        asset_tenant={"cloud:aws:rds:payments": "finance"},
+        principal_tenant={},
+        asset_rules=[
+            {"prefix": "cloud:aws:", "tenant": "retail"},
+            {"prefix": "cloud:aws:rds:", "tenant": "finance"},
+            {"glob": "cloud:*:logs:*", "tenant": "hr"},
+            {"glob": "cloud:gcp:*", "tenant": "finance"},
+            {"glob": "cloud:*", "tenant": "retail"},
+        ],
+        default_tenant="unassigned",
+    )
+    r = model.assets
+    ids = [
+        "cloud:aws:rds:payments",    # exact
+        "cloud:aws:rds:orders",      # longest prefix
+        "cloud:aws:logs:auth",       # prefix beats glob
+        "cloud:gcp:logs:lake",       # first glob in declaration order
+        "cloud:gcp:gcs:lake",
+        "cloud:ibm:cos:archive",
+        "onprem:nfs:share",          # default
+    ]
+    expected = ["finance", "finance", "retail", "hr", "finance", "retail", "unassigned"]
+    assert [r.resolve(i) for i in ids] == expected
+    assert r.resolve_many(ids + ids[::-1]) == expected + expected[::-1]
+
+def test_resolver_rejects_ambiguous_rules():
+    with pytest.raises(ValueError):
+        TenantResolver.from_rules({}, [{"prefix": "a", "glob": "b*", "tenant": "x"}])
@@ -0,0 +1,34 @@
+import json
+
+import pytest
+
+from dspm_devsecops.orchestration.writer import ArtifactWriter, iter_json
+
+PAYLOADS = [
+    [],
+    {},
+    [{"b": [1, {"x": "a\nb"}], "a": None}, [], {}, "é"],
+    {"nodes": [{"id": 1}], "edges": []},
+]
+
+@pytest.mark.parametrize("payload", PAYLOADS)
+def test_iter_json_matches_json_dumps(payload):
+    assert "".join(iter_json(payload)) == json.dumps(payload, indent=2)
+    assert "".join(iter_json(payload, sort_keys=True)) == json.dumps(payload, indent=2, sort_keys=True)
+    assert "".join(iter_json(payload, indent=None)) == json.dumps(payload, separators=(",", ":"))
+
+def test_writer_is_atomic_and_reports_errors(tmp_path):
+    target = tmp_path / "deep" / "a.json"
+    with ArtifactWriter() as w:
+        w.write_json(target, PAYLOADS[2])
+        w.write_json(tmp_path / "c.json", PAYLOADS[2], compact=True)
+        w.flush()
+        assert target.read_text() == json.dumps(PAYLOADS[2], indent=2)
+        assert json.loads((tmp_path / "c.json").read_text()) == PAYLOADS[2]
+
+        w.write_json(target, {"bad": object()})
+        with pytest.raises(TypeError):
+            w.flush()
+    # The failed write left the previous file and no temp files behind.
+    assert target.read_text() == json.dumps(PAYLOADS[2], indent=2)
+    assert sorted(p.name for p in target.parent.iterdir()) == ["a.json"]